@@ -1,21 +1,19 @@
 #!/usr/bin/env python3
 """
 SKG ARCH Dashboard
-Reads telemetry.json and renders a simple live dashboard.
+Reads the shared telemetry store and renders a simple live dashboard.
 Use:
   skg dashboard                 # live console output
   skg dashboard --write /path   # update text/HTML file for overlay
 """
-import json, os, sys, time
+import os, sys, time
 from datetime import datetime
 from pathlib import Path
-
-TELEMETRY = Path("/var/lib/skg/state/telemetry.json")
+from skg.telemetry_store import STATE_TELEMETRY
 
 def read_json():
     try:
-        with open(TELEMETRY) as f:
-            return json.load(f)
+        return STATE_TELEMETRY.read()
     except Exception:
         return {}
 
@@ -12,11 +12,11 @@ Checks:
 
 import os, json, time, importlib.util, subprocess, socket
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 
 STATE = Path("/var/lib/skg/state")
 LOG = Path("/var/log/skg/smoke.log")
 RESULT = {}
-TELEMETRY = STATE / "telemetry.json"
 
 def log(msg):
     LOG.parent.mkdir(parents=True, exist_ok=True)
@@ -61,7 +61,7 @@ def test_services():
 
 def test_telemetry():
     try:
-        t = json.loads(TELEMETRY.read_text())
+        t = STATE_TELEMETRY.read()
         entropy = t.get("entropy", 0)
         coherence = t.get("ethics_coherence", 0)
         mep = t.get("mep_coupling", 0)
@@ -75,7 +75,7 @@ def test_telemetry():
 
 def test_assimilation_health():
     try:
-        t = json.loads(TELEMETRY.read_text())
+        t = STATE_TELEMETRY.read()
         health = t.get("assimilation_health", 1.0)
         RESULT["assimilation_health"] = {
             "ok": health > 0.8,
@@ -115,7 +115,7 @@ def test_services_systemd():
 
 def hint_field_zero():
     try:
-        t = json.loads(TELEMETRY.read_text())
+        t = STATE_TELEMETRY.read()
         if t.get("mep_coupling", 0) == 0 or t.get("xrp_coherence", 0) == 0:
             RESULT["hint_field"] = {
                 "ok": False,
@@ -5,21 +5,17 @@ SKG Adaptive Loop — integrates audit deltas and assimilation health into refle
 
 from pathlib import Path
 import json, time
+from skg.tail import tail_jsonl
+from skg.telemetry_store import STATE_TELEMETRY
 
 AUDIT = Path("/var/lib/skg/memory/governance.audit.jsonl")
 PEARL = Path("/var/lib/skg/memory/pearl_audit_reflect.jsonl")
 ASSIM_STATE = Path("/var/lib/skg/state/assimilation_state.json")
-TELEMETRY = Path("/var/lib/skg/state/telemetry.json")
 
 def integrate_audit():
-    try:
-        lines = AUDIT.read_text().strip().splitlines()[-10:]
-    except Exception:
-        lines = []
     pearls = []
-    for ln in lines:
+    for rec in tail_jsonl(AUDIT, 10):
         try:
-            rec = json.loads(ln)
             pearls.append({
                 "ts": rec["ts"],
                 "entropy_delta": rec.get("entropy_delta"),
@@ -55,16 +51,7 @@ def compute_assimilation_health():
     }
 
 def update_telemetry():
-    tdata = {}
-    if TELEMETRY.exists():
-        try:
-            tdata = json.loads(TELEMETRY.read_text())
-        except Exception:
-            pass
-    tdata.update(compute_assimilation_health())
-    tdata["ts"] = time.time()
-    TELEMETRY.parent.mkdir(parents=True, exist_ok=True)
-    TELEMETRY.write_text(json.dumps(tdata, indent=2))
+    STATE_TELEMETRY.update({**compute_assimilation_health(), "ts": time.time()})
 
 def main():
     integrate_audit()
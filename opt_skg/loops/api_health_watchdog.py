@@ -6,24 +6,13 @@ SKG API Health Watchdog
 Periodically checks /health endpoint and restarts service if no response.
 Logs incidents in telemetry.
 """
-import requests, time, subprocess, json
-from pathlib import Path
+import requests, time, subprocess
 from skg.config.api_port import load
+from skg.telemetry_store import STATE_TELEMETRY
 
-STATE = Path("/var/lib/skg/state/telemetry.json")
 CHECK_INTERVAL = 15
 FAIL_THRESHOLD = 3  # consecutive failures before restart
 
-def read_json(p):
-    try:
-        return json.loads(p.read_text())
-    except Exception:
-        return {}
-
-def write_json(p, data):
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(data, indent=2))
-
 def main():
     host, port = load()
     url = f"http://{host}:{port}/health"
@@ -44,9 +33,7 @@ def main():
 
         if fails >= FAIL_THRESHOLD:
             subprocess.run(["systemctl", "restart", "skg-api.service"], check=False)
-            t = read_json(STATE)
-            t["api_watchdog_restart"] = int(time.time())
-            write_json(STATE, t)
+            STATE_TELEMETRY.update({"api_watchdog_restart": int(time.time())})
             fails = 0
         time.sleep(CHECK_INTERVAL)
 
@@ -1,18 +1,11 @@
 #!/usr/bin/env python3
-import json, time, subprocess
+import sys; sys.path.append('/opt/skg')
+import time, subprocess
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 
-STATE = Path("/var/lib/skg/state/telemetry.json")
 LAST = Path("/var/lib/skg/state/.api_restart_last.txt")
 
-def read_json(p, default):
-    try: return json.loads(p.read_text())
-    except: return default
-
-def write_json(p, data):
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(data, indent=2))
-
 def get_active_enter_ts():
     try:
         out = subprocess.check_output(
@@ -28,10 +21,7 @@ def main():
     while True:
         ts = str(get_active_enter_ts())
         if ts and ts != last:
-            t = read_json(STATE, {})
-            t["api_restart_count"] = int(t.get("api_restart_count") or 0) + 1
-            t["last_api_restart"]  = int(time.time())
-            write_json(STATE, t)
+            STATE_TELEMETRY.incr("api_restart_count", last_api_restart=int(time.time()))
             LAST.parent.mkdir(parents=True, exist_ok=True)
             LAST.write_text(ts)
         time.sleep(5)
@@ -17,6 +17,8 @@ sys.path.append("/opt/skg")
 
 from skg.paths import SKG_LOG_DIR
 from skg.state import log_journal
+from skg.themes import window as theme_window
+from skg.continuity_pipeline import PIPELINE as CONTINUITY
 
 LOG_PATH = Path(SKG_LOG_DIR) / "skg-core.log"
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -54,21 +56,11 @@ def self_reflect():
     if not idx_path.exists():
         logger.info("[reflect] No continuity index found.")
         return
-    texts = []
     try:
-        with idx_path.open("r", encoding="utf-8") as f:
-            for line in f.readlines()[-500:]:
-                try:
-                    j = json.loads(line)
-                    texts.append(j.get("text", "").lower())
-                except Exception:
-                    continue
+        counts = theme_window(500, idx_path).counts()
     except Exception as e:
         logger.warning(f"[reflect] Read error: {e}")
         return
-    corpus = " ".join(texts)
-    themes = ["energy", "gravity", "phase", "sphere", "audit", "growth", "council", "reflection"]
-    counts = {k: corpus.count(k) for k in themes}
     dominant = max(counts, key=counts.get, default="none")
     summary = {"dominant": dominant, "counts": counts}
     log_journal(f"[self_reflect] {json.dumps(summary)}")
@@ -78,13 +70,9 @@ def self_reflect():
 # === Continuity ingestion ===
 def ingest_continuity():
     logger.info("[continuity] Fetching + ingesting + indexing...")
-    cmds = [
-        ["/opt/skg/.venv/bin/python", "-m", "skg.continuity_fetch"],
-        ["/opt/skg/.venv/bin/python", "-m", "skg.continuity"],
-        ["/opt/skg/.venv/bin/python", "-m", "skg.continuity_index"],
-    ]
-    for c in cmds:
-        safe_run(c, f"continuity:{c[-1]}")
+    result = CONTINUITY.run()
+    logger.info(f"[continuity] fetched={len(result['fetched'] or [])} "
+                f"imported={len(result['imported'] or [])} indexed={result['indexed']}")
 
 # === Autoheal ===
 def run_autoheal():
@@ -3,7 +3,7 @@
 SKG Core v4  –  substrate cycle manager (governance + cognition integrated)
 """
 
-import os, sys, json, time, gzip, importlib, traceback, psutil
+import os, sys, json, time, importlib, traceback, psutil
 from pathlib import Path
 from datetime import datetime
 
@@ -11,6 +11,7 @@ sys.path.append("/opt/skg")
 
 from skg import governance
 from skg import cognition_engine
+from skg.archive_blocks import write_archive
 
 BASE     = Path("/opt/skg")
 LOG_DIR  = Path("/var/log/skg")
@@ -36,8 +37,7 @@ def gzip_rotate(path, max_lines=5000):
     if len(lines) <= max_lines: return
     ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     gz = path.with_suffix(f".{ts}.jsonl.gz")
-    with gzip.open(gz, "wt", encoding="utf-8") as g:
-        g.writelines(lines[:-max_lines])
+    write_archive(gz, (l.encode("utf-8") for l in lines[:-max_lines]))
     with path.open("w", encoding="utf-8") as f:
         f.writelines(lines[-max_lines:])
     log_event("maintenance", f"Rotated {path.name} -> {gz.name}")
@@ -2,12 +2,12 @@
 """
 SKG Alarms: watches telemetry and issues audit events when thresholds break.
 """
-import json, time, os
+import json, os
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 from time import time as _now
 
 STATE = Path("/var/lib/skg/state")
-TEL = STATE / "telemetry.json"
 ALARM = STATE / "alarms.jsonl"
 
 THRESH = {
@@ -22,7 +22,7 @@ def log_alarm(key,val):
 
 def check():
     try:
-        with open(TEL) as f: t=json.load(f)
+        t=STATE_TELEMETRY.read()
     except: return
     for k,th in THRESH.items():
         v=t.get(k)
@@ -33,9 +33,11 @@ def check():
         if k=="cpu_percent" and v>th:
             log_alarm(k,v)
 
-def loop(interval=60):
-    while True:
-        check(); time.sleep(interval)
+def loop():
+    sub=STATE_TELEMETRY.subscribe(THRESH)
+    check()
+    for _ in sub:
+        check()
 
 if __name__=="__main__":
     loop()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Block-Compressed JSONL Archives
+Archives are written as multi-member gzip: every BLOCK_BYTES of lines is its
+own gzip member, so any block can be decompressed on its own and the file is
+still an ordinary .gz to gzip/zcat.  A sidecar <archive>.idx records, per
+block, (offset, compressed length, first_ts, last_ts, records), with
+first_ts/last_ts the lowest/highest `ts` in the block, so a time-range read
+binary-searches to the blocks it needs and decompresses only those.  The
+sidecar also carries a Bloom filter of the archive's BLOOM_FIELDS values,
+built in the same pass, so indexing an archive never decompresses it.
+"""
+
+import os, json, zlib, gzip, bisect
+from pathlib import Path
+from skg.bloom import Bloom
+from skg.jsonfields import Projector
+
+BLOCK_BYTES = 512 * 1024     # uncompressed bytes per gzip member
+INDEX_SUFFIX = ".idx"
+BLOOM_FIELDS = ("actor", "kind", "type")
+BLOOM_FP     = 0.01          # false-positive rate of the per-archive field filters
+
+def bloom_key(field, value) -> bytes:
+    return field.encode() + b"\0" + json.dumps(value, sort_keys=True).encode()
+
+def summary_bloom(values) -> dict:
+    """JSON form of a Bloom filter over a set of bloom_key()s."""
+    bloom = Bloom(len(values), BLOOM_FP)
+    for v in values:
+        bloom.add(v)
+    return bloom.to_dict()
+
+def sidecar(path) -> Path:
+    return Path(str(path) + INDEX_SUFFIX)
+
+def write_archive(dest, lines, level: int = 9) -> dict:
+    """Write byte lines to dest as block-compressed gzip plus its sidecar index."""
+    dest = Path(dest)
+    tmp = dest.with_name(dest.name + ".tmp")
+    blocks, buf, lo, hi, n, off = [], [], None, None, 0, 0
+    proj, values = Projector(BLOOM_FIELDS + ("ts",)), set()
+
+    def flush(f):
+        nonlocal buf, lo, hi, n, off
+        if not buf:
+            return
+        member = gzip.compress(b"".join(buf), compresslevel=level, mtime=0)
+        f.write(member)
+        blocks.append([off, len(member), lo, hi, n])
+        off += len(member)
+        buf, lo, hi, n = [], None, None, 0
+
+    with open(tmp, "wb") as f:
+        size = 0
+        for line in lines:
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            buf.append(line)
+            n += 1
+            size += len(line)
+            e = proj(line) or {}
+            for field in BLOOM_FIELDS:
+                if field in e:
+                    values.add(bloom_key(field, e[field]))
+            ts = e.get("ts")
+            if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+                lo = ts if lo is None else min(lo, ts)
+                hi = ts if hi is None else max(hi, ts)
+            if size >= BLOCK_BYTES:
+                flush(f)
+                size = 0
+        flush(f)
+    idx = {"version": 1, "size": off, "blocks": blocks, "bloom": summary_bloom(values)}
+    side = sidecar(dest)
+    stmp = side.with_name(side.name + ".tmp")
+    stmp.write_text(json.dumps(idx))
+    stmp.replace(side)
+    tmp.replace(dest)
+    return idx
+
+def read_index(path):
+    """The archive's block index, or None for plain (single-stream) archives."""
+    try:
+        idx = json.loads(sidecar(path).read_text())
+        if idx.get("version") == 1 and idx.get("size") == os.path.getsize(path):
+            return idx
+    except Exception:
+        pass
+    return None
+
+def ts_range(idx):
+    lows = [b[2] for b in idx["blocks"] if b[2] is not None]
+    highs = [b[3] for b in idx["blocks"] if b[3] is not None]
+    return [min(lows) if lows else None, max(highs) if highs else None]
+
+def select(idx, t_min=None, t_max=None) -> list:
+    """Blocks that may hold a record with t_min <= ts <= t_max (falsy bounds are open)."""
+    blocks = idx["blocks"]
+    if not t_min and not t_max:
+        return list(blocks)
+    # running max of last_ts / suffix min of first_ts are monotone even when
+    # blocks are out of order, so both ends of the range are binary searches
+    reach, top = [], float("-inf")
+    for b in blocks:
+        top = max(top, b[3]) if b[3] is not None else top
+        reach.append(top)
+    floor, low = [0.0] * len(blocks), float("inf")
+    for i in range(len(blocks) - 1, -1, -1):
+        low = min(low, blocks[i][2]) if blocks[i][2] is not None else low
+        floor[i] = low
+    start = bisect.bisect_left(reach, t_min) if t_min else 0
+    end = bisect.bisect_right(floor, t_max) if t_max else len(blocks)
+    return [b for b in blocks[start:end] if b[2] is not None
+            and not (t_min and b[3] < t_min) and not (t_max and b[2] > t_max)]
+
+def iter_lines(path, t_min=None, t_max=None, idx=None):
+    """Lines of the blocks overlapping [t_min, t_max], in archive order."""
+    idx = idx or read_index(path)
+    with open(path, "rb") as f:
+        for b in select(idx, t_min, t_max):
+            f.seek(b[0])
+            yield from zlib.decompressobj(wbits=31).decompress(f.read(b[1])).splitlines()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Parallel Log/Archive Query
+Fans a ts/actor query out over live JSONL files and .gz archives with a
+process pool.  Work units are line-aligned ranges of live files, single
+blocks of block-compressed archives (only those overlapping the ts range)
+and whole plain archives; an archive whose index entry or block sidecar
+carries a Bloom filter is skipped when it rules the actor out.  Workers drop lines that cannot contain the actor by byte substring
+before parsing, and return at most `limit` matches sorted by ts.  Units are
+scheduled by their lowest possible ts, so the merge can stream records in
+ts order and stop as soon as `limit` have been emitted.
+"""
+
+import os, json, gzip, zlib, heapq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from skg import archive_blocks
+from skg.bloom import Bloom
+from skg.jsonfields import Projector
+
+WORKERS    = int(os.getenv("SKG_QUERY_WORKERS", str(os.cpu_count() or 1)))
+LIVE_CHUNK = 4 * 1024 * 1024
+_NO_TS     = float("-inf")
+BLOOM_FIELDS, bloom_key = archive_blocks.BLOOM_FIELDS, archive_blocks.bloom_key
+
+def may_contain(ent, field, value) -> bool:
+    """False only if the Bloom filter of an archive index entry (or block
+    sidecar) rules out field == value."""
+    if "bloom" not in ent or field not in BLOOM_FIELDS:
+        return True
+    try:
+        return bloom_key(field, value) in Bloom.from_dict(ent["bloom"])
+    except Exception:
+        return True
+
+def _needles(actor):
+    if not actor or not isinstance(actor, str):
+        return None
+    # the quoted value as json.dumps writes it, with and without ASCII escaping
+    return {json.dumps(actor).encode(), json.dumps(actor, ensure_ascii=False).encode()}
+
+def _lines(unit):
+    kind, path, start, length = unit["kind"], unit["path"], unit["start"], unit["length"]
+    if kind == "gzip":
+        with gzip.open(path, "rb") as f:
+            yield from f
+        return
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(length)
+    if kind == "block":
+        data = zlib.decompressobj(wbits=31).decompress(data)
+    yield from data.splitlines()
+
+def _scan(unit):
+    """Matches in one unit as (sort key, record), ts order, at most unit['limit']."""
+    actor, t_min, t_max = unit["actor"], unit["t_min"], unit["t_max"]
+    needles = _needles(actor)
+    proj = Projector(("ts", "actor") if actor else ("ts",))
+    out = []
+    try:
+        for line in _lines(unit):
+            if not line.strip():
+                continue
+            if needles and not any(n in line for n in needles):
+                continue
+            try:
+                # filter on the projected keys; decode the whole record only for matches
+                p, e = proj.split(line)
+                ts = p.get("ts", None)
+                if t_min and (ts is None or ts < t_min): continue
+                if t_max and (ts is None or ts > t_max): continue
+                if actor and p.get("actor") != actor: continue
+                if e is None:
+                    e = json.loads(line)
+            except Exception:
+                continue
+            numeric = isinstance(ts, (int, float)) and not isinstance(ts, bool)
+            # records without a ts sort at the lowest ts their unit can hold
+            out.append((ts if numeric else unit["lo"], e))
+    except Exception:
+        pass
+    out.sort(key=lambda kv: kv[0])
+    return out[:unit["limit"]]
+
+def _live_units(path):
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return []
+    units, start = [], 0
+    with open(path, "rb") as f:
+        while start < size:
+            f.seek(min(start + LIVE_CHUNK, size))
+            f.readline()
+            end = min(f.tell(), size)
+            units.append({"kind": "plain", "path": path, "start": start, "length": end - start, "lo": _NO_TS})
+            start = end
+    return units
+
+def _archive_units(ent, actor, t_min, t_max):
+    a0, a1 = ent.get("ts_range", [None, None])
+    if t_min and a1 and a1 < t_min: return []
+    if t_max and a0 and a0 > t_max: return []
+    path = ent["path"]
+    try:
+        # Bloom filter and true min/max ts only hold for the archive as it was indexed
+        summed = "bloom" in ent and ent.get("size") == os.path.getsize(path)
+    except OSError:
+        return []
+    if summed and actor and not may_contain(ent, "actor", actor): return []
+    idx = archive_blocks.read_index(path)
+    # the sidecar's filter also covers archives written since the last index build
+    if idx is not None and actor and not may_contain(idx, "actor", actor): return []
+    if idx is None:
+        lo = a0 if summed and a0 is not None else _NO_TS
+        return [{"kind": "gzip", "path": path, "start": 0, "length": 0, "lo": lo}]
+    return [{"kind": "block", "path": path, "start": b[0], "length": b[1], "lo": b[2]}
+            for b in archive_blocks.select(idx, t_min, t_max)]
+
+def _ordered(units, workers):
+    if workers <= 1 or len(units) <= 1:
+        yield from map(_scan, units)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for u in units:
+            pending.append(pool.submit(_scan, u))
+            if len(pending) >= 4 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def query(live, archives, actor=None, t_min=None, t_max=None, limit=500, workers=WORKERS):
+    """Stream records from live files and archive index entries in ts order, up to limit."""
+    units = [u for p in live for u in _live_units(p)]
+    units += [u for ent in archives for u in _archive_units(ent, actor, t_min, t_max)]
+    for u in units:         # blocks without any ts (unbounded queries only) go first
+        if u["lo"] is None:
+            u["lo"] = _NO_TS
+        u.update(actor=actor, t_min=t_min, t_max=t_max, limit=limit)
+    units.sort(key=lambda u: u["lo"])
+    if limit <= 0:
+        return
+    heap, sent = [], 0
+    results = _ordered(units, workers)
+    try:
+        for i, recs in enumerate(results):
+            for j, (key, e) in enumerate(recs):
+                heapq.heappush(heap, (key, i, j, e))
+            # nothing in a later unit can sort below its lowest possible ts
+            mark = units[i + 1]["lo"] if i + 1 < len(units) else float("inf")
+            while heap and heap[0][0] <= mark:
+                yield heapq.heappop(heap)[3]
+                sent += 1
+                if sent >= limit:
+                    return
+    finally:
+        results.close()
@@ -5,9 +5,9 @@ Logs entropy/coherence deltas for each skill without blocking.
 """
 import re, json, time, hashlib
 from pathlib import Path
+from skg.audit_log import append_event
+from skg.telemetry_store import STATE_TELEMETRY
 
-TEL = Path("/var/lib/skg/state/telemetry.json")
-AUDIT = Path("/var/lib/skg/memory/governance.audit.jsonl")
 
 def _sha256(t:str): import hashlib; return hashlib.sha256(t.encode()).hexdigest()
 def _read_json(p, d=None):
@@ -18,7 +18,7 @@ def _write_json(p, obj):
     Path(p).write_text(json.dumps(obj, indent=2))
 
 def physics_snapshot():
-    tel=_read_json(TEL,{})
+    tel=STATE_TELEMETRY.read()
     return {
         "entropy": tel.get("entropy",0.0),
         "coherence": tel.get("ethics_coherence",0.0),
@@ -47,8 +47,7 @@ def observe(actor, target, code):
         "entropy_delta": metrics["entropy_inj"] - phys["entropy"],
         "coherence_delta": phys.get("mep_coupling",0)-phys.get("xrp_coherence",0)
     }
-    AUDIT.parent.mkdir(parents=True, exist_ok=True)
-    with AUDIT.open("a",encoding="utf-8") as f: f.write(json.dumps(event)+"\n")
+    append_event(event)
     return event
 
 # compatibility alias
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Batched governance audit writer.
+append_event() serialises the event and returns at once; a background thread
+writes queued lines in one flock-held write() once BATCH_RECORDS are queued or
+BATCH_SECONDS have passed, so concurrent processes never interleave partial lines.
+"""
+import os, json, time, fcntl, atexit, threading
+from pathlib import Path
+from skg.paths import SKG_MEMORY_DIR
+
+AUDIT_PATH    = Path(SKG_MEMORY_DIR) / "governance.audit.jsonl"
+BATCH_RECORDS = 256
+BATCH_SECONDS = 0.25
+
+class BatchedAppender:
+    def __init__(self, path, batch_records=BATCH_RECORDS, batch_seconds=BATCH_SECONDS):
+        self.path = Path(path)
+        self.batch_records = batch_records
+        self.batch_seconds = batch_seconds
+        self._reset()
+        atexit.register(self.flush)
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # a forked child inherits the queue but not the flusher thread
+        self._cv = threading.Condition()
+        self._queue = []
+        self._queued = self._written = 0
+        self._urgent = False
+        self._thread = None
+
+    def append(self, rec: dict):
+        line = json.dumps(rec) + "\n"
+        with self._cv:
+            self._queue.append(line)
+            self._queued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+            if len(self._queue) in (1, self.batch_records):
+                self._cv.notify_all()
+
+    def flush(self, timeout: float = 5.0):
+        """Block until everything appended so far is on disk."""
+        with self._cv:
+            target = self._queued
+            if self._thread is None:
+                batch, self._queue = self._queue, []
+                self._write(batch)
+                self._written += len(batch)
+                return
+            self._urgent = True
+            self._cv.notify_all()
+            self._cv.wait_for(lambda: self._written >= target, timeout)
+
+    def _run(self):
+        while True:
+            with self._cv:
+                self._cv.wait_for(lambda: self._queue)
+                self._cv.wait_for(lambda: self._urgent or len(self._queue) >= self.batch_records,
+                                  self.batch_seconds)
+                batch, self._queue, self._urgent = self._queue, [], False
+            self._write(batch)
+            with self._cv:
+                self._written += len(batch)
+                self._cv.notify_all()
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.write("".join(batch))
+        except Exception:
+            pass   # auditing must never take down the caller
+
+AUDIT_LOG = BatchedAppender(AUDIT_PATH)
+
+def append_event(evt: dict) -> dict:
+    evt = dict(evt); evt.setdefault("ts", time.time())
+    AUDIT_LOG.append(evt)
+    return evt
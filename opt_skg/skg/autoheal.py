@@ -3,7 +3,8 @@
 SKG Auto-Heal Loop
 Performs periodic integrity checks and proposes repairs when anomalies are detected.
 """
-import os, json, time, hashlib, subprocess
+import os, json, time, subprocess
+from skg.hashcache import file_sha256, file_digests
 from skg.coder import propose_change
 from skg.governance import append_event
 
@@ -11,11 +12,7 @@ STATE_DIR="/var/lib/skg/memory"
 HASH_FILE=f"{STATE_DIR}/integrity.hashes.json"
 
 def sha256sum(path):
-    h=hashlib.sha256()
-    with open(path,'rb') as f:
-        for chunk in iter(lambda: f.read(8192),b''):
-            h.update(chunk)
-    return h.hexdigest()
+    return file_sha256(path)
 
 def snapshot():
     """Record hashes of critical SKG files."""
@@ -24,7 +21,7 @@ def snapshot():
         for n in names:
             if n.endswith(".py"):
                 files.append(os.path.join(base,n))
-    hashes={f:sha256sum(f) for f in files}
+    hashes=file_digests(files)
     json.dump(hashes,open(HASH_FILE,"w"),indent=2)
     return hashes
 
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Bloom Filter — compact set-membership summaries (no false negatives).
+Sized for an expected item count and false-positive rate; k bit positions
+per item come from double hashing one blake2b digest.  to_dict()/from_dict()
+give a JSON-safe form for index files.
+"""
+import math, base64, hashlib
+
+class Bloom:
+    def __init__(self, n: int, p: float = 0.01, m: int = None, k: int = None, bits: bytes = None):
+        n = max(1, n)
+        self.m = m or max(64, int(math.ceil(-n * math.log(p) / math.log(2) ** 2)))
+        self.k = k or max(1, round(self.m / n * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.m + 7) // 8)
+
+    def _positions(self, item: bytes):
+        d = hashlib.blake2b(item, digest_size=16).digest()
+        h1, h2 = int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little") | 1
+        return ((h1 + i * h2) % self.m for i in range(self.k))
+
+    def add(self, item: bytes):
+        for b in self._positions(item):
+            self.bits[b >> 3] |= 1 << (b & 7)
+
+    def __contains__(self, item: bytes) -> bool:
+        return all(self.bits[b >> 3] >> (b & 7) & 1 for b in self._positions(item))
+
+    def to_dict(self) -> dict:
+        return {"m": self.m, "k": self.k, "bits": base64.b64encode(bytes(self.bits)).decode()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Bloom":
+        return cls(1, m=d["m"], k=d["k"], bits=base64.b64decode(d["bits"]))
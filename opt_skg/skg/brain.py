@@ -8,25 +8,14 @@ import json, random, time
 from skg.skills_engine import run_skill
 from skg.state import log_journal
 from skg.paths import SKG_MEMORY_DIR
+from skg.themes import window
 
 INDEX_PATH = Path("/var/lib/skg/continuity_index.jsonl")
 
-THEME_KEYWORDS = ["energy","gravity","phase","sphere","audit","growth","council","reflection","anonym","federat","consensus"]
-
 def self_reflect(limit_lines=800):
     if not INDEX_PATH.exists():
         return {"dominant_theme": None, "keywords": {}}
-    counts = {k:0 for k in THEME_KEYWORDS}
-    lines = INDEX_PATH.read_text(encoding="utf-8", errors="ignore").splitlines()[-limit_lines:]
-    for line in lines:
-        try:
-            j = json.loads(line)
-            t = j.get("text","").lower()
-        except Exception:
-            continue
-        for k in THEME_KEYWORDS:
-            if k in t:
-                counts[k] += 1
+    counts = window(limit_lines, INDEX_PATH).counts(lines=True)
     dom = None
     if counts:
         dom = max(counts.items(), key=lambda kv: kv[1])[0]
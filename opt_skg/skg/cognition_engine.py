@@ -58,20 +58,14 @@ def _openai_chat(api_key:str, prompt:str, model:str="gpt-4o-mini", timeout:int=6
         _audit("openai_error", {"error": str(e)})
     return None
 
-def _internal_reflect(prompt:str, pearls_path:str="/var/lib/skg/memory/pearls.jsonl", tail:int=100) -> str:
+def _internal_reflect(prompt:str, tail:int=100) -> str:
     # Minimal offline fallback: echo prompt and list recent kinds as a reflective sketch
     kinds = {}
     try:
-        p = Path(pearls_path)
-        if p.exists():
-            lines = p.read_text(encoding="utf-8", errors="ignore").splitlines()[-tail:]
-            import json as _j
-            for ln in lines:
-                try:
-                    k = _j.loads(ln).get("kind","_")
-                    kinds[k] = kinds.get(k,0)+1
-                except Exception:
-                    pass
+        from skg.seglog import PEARL_LOG
+        for rec in PEARL_LOG.tail(tail, fields=("kind",)):
+            k = rec.get("kind","_") if isinstance(rec, dict) else "_"
+            kinds[k] = kinds.get(k,0)+1
     except Exception:
         pass
     summary = ", ".join(f"{k}:{v}" for k,v in sorted(kinds.items(), key=lambda x:-x[1])[:8]) or "no_recent_events"
@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 import sys; sys.path.append('/opt/skg')
-import json, time
+"""
+Continuity ingestion: chat_full_restore_*.txt exports -> continuity pearls.
+Exports are cut into line-aligned chunks that a process pool encodes in
+parallel; results are appended to the pearl log strictly in file/chunk order,
+and a file's .imported marker is written only once all of its pearls are.
+"""
+import os, json, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from skg.encoder import encode_text
+from skg.encoder import encode_texts
+from skg.seglog import PEARL_LOG
 
 CONTINUITY_DIR = Path("/opt/skg/skg_docs")
-PEARLS_PATH = Path("/var/lib/skg/memory/pearls.jsonl")
+ENCODE_BATCH   = 8192      # lines vectorised and appended per step
+CHUNK_BYTES    = 4 * 1024 * 1024
+WORKERS        = int(os.getenv("SKG_INGEST_WORKERS", str(os.cpu_count() or 1)))
 
 def parse_lines(path: Path):
     txt = path.read_text(encoding="utf-8", errors="ignore")
@@ -14,27 +25,78 @@ def parse_lines(path: Path):
         if s:
             yield s
 
-def ingest_new_exports():
+def _chunks(path: Path):
+    """(path, start, end) byte ranges of about CHUNK_BYTES, each ending on a newline."""
+    size = path.stat().st_size
+    if not size:
+        yield (str(path), 0, 0)     # still one (empty) chunk, so the file gets its marker
+        return
+    with path.open("rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + CHUNK_BYTES, size))
+            f.readline()
+            end = min(f.tell(), size)
+            yield (str(path), start, end)
+            start = end
+
+def _encode_chunk(chunk):
+    """Lines and vectors of one chunk; same lines as parse_lines over the whole file."""
+    path, start, end = chunk
+    with open(path, "rb") as f:
+        f.seek(start)
+        txt = f.read(end - start).decode("utf-8", errors="ignore")
+    lines = [s for s in (l.strip() for l in txt.splitlines()) if s]
+    return lines, [[float(v) for v in vec] for vec in encode_texts(lines)]
+
+def _ordered(fn, items, workers):
+    """fn over items in order, with at most 2*workers chunks in flight."""
+    if workers <= 1 or len(items) <= 1:     # not worth starting a pool
+        yield from map(fn, items)
+        return
+    PEARL_LOG.flush()     # nothing buffered may be inherited by the workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for it in items:
+                pending.append(pool.submit(fn, it))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for f in pending:
+                f.cancel()        # abandoned (timeout/error): don't encode the rest
+
+def ingest_new_exports(workers=WORKERS, check=None):
     if not CONTINUITY_DIR.exists():
         return []
+    todo = [p for p in sorted(CONTINUITY_DIR.glob("chat_full_restore_*.txt"))
+            if not p.with_suffix(".imported").exists()]
+    chunks = [(p, c) for p in todo for c in _chunks(p)]
+    left = {p: 0 for p in todo}
+    for p, _ in chunks:
+        left[p] += 1
     imported = []
-    for p in sorted(CONTINUITY_DIR.glob("chat_full_restore_*.txt")):
-        mark = p.with_suffix(".imported")
-        if mark.exists():
-            continue
-        with PEARLS_PATH.open("a", encoding="utf-8") as out:
-            for s in parse_lines(p):
-                vec = encode_text(s)
-                pearl = {
-                    "timestamp": time.time(),
-                    "kind": "continuity",
-                    "source": str(p),
-                    "text": s,
-                    "vec": vec
-                }
-                out.write(json.dumps(pearl, ensure_ascii=False) + "\n")
-        mark.write_text(time.strftime("%Y-%m-%d %H:%M:%S"))
-        imported.append(p.name)
+    results = _ordered(_encode_chunk, [c for _, c in chunks], workers)
+    for (p, (_, start, _)), (lines, vecs) in zip(chunks, results):
+        if check and not start:
+            # only between files: a file stopped part way has no marker and
+            # would be re-ingested whole, duplicating its earlier chunks
+            check()
+        for i in range(0, len(lines), ENCODE_BATCH):
+            PEARL_LOG.append_many({
+                "timestamp": time.time(),
+                "kind": "continuity",
+                "source": str(p),
+                "text": s,
+                "vec": vec
+            } for s, vec in zip(lines[i:i + ENCODE_BATCH], vecs[i:i + ENCODE_BATCH]))
+        left[p] -= 1
+        if not left[p]:
+            PEARL_LOG.flush()
+            p.with_suffix(".imported").write_text(time.strftime("%Y-%m-%d %H:%M:%S"))
+            imported.append(p.name)
     return imported
 
 if __name__ == "__main__":
@@ -18,12 +18,14 @@ def list_remote_chat_files():
     return sorted([it["name"] for it in r.json()
                    if it["name"].startswith("chat_full_restore_") and it["name"].endswith(".txt")])
 
-def fetch_new():
+def fetch_new(check=None):
     existing = {p.name for p in DEST_DIR.glob("chat_full_restore_*.txt")}
     fetched = []
     for fname in list_remote_chat_files():
         if fname in existing: 
             continue
+        if check:
+            check()
         url = f"{RAW_BASE}/{fname}"
         r = requests.get(url, timeout=30)
         if r.status_code == 200:
@@ -1,27 +1,120 @@
 #!/usr/bin/env python3
 import sys; sys.path.append('/opt/skg')
-import json
+"""
+Continuity index: the newest continuity pearls as {ts, text, vec} rows.
+sync() tails the pearl log from a persisted offset and appends only new
+continuity pearls; once the file holds RETAIN + COMPACT_SLACK rows it is
+compacted back to the newest RETAIN rows in the background.
+"""
+import json, fcntl, threading
 from pathlib import Path
+from skg.seglog import PEARL_LOG
+from skg.pearl_index import PEARL_INDEX, key
 
-PEARLS_PATH = Path("/var/lib/skg/memory/pearls.jsonl")
-INDEX_PATH  = Path("/var/lib/skg/continuity_index.jsonl")
-
-def rebuild_index(limit=20000):
-    if not PEARLS_PATH.exists():
-        return 0
-    n = 0
-    with PEARLS_PATH.open("r", encoding="utf-8") as f, INDEX_PATH.open("w", encoding="utf-8") as out:
-        for line in f:
-            try:
-                j = json.loads(line)
-            except Exception:
-                continue
-            if j.get("kind") == "continuity" and "vec" in j:
-                out.write(json.dumps({"ts": j["timestamp"], "text": j["text"], "vec": j["vec"]}) + "\n")
-                n += 1
-                if n >= limit:
-                    break
-    return n
+INDEX_PATH    = Path("/var/lib/skg/continuity_index.jsonl")
+STATE_PATH    = INDEX_PATH.with_suffix(".state.json")
+LOCK_PATH     = INDEX_PATH.with_suffix(".lock")
+FETCH_BATCH   = 1024
+RETAIN        = 20000
+COMPACT_SLACK = RETAIN // 2
+
+_compacting = threading.Lock()
+
+def _row(j):
+    return json.dumps({"ts": j["timestamp"], "text": j["text"], "vec": j["vec"]}) + "\n"
+
+def _wanted(j):
+    return j.get("kind") == "continuity" and "vec" in j
+
+def _load_state():
+    try:
+        return json.loads(STATE_PATH.read_text())
+    except Exception:
+        return None
+
+def _save_state(st):
+    tmp = STATE_PATH.with_name(STATE_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(st))
+    tmp.replace(STATE_PATH)
+
+def _locked():
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    lk = open(LOCK_PATH, "a")
+    fcntl.flock(lk, fcntl.LOCK_EX)
+    return lk
+
+def _rebuild(retain, check=None):
+    """Newest `retain` continuity pearls, found through the kind index."""
+    offsets = [o for o, _ in PEARL_INDEX.postings(key("pearls", "kind", "continuity"), last=retain)]
+    rows = 0
+    tmp = INDEX_PATH.with_name(INDEX_PATH.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as out:
+        for i in range(0, len(offsets), FETCH_BATCH):
+            if check:
+                check()
+            for j in PEARL_INDEX.fetch("pearls", offsets[i:i + FETCH_BATCH]):
+                if _wanted(j):
+                    out.write(_row(j))
+                    rows += 1
+    tmp.replace(INDEX_PATH)
+    return {"offset": offsets[-1] + 1 if offsets else 0, "rows": rows, "bytes": INDEX_PATH.stat().st_size}
+
+def sync(retain=RETAIN, check=None) -> dict:
+    """Append continuity pearls logged since the last sync; returns the index state.
+    check(), if given, is called between batches and may raise to abandon the
+    sync before anything is appended."""
+    PEARL_LOG.flush()
+    with _locked():
+        st = _load_state()
+        if st is None or not INDEX_PATH.exists():
+            st = _rebuild(retain, check)
+        out = []
+        for n, (off, j) in enumerate(PEARL_LOG.read_from(st["offset"])):
+            if check and not n % FETCH_BATCH:
+                check()
+            if _wanted(j):
+                out.append(_row(j))
+            st["offset"] = off + 1
+        with INDEX_PATH.open("r+b") as f:
+            # rows an interrupted sync appended past the saved state would repeat
+            f.truncate(st["bytes"])
+            f.seek(0, 2)
+            f.write("".join(out).encode("utf-8"))
+            st["bytes"] = f.tell()
+        st["rows"] += len(out)
+        _save_state(st)
+    if st["rows"] > retain + COMPACT_SLACK and _compacting.acquire(blocking=False):
+        threading.Thread(target=compact, args=(retain, True), daemon=True).start()
+    return st
+
+def compact(retain=RETAIN, _held=False) -> int:
+    """Rewrite the index down to its newest `retain` rows; returns rows dropped."""
+    if not _held:
+        _compacting.acquire()
+    try:
+        with _locked():
+            st = _load_state()
+            if st is None or st["rows"] <= retain:
+                return 0
+            with INDEX_PATH.open("rb") as f:
+                lines = f.read(st["bytes"]).splitlines(keepends=True)
+            keep = lines[-retain:]
+            tmp = INDEX_PATH.with_name(INDEX_PATH.name + ".tmp")
+            tmp.write_bytes(b"".join(keep))
+            tmp.replace(INDEX_PATH)
+            st["rows"], st["bytes"] = len(keep), sum(map(len, keep))
+            _save_state(st)
+            return len(lines) - len(keep)
+    finally:
+        _compacting.release()
+
+def rebuild_index(limit=RETAIN):
+    """Drop the index and rebuild it from the newest `limit` continuity pearls."""
+    with _locked():
+        STATE_PATH.unlink(missing_ok=True)
+        INDEX_PATH.unlink(missing_ok=True)
+    return sync(limit)["rows"]
 
 if __name__ == "__main__":
-    print("Rebuilt:", rebuild_index())
+    st = sync()
+    print("Indexed:", st["rows"], "dropped:", compact())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+Continuity pipeline: fetch -> ingest -> index as in-process stages.
+Replaces three interpreter launches per cycle.  Each stage is timed, logged
+and bounded by its own timeout, which the stage checks between units of
+work; the index stage only tails the pearls the ingest stage just appended.
+"""
+import time, logging
+from skg import continuity_fetch, continuity, continuity_index
+
+STAGE_TIMEOUT = 240        # seconds, per stage (as the old subprocess timeout)
+
+logger = logging.getLogger("skg-core.continuity")
+
+class StageTimeout(Exception):
+    pass
+
+class _Deadline:
+    """Raises StageTimeout once called past the stage's time.  Called between
+    files and log batches, never inside a flush or locked write."""
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.at = time.monotonic() + seconds if seconds else None
+
+    def __call__(self):
+        if self.at is not None and time.monotonic() > self.at:
+            raise StageTimeout(f"exceeded {self.seconds}s")
+
+class ContinuityPipeline:
+    def __init__(self, timeouts=None, retain=continuity_index.RETAIN):
+        self.timeouts = {"fetch": STAGE_TIMEOUT, "ingest": STAGE_TIMEOUT, "index": STAGE_TIMEOUT}
+        self.timeouts.update(timeouts or {})
+        self.retain = retain
+
+    def _stage(self, name, fn):
+        start = time.time()
+        try:
+            out = fn(_Deadline(self.timeouts.get(name)))
+            logger.info(f"[continuity:{name}] OK in {time.time() - start:.2f}s")
+            return True, out
+        except Exception as e:
+            logger.warning(f"[continuity:{name}] failed after {time.time() - start:.2f}s: {e}")
+            return False, None
+
+    def run(self) -> dict:
+        _, fetched = self._stage("fetch", lambda check: continuity_fetch.fetch_new(check=check))
+        _, imported = self._stage("ingest", lambda check: continuity.ingest_new_exports(check=check))
+        _, st = self._stage("index", lambda check: continuity_index.sync(self.retain, check=check))
+        return {"fetched": fetched, "imported": imported, "indexed": st and st["rows"]}
+
+PIPELINE = ContinuityPipeline()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(PIPELINE.run())
@@ -2,23 +2,35 @@
 import sys; sys.path.append('/opt/skg')
 """
 Topology Encoder (append-only)
-- encode_new(): scan pearls.jsonl from last pointer and append coordinates to topology_index.jsonl
+- encode_new(): scan the pearl log from last pointer and append coordinates to topology_index.jsonl,
+  checkpointing (pearl offset, index bytes) every CHECKPOINT_ROWS rows so a crash resumes there
 - encode_text(s): helper -> small fixed-length vector (normalized token frequencies)
+- encode_texts(lines): the same vectors for many lines at once, one row per line
 """
-import json, math, time, re
+import os, json, math, time, re, bisect
 from pathlib import Path
-from collections import Counter
+from collections import Counter, defaultdict
+from itertools import count
 from datetime import datetime
 from skg.paths import SKG_MEMORY_DIR, SKG_STATE_DIR
+from skg.seglog import PEARL_LOG
+
+try:
+    import numpy as np
+except ImportError:   # optional: encode_texts falls back to encode_text per line
+    np = None
 
-PEARLS_PATH   = Path(SKG_MEMORY_DIR) / "pearls.jsonl"
 TOPO_INDEX    = Path(SKG_MEMORY_DIR) / "topology_index.jsonl"
 VECTOR_DIR    = Path(SKG_STATE_DIR)  / "vectors"
 VECTOR_DIR.mkdir(parents=True, exist_ok=True)
 STATE_VECTOR  = VECTOR_DIR / "state_vector.json"
 POINTER_PATH  = VECTOR_DIR / "encoder_pointer.json"
 
+CHECKPOINT_ROWS = 1000
+WRITE_BUFFER    = 1 << 20
+
 WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+LINE_WORD_RE = re.compile(r"[A-Za-z0-9_]+|\n")
 
 def _tokenize(msg: str) -> list[str]:
     return [w.lower() for w in WORD_RE.findall(msg or "")]
@@ -30,13 +42,82 @@ def encode_text(text: str, top_n: int = 8):
     tot = sum(counts[t] for t in tops) or 1
     return [counts[t]/tot for t in tops] + [0.0]*(top_n-len(tops))
 
+def encode_texts(texts, top_n: int = 8):
+    """encode_text() for every line, as an (n, top_n) float64 array.
+
+    Tokens are mapped into one shared vocabulary, then per-line counts, the
+    top-n ranking (count desc, first appearance in the line on ties) and the
+    normalisation all run as array operations.  Rows equal encode_text(line)
+    exactly.  Without NumPy this returns a list of encode_text() lists.
+    """
+    if np is None:
+        return [encode_text(t, top_n) for t in texts]
+    n = len(texts)
+    out = np.zeros((n, top_n), dtype="f8")
+    # one regex pass over all lines, "\n" marking line ends; raw tokens get
+    # ids in C (defaultdict), and only the distinct ones are lowercased
+    joined = "\n".join((t or "").replace("\n", " ") for t in texts) + "\n"
+    raw = defaultdict(count().__next__)
+    raw_ids = np.fromiter(map(raw.__getitem__, LINE_WORD_RE.findall(joined)), dtype="i8")
+    vocab = {}
+    lowered = np.array([vocab.setdefault(w.lower(), len(vocab)) for w in raw], dtype="i8")
+    eol = raw_ids == raw["\n"]
+    line = np.cumsum(eol)[~eol]
+    ids = lowered[raw_ids[~eol]]
+    if not len(ids) or not top_n:
+        return out
+    keys = line * len(vocab) + ids
+    uniq, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    ln = uniq // len(vocab)
+    order = np.lexsort((first, -counts, ln))
+    ln, counts = ln[order], counts[order]
+    rank = np.arange(len(ln)) - np.searchsorted(ln, ln, side="left")
+    keep = rank < top_n
+    ln, rank, counts = ln[keep], rank[keep], counts[keep]
+    tot = np.bincount(ln, weights=counts, minlength=n)
+    out[ln, rank] = counts / tot[ln]
+    return out
+
 def _phase_from_ts(ts: float) -> float:
     return (ts % 60.0) / 60.0 * (2*math.pi)
 
-def _energy_from_counts(counts: Counter) -> float:
-    k = 8
-    vals = [c for _, c in counts.most_common(k)]
-    return math.sqrt(sum(v*v for v in vals)) if vals else 0.0
+class _TopTokens:
+    """Running token counts with the k most common maintained incrementally.
+
+    Ranks exactly like Counter.most_common(k): count descending, ties in order
+    of first appearance.  Counts only grow, so every token outside the top k
+    ranks below all of it and a +1 can only swap the token with the current
+    minimum -- O(log k) per token instead of a scan of the whole vocabulary.
+    """
+    def __init__(self, k=8):
+        self.k = k
+        self.counts = Counter()
+        self._first = {}          # token -> first-seen position (tie-break)
+        self._top = []            # ascending (count, -first, token)
+
+    def update(self, toks):
+        for t in toks:
+            c = self.counts[t]
+            self.counts[t] = c + 1
+            if not c:
+                self._first[t] = len(self._first)
+            old = (c, -self._first[t], t)
+            new = (c + 1, -self._first[t], t)
+            i = bisect.bisect_left(self._top, old)
+            if i < len(self._top) and self._top[i] == old:
+                del self._top[i]
+            elif len(self._top) >= self.k:
+                if new < self._top[0]:
+                    continue
+                del self._top[0]
+            bisect.insort(self._top, new)
+
+    def most_common(self) -> list:
+        return [(t, c) for c, _, t in reversed(self._top)]
+
+    def energy(self) -> float:
+        vals = [c for c, _, _ in self._top]
+        return math.sqrt(sum(v*v for v in reversed(vals))) if vals else 0.0
 
 def load_pointer():
     if POINTER_PATH.exists():
@@ -44,12 +125,44 @@ def load_pointer():
     return {"offset": 0}
 
 def save_pointer(ptr):
-    POINTER_PATH.write_text(json.dumps(ptr, indent=2))
-
-def append_topology_row(row: dict):
-    TOPO_INDEX.parent.mkdir(parents=True, exist_ok=True)
-    with TOPO_INDEX.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    tmp = POINTER_PATH.with_name(POINTER_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(ptr, indent=2))
+    tmp.replace(POINTER_PATH)
+
+class TopologyWriter:
+    """Buffered append to topology_index.jsonl with atomic pointer checkpoints.
+
+    The pointer records the pearl offset together with the index size at the
+    same moment; on open, rows written after the last checkpoint are cut off,
+    so a restarted encode neither skips nor duplicates rows.
+    """
+    def __init__(self, pointer: dict):
+        self.pointer = pointer
+        TOPO_INDEX.parent.mkdir(parents=True, exist_ok=True)
+        self.f = TOPO_INDEX.open("ab", buffering=WRITE_BUFFER)
+        end = pointer.get("topo_bytes")
+        if end is not None and self.f.tell() > end:
+            self.f.truncate(end)
+            # an O_APPEND handle keeps its old position; tell() must report the new end
+            self.f.seek(0, 2)
+        self.rows = 0
+
+    def write(self, row: dict, next_offset: int):
+        self.f.write((json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.rows += 1
+        self.pointer["offset"] = next_offset
+        if self.rows % CHECKPOINT_ROWS == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.pointer["topo_bytes"] = self.f.tell()
+        save_pointer(self.pointer)
+
+    def close(self):
+        self.checkpoint()
+        self.f.close()
 
 def snapshot_vector(vector: dict):
     versions = []
@@ -66,59 +179,55 @@ def snapshot_vector(vector: dict):
 def encode_new():
     pointer = load_pointer()
     offset = pointer.get("offset", 0)
-    if not PEARLS_PATH.exists():
+    if not PEARL_LOG.end_offset():
         return {"processed": 0, "note": "no pearls"}
 
+    t0 = time.perf_counter()
     processed = 0
-    token_counts = Counter()
-    kind_counts  = Counter()
-
-    with PEARLS_PATH.open("r", encoding="utf-8") as f:
-        f.seek(offset)
-        for line in f:
-            pos = f.tell()
-            try:
-                pearl = json.loads(line)
-            except Exception:
-                continue
-
-            ts = pearl.get("timestamp") or pearl.get("ts") or time.time()
-            kind = pearl.get("type") or pearl.get("kind") or "unknown"
-            msg  = pearl.get("data", {}).get("insight") or pearl.get("msg") or pearl.get("text") or ""
-            toks = _tokenize(msg)
-            token_counts.update(toks)
-            kind_counts.update([kind])
-
-            phase  = _phase_from_ts(ts)
-            energy = _energy_from_counts(token_counts)
-
-            # tiny normalized vector from current token counts (top 8)
-            top_tokens = [t for t,_ in token_counts.most_common(8)]
-            tot = sum(token_counts[t] for t in top_tokens) or 1
-            vec = [(token_counts[t]/tot) for t in top_tokens]
-
-            topo_row = {
-                "ts": ts,
-                "kind": kind,
-                "phase": phase,
-                "energy": energy,
-                "top_tokens": top_tokens,
-                "vec": vec,
-            }
-            append_topology_row(topo_row)
-            processed += 1
-        pointer["offset"] = f.tell()
+    tokens      = _TopTokens(8)
+    kind_counts = Counter()
+    out = TopologyWriter(pointer)
+
+    for pos, pearl in PEARL_LOG.read_from(offset):
+        ts = pearl.get("timestamp") or pearl.get("ts") or time.time()
+        kind = pearl.get("type") or pearl.get("kind") or "unknown"
+        msg  = pearl.get("data", {}).get("insight") or pearl.get("msg") or pearl.get("text") or ""
+        toks = _tokenize(msg)
+        tokens.update(toks)
+        kind_counts.update([kind])
+
+        phase  = _phase_from_ts(ts)
+        energy = tokens.energy()
+
+        # tiny normalized vector from current token counts (top 8)
+        top = tokens.most_common()
+        top_tokens = [t for t,_ in top]
+        tot = sum(c for _,c in top) or 1
+        vec = [(c/tot) for _,c in top]
+
+        topo_row = {
+            "ts": ts,
+            "kind": kind,
+            "phase": phase,
+            "energy": energy,
+            "top_tokens": top_tokens,
+            "vec": vec,
+        }
+        out.write(topo_row, pos + 1)
+        processed += 1
+    out.close()
+    elapsed = time.perf_counter() - t0
 
     dom_kind = max(kind_counts, key=kind_counts.get) if kind_counts else None
     state_vec = {
         "dominant_kind": dom_kind,
-        "token_count": sum(token_counts.values()),
-        "distinct_tokens": len(token_counts),
-        "energy": _energy_from_counts(token_counts),
+        "token_count": sum(tokens.counts.values()),
+        "distinct_tokens": len(tokens.counts),
+        "energy": tokens.energy(),
     }
     snapshot_vector(state_vec)
-    save_pointer(pointer)
-    return {"processed": processed, "dominant_kind": dom_kind, "energy": state_vec["energy"]}
+    return {"processed": processed, "dominant_kind": dom_kind, "energy": state_vec["energy"],
+            "rows_per_s": round(processed / elapsed, 1) if elapsed > 0 else 0.0}
 
 if __name__ == "__main__":
     print(encode_new())
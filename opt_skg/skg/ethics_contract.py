@@ -5,61 +5,44 @@ Universal Field Contract (UFC)
   Non-oppression (no withholding/privileging), Accountability (audit).
 We score each principle from existing SKG signals; no gating—only reflection + audit.
 """
-import os, json, math, time, collections
+import os, time
 from skg.telemetry_bus import read as t_read, upsert as t_upsert
 from skg.governance import append_event
 from skg.ethics_equilibrium import compute_equilibrium
+from skg.ethics_window import AUDIT_WINDOW
 
 AUDIT="/var/lib/skg/memory/governance.audit.jsonl"
-TELE="/var/lib/skg/memory/telemetry.json"
-
-def _read_jsonl(p, n=2000):
-    if not os.path.exists(p): return []
-    with open(p) as f:
-        lines=[l for l in f if l.strip()]
-    return [json.loads(l) for l in lines[-n:]]
-
-def _actor_evenness(audit):
-    if not audit: return 0.0
-    cnt=collections.Counter(e.get("actor","?") for e in audit if isinstance(e,dict))
-    tot=sum(cnt.values()) or 1
-    ps=[c/tot for c in cnt.values()]
-    H = -sum(p*math.log(p+1e-12,2) for p in ps)
-    Hmax = math.log(len(ps)+1e-12,2)
-    return (H/Hmax) if Hmax>0 else 0.0
 
 def _observability_score():
     # if telemetry & audit exist and are updating, assume high truth observability
-    tele_ok=os.path.exists(TELE)
+    tele_ok=bool(t_read())
     aud_ok=os.path.exists(AUDIT)
     return 1.0 if (tele_ok and aud_ok) else 0.4 if (tele_ok or aud_ok) else 0.0
 
 def _freedom_score(audit):
     # proportion of "propose"/"reflection" vs "deny"/"error"
-    if not audit: return 0.5
-    pos=sum(1 for e in audit if str(e.get("type","")).startswith(("reflection","pearl","propose")))
-    neg=sum(1 for e in audit if "deny" in json.dumps(e))
+    if not len(audit): return 0.5
+    pos=audit.pos
+    neg=audit.neg
     tot=max(1,pos+neg)
     return max(0.0,min(1.0,(pos-0.25*neg)/tot + 0.5))
 
 def _privacy_consent_score(audit):
     # assume consent if actions are invoked via skills/API (actor present) and no hidden actors
-    if not audit: return 0.6
-    hidden=sum(1 for e in audit if e.get("actor") in (None,"?"))
-    return max(0.0, min(1.0, 1.0 - hidden/max(1,len(audit))))
+    if not len(audit): return 0.6
+    return max(0.0, min(1.0, 1.0 - audit.hidden/max(1,len(audit))))
 
 def _non_oppression_score(audit):
     # evenness proxy: no single actor dominates the audit log
-    return _actor_evenness(audit)
+    return audit.actor_evenness()
 
 def _accountability_score(audit):
     # presence of timestamps + structured fields
-    if not audit: return 0.5
-    structured=sum(1 for e in audit if isinstance(e,dict) and "actor" in e and "type" in e and "ts" in e)
-    return structured/len(audit)
+    if not len(audit): return 0.5
+    return audit.structured/len(audit)
 
 def evaluate_contract():
-    audit=_read_jsonl(AUDIT)
+    audit=AUDIT_WINDOW.refresh()
     eq=compute_equilibrium()   # gives entropy_norm, anchors, evenness, field_energy, equilibrium
     truth=_observability_score()
     freedom=_freedom_score(audit)
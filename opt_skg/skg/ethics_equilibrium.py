@@ -9,56 +9,21 @@ No gatekeeping. We *measure* balance using:
   - field energy from spherical waveform + gravity proxy,
 Then publish indices into telemetry.ethics and append an auditable event.
 """
-import os, json, math, time, collections
+import json, time
 from skg.telemetry_bus import read as t_read, upsert as t_upsert
 from skg.governance import append_event
 from skg.physics_field import compose_information_energy
+from skg.ethics_window import PEARL_WINDOW, AUDIT_WINDOW
 # graceful fallbacks if optional modules are absent
 try:
     from skg.physics import gravity_score
 except Exception:
     def gravity_score(tele, phase="Unified"): return 0.0
 
-PEARLS = "/var/lib/skg/memory/pearls.jsonl"
 AUDIT  = "/var/lib/skg/memory/governance.audit.jsonl"
 PHASEF = "/var/lib/skg/memory/phase.current"
 ADAPT  = "/var/lib/skg/memory/adaptive.state.json"
 
-def _read_jsonl(path, max_lines=2000):
-    if not os.path.exists(path): return []
-    out=[]
-    with open(path) as f:
-        for line in f:
-            if not line.strip(): continue
-            out.append(json.loads(line))
-    return out[-max_lines:]
-
-def _avg_entropy(pearls):
-    if not pearls: return 0.0
-    vals=[p.get("entropy",0.0) for p in pearls if isinstance(p, dict)]
-    return sum(vals)/len(vals) if vals else 0.0
-
-def _anchor_coverage(pearls):
-    if not pearls: return 0.0
-    ok=0
-    for p in pearls:
-        anc=p.get("anchors",[])
-        if isinstance(anc, list) and len(anc)>0: ok+=1
-    return ok/len(pearls)
-
-def _actor_evenness(audit):
-    """
-    Shannon evenness over actor distribution in governance.
-    Evenness = H / Hmax ; H = -Σ p_i log p_i
-    """
-    if not audit: return 0.0
-    cnt=collections.Counter([e.get("actor","?") for e in audit if isinstance(e,dict)])
-    total=sum(cnt.values()) or 1
-    ps=[c/total for c in cnt.values()]
-    H = -sum(p*math.log(p+1e-12, 2) for p in ps)
-    Hmax = math.log(len(ps)+1e-12, 2)
-    return (H / Hmax) if Hmax>0 else 0.0
-
 def _current_phase():
     try:
         return open(PHASEF).read().strip() or "Unified"
@@ -72,8 +37,8 @@ def _adapt_state():
         return {"lfo_amp":0.55,"lfo_freq":0.0025,"entropy_avg":0.0}
 
 def compute_equilibrium():
-    pearls=_read_jsonl(PEARLS, 2000)
-    audit =_read_jsonl(AUDIT , 2000)
+    pearls=PEARL_WINDOW.refresh()
+    audit =AUDIT_WINDOW.refresh()
     phase=_current_phase()
     adapt=_adapt_state()
     tele  =t_read()
@@ -88,10 +53,10 @@ def compute_equilibrium():
         "exfil":        bool(last_tele.get("exfil", False)),
     }, phase=phase)
 
-    entropy_bal = _avg_entropy(pearls)                # 0..~1.6 normal range for 3 scenarios
+    entropy_bal = pearls.entropy_mean()               # 0..~1.6 normal range for 3 scenarios
     entropy_norm= min(1.0, entropy_bal / 1.6)         # normalize to [0..1]
-    anchors     = _anchor_coverage(pearls)            # 0..1
-    evenness    = _actor_evenness(audit)              # 0..1
+    anchors     = pearls.anchor_coverage()            # 0..1
+    evenness    = audit.actor_evenness()              # 0..1
     field_e     = compose_information_energy(amp,freq,grav,phase)  # 0..1
 
     # truth/equilibrium index = balanced blend
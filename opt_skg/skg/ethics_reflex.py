@@ -4,13 +4,11 @@ Ethics Reflex: post-hoc coherence analysis (no moral judgements).
 Reads recent governance events and emits a reflection with a coherence score.
 """
 import json, time, os
+from skg.tail import tail_jsonl
 AUDIT="/var/lib/skg/memory/governance.audit.jsonl"
 
 def tail_events(n=100):
-    if not os.path.exists(AUDIT): return []
-    with open(AUDIT) as f:
-        lines=[l for l in f if l.strip()][-n:]
-        return [json.loads(l) for l in lines]
+    return tail_jsonl(AUDIT, n)
 
 def coherence_score(events):
     # toy: fewer forced rollbacks → higher coherence; more citations → higher
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Sliding-window aggregates for the ethics indices.
+PEARL_WINDOW and AUDIT_WINDOW tail the pearl log and the governance audit from
+their last read offset and keep running counters over the newest WINDOW
+records (entropy sum, anchor coverage, actor histogram, deny/rollback and
+structured-field counts), so ethics_equilibrium and ethics_contract evaluate
+in O(1) per call instead of re-parsing both logs.  The entropy sum is exact
+(Fraction), so it never drifts however long the window slides.
+"""
+import os, json, math, threading
+from collections import deque
+from fractions import Fraction
+from skg.seglog import PEARL_LOG
+from skg.audit_log import AUDIT_PATH, AUDIT_LOG
+from skg.tail import tail_jsonl_cursor
+
+WINDOW = int(os.getenv("SKG_ETHICS_WINDOW", "2000"))
+
+def _entropy(p) -> float:
+    v = p.get("entropy", 0.0)
+    try:
+        v = float(v)
+    except Exception:
+        return 0.0
+    return v if math.isfinite(v) else 0.0
+
+class PearlWindow:
+    def __init__(self, log=PEARL_LOG, size=WINDOW):
+        self.log = log
+        self.size = size
+        self._mu = threading.Lock()
+        self._next = None
+        self._rows = deque()        # (entropy, anchored, is_dict)
+        self._entropy = Fraction(0)
+        self._dicts = self._anchored = 0
+
+    def _push(self, rec):
+        is_dict = isinstance(rec, dict)
+        anc = rec.get("anchors", []) if is_dict else None
+        row = (Fraction(_entropy(rec)) if is_dict else Fraction(0),
+               isinstance(anc, list) and len(anc) > 0, is_dict)
+        self._rows.append(row)
+        self._entropy += row[0]; self._anchored += row[1]; self._dicts += row[2]
+        if len(self._rows) > self.size:
+            e, a, d = self._rows.popleft()
+            self._entropy -= e; self._anchored -= a; self._dicts -= d
+
+    def refresh(self):
+        AUDIT_LOG.flush()       # records the batch writer still holds
+        with self._mu:
+            if self._next is None:
+                rows = self.log.tail(self.size, offsets=True)
+                self._next = rows[-1][0] + 1 if rows else 0
+            else:
+                rows = self.log.read_from(self._next)
+            for off, rec in rows:
+                self._push(rec)
+                self._next = off + 1
+        return self
+
+    def entropy_mean(self) -> float:
+        return float(self._entropy / self._dicts) if self._dicts else 0.0
+
+    def anchor_coverage(self) -> float:
+        return self._anchored / len(self._rows) if self._rows else 0.0
+
+class AuditWindow:
+    def __init__(self, path=AUDIT_PATH, size=WINDOW):
+        self.path = str(path)
+        self.size = size
+        self._mu = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, cursor):
+        self._cursor = cursor       # (inode, end offset) of the last complete line read
+        self._seq = 0
+        self._rows = deque()        # (seq, actor, pos, neg, hidden, structured, rollback)
+        self._actors = {}           # actor -> deque of seqs in the window
+        self.pos = self.neg = self.hidden = self.structured = self.rollbacks = 0
+
+    def _push(self, e):
+        text = json.dumps(e)
+        actor = e.get("actor", "?")
+        row = (self._seq, actor,
+               str(e.get("type", "")).startswith(("reflection", "pearl", "propose")),
+               "deny" in text,
+               e.get("actor") in (None, "?"),
+               "actor" in e and "type" in e and "ts" in e,
+               "rollback" in text)
+        self._seq += 1
+        self._rows.append(row)
+        self._actors.setdefault(actor, deque()).append(row[0])
+        self._count(row, 1)
+        if len(self._rows) > self.size:
+            old = self._rows.popleft()
+            seqs = self._actors[old[1]]
+            seqs.popleft()
+            if not seqs:
+                del self._actors[old[1]]
+            self._count(old, -1)
+
+    def _count(self, row, d):
+        self.pos += d * row[2]; self.neg += d * row[3]; self.hidden += d * row[4]
+        self.structured += d * row[5]; self.rollbacks += d * row[6]
+
+    def refresh(self):
+        with self._mu:
+            try:
+                fd = os.open(self.path, os.O_RDONLY)
+            except OSError:
+                self._reset(None)
+                return self
+            try:
+                st = os.fstat(fd)
+                if self._cursor is None or self._cursor[0] != st.st_ino or st.st_size < self._cursor[1]:
+                    recs, cursor = tail_jsonl_cursor(self.path, self.size)
+                    self._reset(cursor)
+                    for e in recs:
+                        self._push(e)
+                    return self
+                ino, end = self._cursor
+                buf = os.pread(fd, st.st_size - end, end)
+            finally:
+                os.close(fd)
+            for line in buf.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    e = json.loads(line)
+                except Exception:
+                    continue
+                if isinstance(e, dict):
+                    self._push(e)
+            self._cursor = (ino, end)
+        return self
+
+    def __len__(self):
+        return len(self._rows)
+
+    def actor_counts(self) -> list:
+        """Actor counts in order of first appearance within the window."""
+        return [len(s) for _, s in sorted(self._actors.items(), key=lambda kv: kv[1][0])]
+
+    def actor_evenness(self) -> float:
+        """Shannon evenness H / Hmax over the actor histogram."""
+        if not self._rows: return 0.0
+        counts = self.actor_counts()
+        total = sum(counts) or 1
+        ps = [c / total for c in counts]
+        H = -sum(p * math.log(p + 1e-12, 2) for p in ps)
+        Hmax = math.log(len(ps) + 1e-12, 2)
+        return (H / Hmax) if Hmax > 0 else 0.0
+
+PEARL_WINDOW = PearlWindow()
+AUDIT_WINDOW = AuditWindow()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Full-Text Index
+Incrementally maintained inverted index (token -> documents) over the pearl
+log, the governance audit and the learn vault.
+
+  matches(text)            records whose text contains `text`, case-insensitive
+                           (the substring semantics recall/search always had)
+  search(q, mode, k)       AND/OR token query ranked by BM25
+
+Tokens are maximal runs of lowercase letters.  Any record containing a query
+substring must contain, for each letter run of the query, a token that
+contains that run, so candidates come from the vocabulary and only they are
+read back and verified.  Each sync() writes one immutable segment of
+varint-delta postings; a background thread merges segments of the same
+size tier, so there are fewer than FANOUT per tier.
+
+Layout under fulltext/:
+  state.json      source cursors, segment list, document totals
+  docs.bin        fixed-size (source, epoch, offset, length) per document id
+  <n>.seg         compressed vocabulary header + postings
+"""
+
+import os, re, json, math, zlib, struct, fcntl, threading
+from collections import Counter
+from pathlib import Path
+from skg.paths import SKG_MEMORY_DIR
+from skg.seglog import PEARL_LOG
+from skg.audit_log import AUDIT_PATH, AUDIT_LOG
+
+INDEX_DIR  = Path(SKG_MEMORY_DIR) / "fulltext"
+VAULT_PATH = Path(SKG_MEMORY_DIR) / "learn_vault.jsonl"
+SOURCES    = ("pearls", "audit", "vault")
+FANOUT     = 8            # merge once this many segments share a size tier
+BM25_K1    = 1.2
+BM25_B     = 0.75
+
+_TOKEN = re.compile(r"[a-z]+")
+_DOC   = struct.Struct("<BHQI")     # source, epoch, offset, token count
+_LEN   = struct.Struct("<I")
+
+def tokens(text: str) -> list:
+    return _TOKEN.findall(text.lower())
+
+def _put_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _encode(postings) -> bytes:
+    """(doc, tf) pairs, ascending doc, as varint doc deltas and tfs."""
+    out, prev = bytearray(), 0
+    for doc, tf in postings:
+        _put_varint(out, doc - prev)
+        _put_varint(out, tf)
+        prev = doc
+    return bytes(out)
+
+def _decode(buf: bytes) -> list:
+    out, vals, n, shift, prev = [], [], 0, 0, 0
+    for b in buf:
+        n |= (b & 0x7F) << shift
+        if b & 0x80:
+            shift += 7
+            continue
+        vals.append(n)
+        n = shift = 0
+        if len(vals) == 2:
+            prev += vals[0]
+            out.append((prev, vals[1]))
+            vals = []
+    return out
+
+class _SegmentFile:
+    """Immutable segment: header {token: [pos, nbytes, df]} then postings."""
+    def __init__(self, path):
+        # keep the descriptor: a merge may unlink the file while we still read it
+        self.fd = os.open(path, os.O_RDONLY)
+        (hlen,) = _LEN.unpack(os.pread(self.fd, _LEN.size, 0))
+        self.vocab = json.loads(zlib.decompress(os.pread(self.fd, hlen, _LEN.size)))
+        self.data_at = _LEN.size + hlen
+
+    def postings(self, tok) -> list:
+        ent = self.vocab.get(tok)
+        if not ent:
+            return []
+        return _decode(os.pread(self.fd, ent[1], self.data_at + ent[0]))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __del__(self):
+        # readers hold their snapshot's segments, so the last reference closes the fd
+        if hasattr(self, "fd"):
+            self.close()
+
+    @staticmethod
+    def write(path, postings: dict):
+        vocab, blob = {}, bytearray()
+        for tok in sorted(postings):
+            enc = _encode(postings[tok])
+            vocab[tok] = [len(blob), len(enc), len(postings[tok])]
+            blob += enc
+        head = zlib.compress(json.dumps(vocab, separators=(",", ":")).encode())
+        tmp = Path(str(path) + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_LEN.pack(len(head)) + head + bytes(blob))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(path)
+
+class FullTextIndex:
+    def __init__(self, root=INDEX_DIR, log=PEARL_LOG, audit_path=AUDIT_PATH, vault_path=VAULT_PATH):
+        self.root = Path(root)
+        self.log = log
+        self.files = {"audit": Path(audit_path), "vault": Path(vault_path)}
+        self._segs = {}                 # name -> _SegmentFile (segments never change)
+        self._mu = threading.Lock()     # guards _segs: API threads and the merge thread share it
+        self._merging = None
+
+    # --- persistence --------------------------------------------------------
+    def _locked(self, how):
+        self.root.mkdir(parents=True, exist_ok=True)
+        lk = open(self.root / ".lock", "a")
+        fcntl.flock(lk, how)
+        return lk
+
+    def _state(self):
+        try:
+            return json.loads((self.root / "state.json").read_text())
+        except Exception:
+            return {"pearls": 0, "audit": {"ino": 0, "end": 0, "epoch": 0},
+                    "vault": {"ino": 0, "end": 0, "epoch": 0},
+                    "segments": [], "next_seg": 0, "docs": 0, "tokens": 0}
+
+    def _save(self, st):
+        tmp = self.root / "state.json.tmp"
+        tmp.write_text(json.dumps(st))
+        tmp.replace(self.root / "state.json")
+
+    def _seg(self, name) -> _SegmentFile:
+        with self._mu:
+            s = self._segs.get(name)
+            if s is None:
+                s = self._segs[name] = _SegmentFile(self.root / name)
+            return s
+
+    # --- indexing -----------------------------------------------------------
+    def sync(self) -> int:
+        """Index records appended since the last sync; returns documents added."""
+        AUDIT_LOG.flush()
+        with self._locked(fcntl.LOCK_EX):
+            st = self._state()
+            before = json.dumps(st)
+            docs, postings = bytearray(), {}
+            def add(src, epoch, off, text):
+                counts = Counter(tokens(text))
+                doc = st["docs"] + len(docs) // _DOC.size
+                docs.extend(_DOC.pack(SOURCES.index(src), epoch, off, sum(counts.values())))
+                st["tokens"] += sum(counts.values())
+                for tok, tf in counts.items():
+                    postings.setdefault(tok, []).append((doc, tf))
+            for off, rec in self.log.read_from(st["pearls"]):
+                add("pearls", 0, off, json.dumps(rec))
+                st["pearls"] = off + 1
+            for src in ("audit", "vault"):
+                self._sync_file(st, src, add)
+            n = len(docs) // _DOC.size
+            if n:
+                name = f"{st['next_seg']:08d}.seg"
+                _SegmentFile.write(self.root / name, postings)
+                with open(self.root / "docs.bin", "ab") as f:
+                    # drop documents a crashed sync wrote past the committed count
+                    f.truncate(st["docs"] * _DOC.size)
+                    f.write(docs)
+                st["segments"].append([name, n])
+                st["next_seg"] += 1
+                st["docs"] += n
+            if json.dumps(st) != before:
+                self._save(st)
+            merge = self._merge_plan(st["segments"]) is not None
+        if merge:
+            self._merge_async()
+        return n
+
+    def _sync_file(self, st, src, add):
+        cur = st[src]
+        try:
+            fd = os.open(self.files[src], os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            fs = os.fstat(fd)
+            if fs.st_ino != cur["ino"] or fs.st_size < cur["end"]:
+                # rotated or truncated: documents of the old epoch no longer resolve
+                cur.update(ino=fs.st_ino, end=0, epoch=(cur["epoch"] + 1) % 0x10000)
+            buf = os.pread(fd, fs.st_size - cur["end"], cur["end"])
+        finally:
+            os.close(fd)
+        off = cur["end"]
+        for line in buf.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            text = line.decode("utf-8", "replace")
+            if src == "vault":
+                add(src, cur["epoch"], off, text)
+            else:
+                try:
+                    rec = json.loads(text)
+                    if isinstance(rec, dict):
+                        add(src, cur["epoch"], off, json.dumps(rec))
+                except Exception:
+                    pass
+            off += len(line)
+        cur["end"] = off
+
+    # --- background merges --------------------------------------------------
+    @staticmethod
+    def _merge_plan(segments):
+        """The FANOUT oldest segments of the lowest size tier holding at least
+        FANOUT of them, if any; this keeps fewer than FANOUT segments per tier."""
+        tiers = {}
+        for seg in segments:
+            tiers.setdefault(int(math.log(max(seg[1], 1), FANOUT)), []).append(seg)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= FANOUT:
+                return tiers[tier][:FANOUT]
+        return None
+
+    def _merge_async(self):
+        if self._merging is not None and self._merging.is_alive():
+            return
+        self._merging = threading.Thread(target=self.merge, name="fulltext-merge", daemon=True)
+        self._merging.start()
+
+    def merge(self) -> int:
+        """Merge same-tier segments until none qualify; returns merges done."""
+        done = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".merge", "a") as mk:
+            try:
+                fcntl.flock(mk, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return 0   # another process is merging
+            with self._locked(fcntl.LOCK_EX):
+                # every writer holds .lock while its tmp file exists, so these are crash leftovers
+                for p in self.root.glob("*.tmp"):
+                    p.unlink(missing_ok=True)
+            while True:
+                with self._locked(fcntl.LOCK_SH):
+                    st = self._state()
+                run = self._merge_plan(st["segments"])
+                if run is None:
+                    return done
+                merged = {}
+                for name, _ in run:
+                    seg = self._seg(name)
+                    for tok in seg.vocab:
+                        merged.setdefault(tok, []).extend(seg.postings(tok))
+                for post in merged.values():
+                    post.sort()               # the run need not be adjacent doc ranges
+                with self._locked(fcntl.LOCK_EX):
+                    st = self._state()
+                    gone = {name for name, _ in run}
+                    names = [s[0] for s in st["segments"]]
+                    first = names.index(run[0][0])
+                    out = f"{st['next_seg']:08d}.seg"
+                    _SegmentFile.write(self.root / out, merged)
+                    rest = [s for s in st["segments"] if s[0] not in gone]
+                    st["segments"] = rest[:first] + [[out, sum(n for _, n in run)]] + rest[first:]
+                    st["next_seg"] += 1
+                    self._save(st)
+                    for name, _ in run:
+                        (self.root / name).unlink(missing_ok=True)
+                done += 1
+
+    # --- lookups ------------------------------------------------------------
+    @staticmethod
+    def _postings(segs, tok) -> list:
+        out = []
+        for seg in segs.values():
+            out.extend(seg.postings(tok))
+        return out
+
+    def _docs(self, st, ids) -> list:
+        """(doc, source, offset, length) for live documents among ids, in id order."""
+        out = []
+        with open(self.root / "docs.bin", "rb") as f:
+            for doc in sorted(ids):
+                f.seek(doc * _DOC.size)
+                src, epoch, off, length = _DOC.unpack(f.read(_DOC.size))
+                name = SOURCES[src]
+                if name != "pearls" and epoch != st[name]["epoch"]:
+                    continue
+                out.append((doc, name, off, length))
+        return out
+
+    def _fetch(self, src, offsets) -> list:
+        """(offset, text, record) for each readable offset of src."""
+        if src == "pearls":
+            recs = self.log.read_at(offsets)
+            return [(o, json.dumps(r), r) for o, r in zip(offsets, recs) if r is not None]
+        out = []
+        try:
+            with open(self.files[src], "rb") as f:
+                for off in offsets:
+                    f.seek(off)
+                    line = f.readline().decode("utf-8", "replace")
+                    try:
+                        out.append((off, line, json.loads(line)))
+                    except Exception:
+                        continue
+        except OSError:
+            pass
+        return out
+
+    def _snapshot(self):
+        """(state, {segment name: open segment}) as of now; the caller's reference
+        keeps segments readable after a merge unlinks or retires them."""
+        self.sync()
+        with self._locked(fcntl.LOCK_SH):
+            st = self._state()
+            segs = {name: self._seg(name) for name, _ in st["segments"]}   # open before a merge can unlink
+        with self._mu:
+            for name in [n for n in self._segs if n not in segs]:
+                del self._segs[name]
+        return st, segs
+
+    def matches(self, text: str, sources=SOURCES):
+        """{source: [records containing text]} in log order, or None when
+        text has no letters to look up (callers fall back to a scan)."""
+        needle, runs = text.lower(), set(tokens(text))
+        if not runs:
+            return None
+        st, segs = self._snapshot()
+        vocab = set()
+        for seg in segs.values():
+            vocab.update(seg.vocab)
+        ids = None
+        for run in sorted(runs, key=len, reverse=True):
+            hit = set()
+            for tok in vocab:
+                if run in tok:
+                    hit.update(d for d, _ in self._postings(segs, tok))
+            ids = hit if ids is None else ids & hit
+            if not ids:
+                break
+        by_src = {s: [] for s in sources}
+        for _, src, off, _ in self._docs(st, ids or ()):
+            if src in by_src:
+                by_src[src].append(off)
+        out = {}
+        for src, offs in by_src.items():
+            out[src] = [r for _, t, r in self._fetch(src, sorted(offs)) if needle in t.lower()]
+        return out
+
+    def search(self, q: str, mode: str = "and", k: int = 10, sources=SOURCES) -> list:
+        """[(score, source, record)] for the k best BM25 matches of q's tokens."""
+        terms = list(dict.fromkeys(tokens(q)))
+        if not terms:
+            return []
+        st, segs = self._snapshot()
+        n_docs = max(st["docs"], 1)
+        avgdl = st["tokens"] / n_docs
+        per_term = {t: dict(self._postings(segs, t)) for t in terms}
+        if mode == "and":
+            ids = set.intersection(*(set(p) for p in per_term.values()))
+        else:
+            ids = set().union(*(set(p) for p in per_term.values()))
+        scored = []
+        for doc, src, off, length in self._docs(st, ids):
+            if src not in sources:
+                continue
+            score = 0.0
+            for t, post in per_term.items():
+                tf = post.get(doc)
+                if tf:
+                    idf = math.log(1 + (n_docs - len(post) + 0.5) / (len(post) + 0.5))
+                    score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl))
+            scored.append((score, doc, src, off))
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        out = []
+        for score, _, src, off in scored:
+            if len(out) >= k:
+                break
+            for _, _, rec in self._fetch(src, [off]):
+                out.append((round(score, 4), src, rec))
+        return out
+
+FULLTEXT = FullTextIndex()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        hits = FULLTEXT.search(" ".join(sys.argv[1:]), mode="or")
+        print(json.dumps([{"score": s, "source": src, "record": r} for s, src, r in hits], indent=2))
+    else:
+        print(json.dumps({"indexed": FULLTEXT.sync(), "segments": len(FULLTEXT._state()["segments"])}))
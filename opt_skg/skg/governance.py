@@ -1,10 +1,9 @@
 import os, json, time
-AUDIT = "/var/lib/skg/memory/governance.audit.jsonl"
+from skg import audit_log
+AUDIT = str(audit_log.AUDIT_PATH)
 def append_event(evt):
-    os.makedirs(os.path.dirname(AUDIT), exist_ok=True)
-    evt = dict(evt); evt.setdefault("ts", time.time())
-    with open(AUDIT,"a") as f: f.write(json.dumps(evt)+"\n")
-    return evt
+    # non-blocking: batched onto disk by skg.audit_log's writer thread
+    return audit_log.append_event(evt)
 
 # --- SKG add-on: audit_coder shim (ethics = measurable coherence; no morals) ---
 # Provides a stable interface for skg.coder and autoheal to write audited events.
@@ -87,6 +86,7 @@ def evaluate_with_moons(task:str, threshold:float=0.70)->dict:
     return {"task":task,"passed":passed,"average_score":avg,"votes":votes,"physics": phys_summary}
 from skg.crypto_utils import verify
 from skg.edcrypto import verify
+from skg.tail import tail_jsonl
 import time, json
 from pathlib import Path
 
@@ -94,9 +94,9 @@ def collect_moon_votes(task:str, window_s:int=600)->list[dict]:
     now=time.time()
     votes=[]
     for p in Path("/var/lib/skg/memory/moon_votes").glob("*.jsonl"):
-        for L in p.read_text().splitlines()[-50:]:
+        for rec in tail_jsonl(p, 50):
             try:
-                rec=json.loads(L); base=rec["data"]; sig=rec["sig"]; moon=base["moon"]
+                base=rec["data"]; sig=rec["sig"]; moon=base["moon"]
                 if base.get("task")==task and (now-base["ts"])<=window_s:
                     if verify(base, sig, moon):
                         votes.append(base)
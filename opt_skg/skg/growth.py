@@ -5,26 +5,24 @@ SKG Portable — Cognitive Growth Cycle
 Reads reflection pearls and lightly adjusts configuration.
 """
 
-import yaml, json, time
+import yaml, time
 from datetime import datetime
 from pathlib import Path
-from skg.paths import SKG_MEMORY_DIR, SKG_CONFIG_DIR
+from skg.paths import SKG_CONFIG_DIR
 from skg.state import append_pearl, log_journal
+from skg.pearl_index import PEARL_INDEX, key
 
-PEARLS_PATH = Path(SKG_MEMORY_DIR) / "pearls.jsonl"
 CONFIG_PATH = Path(SKG_CONFIG_DIR) / "config.yml"
 
 def load_recent_reflections(limit=20):
-    reflections = []
+    """Reflection pearls among the newest `limit` pearls."""
     try:
-        with PEARLS_PATH.open("r", encoding="utf-8") as f:
-            for line in f.readlines()[-limit:]:
-                item = json.loads(line)
-                if item.get("type") == "reflection":
-                    reflections.append(item)
+        window = PEARL_INDEX.postings(key("pearls"), last=limit)
+        first = window[0][0] if window else 0
+        offsets = [o for o, _ in PEARL_INDEX.postings(key("pearls", "type", "reflection"), last=limit) if o >= first]
+        return [r for r in PEARL_INDEX.fetch("pearls", offsets) if r.get("type") == "reflection"]
     except Exception:
-        pass
-    return reflections
+        return []
 
 def suggest_adjustment(reflections):
     """Naïve heuristic: if reflection count high, slow heartbeat; if low, speed up."""
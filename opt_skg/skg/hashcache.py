@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Content Hash Cache
+SHA-256 of files, remembered by (path, inode, size, mtime_ns) in
+hash_cache.json under the state dir, so fingerprinting an unchanged tree
+costs one stat per file.  A file modified within RACY_SECONDS of being
+hashed is not cached: a second write in the same mtime tick with the same
+size would otherwise go unnoticed.
+"""
+
+import os, json, time, hashlib, threading
+from skg.paths import SKG_STATE_DIR
+
+CACHE_PATH   = SKG_STATE_DIR / "hash_cache.json"
+RACY_SECONDS = 2.0
+
+def _sha256(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class HashCache:
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._mu = threading.Lock()
+        self._entries = None      # path -> [inode, size, mtime_ns, sha256]
+        self._loaded = None       # mtime_ns of the cache file we read
+
+    def _load(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._entries is not None and mtime == self._loaded:
+            return
+        try:
+            self._entries = json.loads(open(self.path).read()) if mtime is not None else {}
+        except Exception:
+            self._entries = {}
+        self._loaded = mtime
+
+    def _save(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+            self._loaded = os.stat(self.path).st_mtime_ns
+        except OSError:
+            try: os.unlink(tmp)
+            except OSError: pass
+
+    def digests(self, paths) -> dict:
+        """path -> sha256 hex digest (None if unreadable), hashing only changed files."""
+        out, dirty = {}, False
+        with self._mu:
+            self._load()
+            for p in paths:
+                p = os.fspath(p)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    out[p] = None
+                    dirty |= self._entries.pop(p, None) is not None
+                    continue
+                key = [st.st_ino, st.st_size, st.st_mtime_ns]
+                hit = self._entries.get(p)
+                if hit is not None and hit[:3] == key:
+                    out[p] = hit[3]
+                    continue
+                try:
+                    out[p] = _sha256(p)
+                except OSError:
+                    out[p] = None
+                    continue
+                if time.time() - st.st_mtime_ns / 1e9 > RACY_SECONDS:
+                    self._entries[p] = key + [out[p]]
+                    dirty = True
+            if dirty:
+                self._save()
+        return out
+
+    def sha256(self, path):
+        return self.digests([path])[os.fspath(path)]
+
+HASH_CACHE = HashCache()
+
+def file_sha256(path):
+    """Cached SHA-256 hex digest of path, or None if it cannot be read."""
+    return HASH_CACHE.sha256(path)
+
+def file_digests(paths) -> dict:
+    return HASH_CACHE.digests(paths)
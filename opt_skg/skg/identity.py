@@ -5,6 +5,8 @@ We compute content hashes of SKG's public state: governance stats, vault stats,
 This yields a stable, non-reversible "info-fingerprint".
 """
 import hashlib, json, os, glob
+from skg.tail import tail_jsonl
+from skg.hashcache import file_digests
 
 AUDIT = "/var/lib/skg/memory/governance.audit.jsonl"
 VAULT = "/var/lib/skg/memory/learn_vault.jsonl"
@@ -13,19 +15,11 @@ def _sha256_bytes(b: bytes)->str:
     return hashlib.sha256(b).hexdigest()
 
 def _file_tail(path, max_lines=200):
-    if not os.path.exists(path): return []
-    with open(path, "rb") as f:
-        data = f.readlines()[-max_lines:]
-    try: return [x.decode("utf-8","ignore").strip() for x in data if x.strip()]
-    except: return []
+    return tail_jsonl(path, max_lines)
 
 def _code_digests(root="/opt/skg/skg"):
-    dig = {}
-    for p in sorted(glob.glob(os.path.join(root, "*.py"))):
-        try:
-            with open(p,"rb") as f: dig[os.path.basename(p)] = _sha256_bytes(f.read())
-        except: pass
-    return dig
+    paths = sorted(glob.glob(os.path.join(root, "*.py")))
+    return {os.path.basename(p): h for p, h in file_digests(paths).items() if h is not None}
 
 def info_fingerprint():
     # summarize recent observable state
@@ -9,8 +9,9 @@ Runs under uvicorn on {host}:{port}
 
 from fastapi import FastAPI, Request
 from pydantic import BaseModel
-import json, time, os, importlib, traceback
+import time, os, importlib, traceback
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 
 app = FastAPI(title="SKG API")
 
@@ -19,7 +20,6 @@ SKILLS = Path("/home/skg/dev/skills")
 
 
 STATE = Path("/var/lib/skg/state")
-TELEMETRY = STATE / "telemetry.json"
 SKILLS = Path("/home/skg/dev/skills")
 
 class SkillRequest(BaseModel):
@@ -29,6 +29,12 @@ class AskRequest(BaseModel):
     text: str
     allow: list[str] | None = None
 
+class MemorySearchRequest(BaseModel):
+    text: str | None = None
+    vec: list[float] | None = None
+    k: int = 5
+    source: str | None = None
+
 @app.get("/health")
 def health():
     return {"ok": True, "ts": time.time()}
@@ -36,7 +42,7 @@ def health():
 @app.get("/telemetry")
 def get_telemetry():
     try:
-        return json.loads(TELEMETRY.read_text())
+        return STATE_TELEMETRY.read()
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
@@ -73,7 +79,7 @@ def reflect(req: AskRequest):
     Integrates field physics & recent audit data for meta reflection.
     """
     try:
-        physics = json.loads(TELEMETRY.read_text())
+        physics = STATE_TELEMETRY.read()
         return {"ok": True, "physics": physics}
     except Exception as e:
         return {"ok": False, "error": str(e)}
@@ -81,16 +87,26 @@ def reflect(req: AskRequest):
 @app.post("/update_field_strength")
 def update_field_strength(data: dict):
     """
-    API hook for physics loops to push updates into telemetry.json.
+    API hook for physics loops to push updates into the telemetry store.
     """
     try:
-        tele = json.loads(TELEMETRY.read_text()) if TELEMETRY.exists() else {}
-        tele.update({"field_strength": data.get("field_strength", 0.0), "ts": time.time()})
-        TELEMETRY.write_text(json.dumps(tele))
+        STATE_TELEMETRY.update({"field_strength": data.get("field_strength", 0.0), "ts": time.time()})
         return {"ok": True}
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
+@app.post("/memory/search")
+def memory_search(req: MemorySearchRequest):
+    """
+    Continuity/topology entries most similar to a text or a vector.
+    """
+    try:
+        from skg.vector_index import search
+        q = req.vec if req.vec is not None else (req.text or "")
+        return {"ok": True, "hits": search(q, req.k, req.source)}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
 @app.middleware("http")
 async def timing_middleware(request: Request, call_next):
     start = time.time()
@@ -106,7 +122,7 @@ class AskRequest(BaseModel):
 @app.post("/ask")
 def ask(req: AskRequest):
     # call the file /home/skg/dev/skills/skill_cognition.py
-    import importlib.util, json, time
+    import importlib.util
     path = SKILLS / "skill_cognition.py"
     if not path.exists():
         return {"ok": False, "error": f"missing: {path}"}
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — JSONL Field Projection
+Pulls a few top-level keys out of a JSON-object line without decoding the
+rest of it.  Each key is located as `"key":` following `{` or `,` (inside a
+JSON string every quote is escaped, so that never matches string content);
+when nothing before it opens an object or array, the key is at top level
+and only its scalar value is decoded.  Anything else (a key that appears
+twice or after a nested value, non-scalar values, lines that do not look
+like an object, lines too short for the scan to pay off) falls back to
+json.loads of the whole line, so results always equal
+{k: json.loads(line)[k]} for the keys present.  Lines are assumed
+well-formed once they look like `{...}`.
+"""
+
+import re, json, gzip
+from json.decoder import scanstring
+
+_VALUE = rb'\s*:\s*("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null)\s*[,}]'
+FAST_BYTES = 1024      # per field beyond the first, line length from which scanning beats json.loads
+_FULL = object()
+_OPEN = b"{,"
+
+_LITERALS = {b"true": True, b"false": False, b"null": None}
+
+def _value(tok: bytes):
+    if tok[0] == 0x22:
+        return tok[1:-1].decode() if b"\\" not in tok else scanstring(tok.decode(), 1)[0]
+    if tok in _LITERALS:
+        return _LITERALS[tok]
+    return float(tok) if b"." in tok or b"e" in tok or b"E" in tok else int(tok)
+
+class Projector:
+    """Callable mapping one line (bytes) to {field: value} for the fields it has, or None."""
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._quoted = {json.dumps(f).encode(): f for f in self.fields}
+        self._rx = re.compile(rb"(" + b"|".join(map(re.escape, self._quoted)) + rb")" + _VALUE)
+        self._min_bytes = FAST_BYTES * (len(self.fields) - 1)
+
+    def _fast(self, s):
+        out = {}
+        for m in self._rx.finditer(s):
+            i = m.start()
+            f = self._quoted[m.group(1)]
+            if (f in out or s[i - 1] not in _OPEN and not (s[i - 1] == 0x20 and s[i - 2] == 0x2c)
+                    or s.find(b"{", 1, i) >= 0 or s.find(b"[", 1, i) >= 0):
+                return _FULL
+            out[f] = _value(m.group(2))
+        if len(out) < len(self.fields):
+            # a key without a scalar value after it (nested, or not at top level)
+            for q, f in self._quoted.items():
+                if f not in out and q in s:
+                    return _FULL
+        return out
+
+    def __call__(self, line: bytes):
+        return self.split(line)[0]
+
+    def split(self, line: bytes):
+        """(projection or None, the full record if it had to be decoded anyway, else None)."""
+        s = line.strip()
+        # the scan costs a few Python ops per field while json.loads is C per byte,
+        # so it only pays off on lines long enough for the fields asked for
+        if s[:1] == b"{" and s[-1:] == b"}" and len(s) >= self._min_bytes:
+            try:
+                out = self._fast(s)
+            except ValueError:
+                out = _FULL
+            if out is not _FULL:
+                return out, None
+        try:
+            o = json.loads(s)
+        except ValueError:
+            return None, None
+        if not isinstance(o, dict):
+            return None, None
+        return {f: o[f] for f in self.fields if f in o}, o
+
+def project(line: bytes, fields):
+    return Projector(fields)(line)
+
+def iter_fields(path, fields, offset: int = 0):
+    """Yield (byte offset, {field: value}) for each JSON-object line of path from
+    offset on.  .gz files are read as one stream (offsets are uncompressed);
+    for plain files a trailing line without its newline is left for later."""
+    proj = Projector(fields)
+    path = str(path)
+    gz = path.endswith(".gz")
+    with (gzip.open(path, "rb") if gz else open(path, "rb")) as f:
+        f.seek(offset)
+        for line in f:
+            if not gz and not line.endswith(b"\n"):
+                break
+            rec = proj(line) if line.strip() else None
+            if rec is not None:
+                yield offset, rec
+            offset += len(line)
@@ -1,6 +1,13 @@
 import os, json, time
-VAULT="/var/lib/skg/memory/learn_vault.jsonl"
+from skg.paths import SKG_MEMORY_DIR
+from skg.fulltext import FULLTEXT
+VAULT=str(SKG_MEMORY_DIR/"learn_vault.jsonl")
 def append(e): os.makedirs(os.path.dirname(VAULT),exist_ok=True); e=dict(e); e.setdefault("ts",time.time()); open(VAULT,"a").write(json.dumps(e)+"\n")
 def search(term): 
     if not os.path.exists(VAULT): return []
+    hits=FULLTEXT.matches(term,("vault",))
+    if hits is not None: return hits["vault"]
     return [json.loads(l) for l in open(VAULT) if term.lower() in l.lower()]
+def query(q,mode="and",k=10):
+    """BM25-ranked vault entries for q's words (mode "and" or "or")."""
+    return [r for _,_,r in FULLTEXT.search(q,mode,k,("vault",))]
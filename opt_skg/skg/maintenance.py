@@ -8,11 +8,10 @@ Performs log pruning, pearl rotation, and sanity checks to prevent runaway stora
 import os, json, time
 from pathlib import Path
 from skg.paths import SKG_LOG_DIR, SKG_MEMORY_DIR, SKG_STATE_DIR
-from skg.state import JOURNAL_PATH, PEARLS_PATH
+from skg.seglog import PEARL_LOG
 
 MAX_LOG_SIZE_MB = 10          # rotate when log >10 MB
-MAX_JOURNAL_ENTRIES = 1000    # keep last N entries
-MAX_PEARLS = 2000             # keep last N pearls
+MAX_PEARLS = 2000             # keep at least the last N pearls
 
 def rotate_log():
     log_path = Path(SKG_LOG_DIR) / "skg.log"
@@ -38,21 +37,16 @@ def prune_json_file(path: Path, limit: int):
     return None
 
 def prune_pearl_file(limit=MAX_PEARLS):
-    if not PEARLS_PATH.exists():
-        return None
-    with PEARLS_PATH.open("r", encoding="utf-8") as f:
-        lines = f.readlines()
-    if len(lines) > limit:
-        lines = lines[-limit:]
-        PEARLS_PATH.write_text("".join(lines))
-        return f"Pruned pearls to {limit} lines"
+    # whole sealed segments are dropped; the active segment is never rewritten
+    dropped = PEARL_LOG.retain(limit)
+    if dropped:
+        return f"Dropped {dropped} pearl segments (kept >= {limit} pearls)"
     return None
 
 def run_maintenance():
     actions = []
-    for fn in (rotate_log, 
-               lambda: prune_json_file(JOURNAL_PATH, MAX_JOURNAL_ENTRIES),
-               prune_pearl_file):
+    # the journal is a fixed-capacity ring and never needs pruning
+    for fn in (rotate_log, prune_pearl_file):
         res = fn()
         if res:
             actions.append(res)
@@ -2,46 +2,241 @@
 """
 Information Manifest: what SKG is (by information), not who.
 Collects high-level counts + recent themes (terms) from pearls/audit/vault.
+
+Term frequencies are kept per source over its newest WINDOW records and
+updated from the last read offset, evicting the oldest records as new ones
+arrive, so a build only tokenises what was appended since the previous one.
+Themes rank exactly as a Counter over pearls+audit+vault would: by count,
+ties in order of first appearance.
+
+The windows persist under manifest.terms/ (shared by every process):
+  head.json   source cursors, counts, themes and the generation of rows.json
+  rows.json   per source: cursor, sequence and per-record term counts
+A build whose sources have not moved answers from head.json alone.
 """
-import os, json, re, collections
+import os, json, re, heapq, fcntl, threading, collections
 from pathlib import Path
+from skg.paths import SKG_MEMORY_DIR
+from skg.seglog import PEARL_LOG
+from skg.tail import tail_jsonl_cursor, MAX_FORWARD
 
-PEARLS="/var/lib/skg/memory/pearls.jsonl"
 AUDIT ="/var/lib/skg/memory/governance.audit.jsonl"
 VAULT ="/var/lib/skg/memory/learn_vault.jsonl"
-
-def _read_jsonl(path, max_lines=800):
-    if not os.path.exists(path): return []
-    out=[]; 
-    with open(path) as f:
-        for i, line in enumerate(f):
-            if not line.strip(): continue
-            out.append(json.loads(line))
-    return out[-max_lines:]
+STATE_DIR = Path(SKG_MEMORY_DIR) / "manifest.terms"
+WINDOW = 800
+MAX_TERMS = 48
 
 _TOKEN=re.compile(r"[A-Za-z0-9_.:-]{3,}")
 _STOP=set(("the","and","for","with","that","this","from","into","about","skill","actor","type","json","http"))
 
-def _terms(objs, max_terms=32):
-    cnt=collections.Counter()
-    for o in objs:
-        txt=json.dumps(o, sort_keys=True)
-        for t in _TOKEN.findall(txt.lower()):
-            if t in _STOP: continue
-            cnt[t]+=1
-    return [w for w,_ in cnt.most_common(max_terms)]
+def _record_terms(o) -> dict:
+    """term -> (count, rank of first appearance) for one record."""
+    terms = {}
+    for t in _TOKEN.findall(json.dumps(o, sort_keys=True).lower()):
+        if t in _STOP: continue
+        c = terms.get(t)
+        terms[t] = (c[0] + 1, c[1]) if c else (1, len(terms))
+    return terms
+
+class _Window:
+    """Term counts of one source's newest WINDOW records, added into a shared total."""
+    def __init__(self, total):
+        self.total = total
+        self.rows = collections.deque()   # (seq, terms)
+        self.first = {}                   # term -> seqs of window rows containing it
+        self.seq = 0
+        self.cursor = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def reset(self, cursor):
+        while self.rows:
+            self._evict()
+        self.cursor = cursor
+
+    def push(self, o):
+        terms = _record_terms(o)
+        self.rows.append((self.seq, terms))
+        for t, (n, _) in terms.items():
+            self.total[t] += n
+            self.first.setdefault(t, collections.deque()).append(self.seq)
+        self.seq += 1
+        if len(self.rows) > WINDOW:
+            self._evict()
+
+    def _evict(self):
+        _, terms = self.rows.popleft()
+        for t, (n, _) in terms.items():
+            self.total[t] -= n
+            if not self.total[t]:
+                del self.total[t]
+            seqs = self.first[t]
+            seqs.popleft()
+            if not seqs:
+                del self.first[t]
+
+    def dump(self) -> dict:
+        return {"cursor": self.cursor, "seq": self.seq, "rows": list(self.rows)}
+
+    def restore(self, d):
+        self.reset(None)
+        for seq, terms in d["rows"]:
+            self.rows.append((seq, terms))
+            for t, (n, _) in terms.items():
+                self.total[t] += n
+                self.first.setdefault(t, collections.deque()).append(seq)
+        self.seq = d["seq"]
+        c = d["cursor"]
+        self.cursor = tuple(c) if isinstance(c, list) else c
+
+    def first_seen(self, t):
+        """(row position in window, rank in row) of t's first appearance, or None."""
+        seqs = self.first.get(t)
+        if not seqs:
+            return None
+        i = seqs[0] - self.rows[0][0]
+        return i, self.rows[i][1][t][1]
+
+class _FileWindow(_Window):
+    def __init__(self, total, path):
+        super().__init__(total)
+        self.path = path
+
+    def current(self, cursor) -> bool:
+        cursor = tuple(cursor) if cursor is not None else None
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return cursor == (0, 0)
+        return cursor == (st.st_ino, st.st_size)
+
+    def refresh(self) -> bool:
+        if self.current(self.cursor):
+            return False
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self.reset((0, 0))
+            return True
+        if (not self.cursor or self.cursor[0] != st.st_ino or st.st_size < self.cursor[1]
+                or st.st_size - self.cursor[1] > MAX_FORWARD):
+            # first build, rotated/truncated, or too far behind: recount the tail
+            recs, cursor = tail_jsonl_cursor(self.path, WINDOW)
+            self.reset(cursor)
+            for o in recs:
+                self.push(o)
+            return True
+        ino, end = self.cursor
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(end)
+                buf = f.read(st.st_size - end)
+        except OSError:
+            return False
+        cut = buf.rfind(b"\n") + 1
+        for ln in buf[:cut].splitlines():
+            if not ln.strip(): continue
+            try:
+                o = json.loads(ln)
+            except Exception:
+                continue
+            if isinstance(o, dict):
+                self.push(o)
+        self.cursor = (ino, end + cut)
+        return cut > 0
+
+class _LogWindow(_Window):
+    def __init__(self, total, log):
+        super().__init__(total)
+        self.log = log
+        self.next = 0
+
+    def dump(self) -> dict:
+        return dict(super().dump(), next=self.next)
+
+    def restore(self, d):
+        super().restore(d)
+        self.next = d["next"]
+
+    def current(self, cursor) -> bool:
+        return cursor == self.log.end_offset()
+
+    def refresh(self) -> bool:
+        end = self.log.end_offset()
+        if end == self.cursor:
+            return False
+        if self.cursor is None or end < self.cursor or end - self.cursor > MAX_FORWARD:
+            rows = self.log.tail(WINDOW, offsets=True)
+            self.reset(end)
+            for _, o in rows:
+                self.push(o)
+            self.next = rows[-1][0] + 1 if rows else 0
+            return True
+        for off, o in self.log.read_from(self.next):
+            self.push(o)
+            self.next = off + 1
+        self.cursor = end
+        return True
+
+_MU = threading.Lock()
+_TOTAL = collections.Counter()
+_SOURCES = {"pearls": _LogWindow(_TOTAL, PEARL_LOG),
+            "audit": _FileWindow(_TOTAL, AUDIT),
+            "vault": _FileWindow(_TOTAL, VAULT)}
+_HEAD = {"gen": None, "counts": {name: 0 for name in _SOURCES}, "themes": []}
+
+def _themes(max_terms):
+    windows = list(_SOURCES.values())
+    def order(t):
+        for k, w in enumerate(windows):
+            seen = w.first_seen(t)
+            if seen is not None:
+                return (-_TOTAL[t], k) + seen
+    return heapq.nsmallest(max_terms, _TOTAL, key=order)
+
+def _read(name):
+    try:
+        return json.loads((STATE_DIR / name).read_text())
+    except Exception:
+        return None
+
+def _write(name, obj):
+    tmp = STATE_DIR / (name + ".tmp")
+    tmp.write_text(json.dumps(obj))
+    tmp.replace(STATE_DIR / name)
+
+def _sync():
+    """Bring _SOURCES and _HEAD up to date with the logs (caller holds both locks)."""
+    global _HEAD
+    head = _read("head.json")
+    if head is not None and head["gen"] != _HEAD["gen"]:
+        if all(w.current(head["cursors"][name]) for name, w in _SOURCES.items()):
+            _HEAD = head      # nothing appended since another process saved it
+            return
+        rows = _read("rows.json")
+        if rows is not None and rows.get("gen") == head["gen"]:
+            for name, w in _SOURCES.items():
+                w.restore(rows["sources"][name])
+            _HEAD = head
+    if not any([w.refresh() for w in _SOURCES.values()]) and _HEAD["gen"] is not None:
+        return
+    gen = os.urandom(8).hex()
+    _write("rows.json", {"gen": gen, "sources": {name: w.dump() for name, w in _SOURCES.items()}})
+    _HEAD = {"gen": gen,
+             "cursors": {name: w.cursor for name, w in _SOURCES.items()},
+             "counts": {name: len(w) for name, w in _SOURCES.items()},
+             "themes": _themes(MAX_TERMS)}
+    _write("head.json", _HEAD)
 
 def build_manifest():
-    pearls=_read_jsonl(PEARLS)
-    audit=_read_jsonl(AUDIT)
-    vault=_read_jsonl(VAULT)
-    themes=_terms(pearls+audit+vault, max_terms=48)
-    return {
-        "schema":"skg.manifest/v1",
-        "counts": {
-            "pearls": len(pearls),
-            "audit": len(audit),
-            "vault": len(vault)
-        },
-        "themes": themes[:48]   # top information tokens
-    }
+    with _MU:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(STATE_DIR / ".lock", "a") as lk:
+            fcntl.flock(lk, fcntl.LOCK_EX)
+            _sync()
+        return {
+            "schema":"skg.manifest/v1",
+            "counts": dict(_HEAD["counts"]),
+            "themes": list(_HEAD["themes"])   # top information tokens
+        }
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import json, time
 from pathlib import Path
+from skg.tail import tail_jsonl
 
 BASE = Path("/var/lib/skg/memory/chat")
 BASE.mkdir(parents=True, exist_ok=True)
@@ -12,7 +13,4 @@ def append(session:str, role:str, content):
         f.write(json.dumps(rec) + "\n")
 
 def load(session:str, limit:int=20):
-    p = BASE / f"{session}.jsonl"
-    if not p.exists(): return []
-    lines = p.read_text().splitlines()[-limit:]
-    return [json.loads(x) for x in lines if x.strip()]
+    return tail_jsonl(BASE / f"{session}.jsonl", limit)
@@ -18,21 +18,16 @@ def read_json(path, default=None):
 
 
 #!/usr/bin/env python3
-import os, json, time, hashlib
+import os, json, time
+from skg.telemetry_store import STATE_TELEMETRY
+from skg.hashcache import file_sha256
 
 STATE_DIR = "/var/lib/skg/state"
 MEM_DIR   = "/var/lib/skg/memory"
 SELF_JSON = f"{STATE_DIR}/self_state.json"
-TELEMETRY = f"{STATE_DIR}/telemetry.json"   # optional if you already emit this
-tel = read_json(TELEMETRY, {}) or {}
 
 def file_sha(path):
-    try:
-        h=hashlib.sha256()
-        with open(path,'rb') as f:
-            for chunk in iter(lambda:f.read(8192), b''): h.update(chunk)
-        return h.hexdigest()
-    except: return None
+    return file_sha256(path)
 
 def read_json(path, default=None):
     try:
@@ -44,11 +39,11 @@ def write_json(path, obj):
     with open(path,"w") as f: json.dump(obj,f,indent=2)
 
 def synthesize():
-    tel = read_json(TELEMETRY, {}) or {}
+    tel = STATE_TELEMETRY.read()
     pearls = 0
     try:
-        with open(f"{MEM_DIR}/pearls.jsonl") as f:
-            pearls = sum(1 for _ in f if _.strip())
+        from skg.seglog import PEARL_LOG
+        pearls = PEARL_LOG.count()
     except: pass
     audit_sz = os.path.getsize(f"{MEM_DIR}/governance.audit.jsonl") if os.path.exists(f"{MEM_DIR}/governance.audit.jsonl") else 0
     self_state = {
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Secondary Pearl/Audit Indexes
+Maps kind, type and actor values to record offsets for the pearl log
+(global PEARL_LOG offsets) and the governance audit (byte offsets), and keeps
+a bounded max-entropy heap per key.  sync() indexes only records appended
+since the last call, so lookups touch the matching records and nothing else.
+
+Layout under pearls.sidx/:
+  state.json       source cursors and ends, key -> (posting file id, entries)
+  heaps.json       key -> newest-first-on-ties max-entropy heap
+  <id>.post        ascending (offset, entropy) entries for one key
+"""
+
+import os, json, heapq, struct, fcntl
+from pathlib import Path
+from skg.paths import SKG_MEMORY_DIR
+from skg.seglog import PEARL_LOG
+from skg.audit_log import AUDIT_PATH, AUDIT_LOG
+
+INDEX_DIR = Path(SKG_MEMORY_DIR) / "pearls.sidx"
+FIELDS    = ("kind", "type", "actor")
+HEAP_SIZE = 256            # top() beyond this falls back to the posting file
+ALL       = "*"            # key holding every record of a source
+
+_POST = struct.Struct("<Qd")    # offset, entropy
+
+def _entropy(rec) -> float:
+    v = rec.get("entropy", 0)
+    return float(v) if isinstance(v, (int, float)) else 0.0
+
+def key(src, field=None, value=None) -> str:
+    return f"{src}/{ALL}" if field is None else f"{src}/{field}={value}"
+
+class PearlIndex:
+    def __init__(self, root=INDEX_DIR, log=PEARL_LOG, audit_path=AUDIT_PATH):
+        self.root = Path(root)
+        self.log = log
+        self.audit_path = Path(audit_path)
+        self._st = None
+        self._heaps = {}
+        self._stamp = None
+
+    # --- persistence --------------------------------------------------------
+    def _state_stamp(self):
+        try:
+            st = (self.root / "state.json").stat()
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load(self):
+        stamp = self._state_stamp()
+        if self._st is not None and stamp == self._stamp:
+            return
+        try:
+            self._st = json.loads((self.root / "state.json").read_text())
+            self._heaps = json.loads((self.root / "heaps.json").read_text())
+        except Exception:
+            self._st = {"pearls": 0, "audit": {"ino": 0, "end": 0}, "keys": {}, "next_id": 0}
+            self._heaps = {}
+        self._stamp = stamp
+
+    def _save(self):
+        for name, obj in (("heaps.json", self._heaps), ("state.json", self._st)):
+            tmp = self.root / (name + ".tmp")
+            tmp.write_text(json.dumps(obj))
+            tmp.replace(self.root / name)
+        self._stamp = self._state_stamp()
+
+    def _post_path(self, k):
+        return self.root / f"{self._st['keys'][k][0]}.post"
+
+    # --- indexing -----------------------------------------------------------
+    def _current(self) -> bool:
+        """True if neither source has grown since the loaded state."""
+        cur = self._st["audit"]
+        try:
+            st = os.stat(self.audit_path)
+            if (st.st_ino, st.st_size) != (cur["ino"], cur["end"]):
+                return False
+        except OSError:
+            pass
+        return self._st.get("end") == self.log.end_offset()
+
+    def sync(self) -> int:
+        """Index records appended since the last sync; returns records indexed."""
+        AUDIT_LOG.flush()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load()
+        if self._current():
+            return 0
+        with open(self.root / ".lock", "a") as lk:
+            fcntl.flock(lk, fcntl.LOCK_EX)
+            self._load()
+            try:
+                return self._sync_locked()
+            except BaseException:
+                self._st = None      # in-memory state may be ahead of the files
+                raise
+
+    def _sync_locked(self) -> int:
+        before = (self._st.get("end"), dict(self._st["audit"]))
+        self._st["end"] = self.log.end_offset()
+        pending = {}
+        n = 0
+        for off, rec in self.log.read_from(self._st["pearls"]):
+            self._add(pending, "pearls", off, rec)
+            self._st["pearls"] = off + 1
+            n += 1
+        n += self._sync_audit(pending)
+        if not n and before == (self._st["end"], self._st["audit"]):
+            return 0         # e.g. only a partial audit line: nothing to write
+        for k, entries in pending.items():
+            with open(self._post_path(k), "ab") as f:
+                # drop entries a crashed sync wrote past the committed count
+                f.truncate(self._st["keys"][k][1] * _POST.size)
+                f.write(b"".join(_POST.pack(o, e) for o, e in entries))
+            self._st["keys"][k][1] += len(entries)
+        self._save()
+        return n
+
+    def _sync_audit(self, pending) -> int:
+        cur = self._st["audit"]
+        try:
+            fd = os.open(self.audit_path, os.O_RDONLY)
+        except OSError:
+            return 0
+        try:
+            st = os.fstat(fd)
+            if st.st_ino != cur["ino"] or st.st_size < cur["end"]:
+                # rotated or truncated: the old audit offsets are meaningless
+                self._drop("audit")
+                cur.update(ino=st.st_ino, end=0)
+            buf = os.pread(fd, st.st_size - cur["end"], cur["end"])
+        finally:
+            os.close(fd)
+        n, off = 0, cur["end"]
+        for line in buf.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                rec = json.loads(line)
+            except Exception:
+                rec = None
+            if isinstance(rec, dict):
+                self._add(pending, "audit", off, rec)
+                n += 1
+            off += len(line)
+        cur["end"] = off
+        return n
+
+    def _drop(self, src):
+        for k in [k for k in self._st["keys"] if k.startswith(src + "/")]:
+            (self.root / f"{self._st['keys'].pop(k)[0]}.post").unlink(missing_ok=True)
+            self._heaps.pop(k, None)
+
+    def _add(self, pending, src, off, rec):
+        e = _entropy(rec)
+        keys = [key(src)]
+        for f in FIELDS:
+            v = rec.get(f)
+            if isinstance(v, (str, int, float)) and not isinstance(v, bool):
+                keys.append(key(src, f, v))
+        for k in keys:
+            if k not in self._st["keys"]:
+                self._st["keys"][k] = [self._st["next_id"], 0]
+                self._st["next_id"] += 1
+            pending.setdefault(k, []).append((off, e))
+            h = self._heaps.setdefault(k, [])
+            # min-heap on (entropy, -offset): lowest entropy, then newest, is evicted first
+            item = [e, -off]
+            if len(h) < HEAP_SIZE:
+                heapq.heappush(h, item)
+            elif item > h[0]:
+                heapq.heapreplace(h, item)
+
+    # --- lookups ------------------------------------------------------------
+    def postings(self, k, last=None) -> list:
+        """(offset, entropy) entries for key k in append order, optionally only the newest `last`."""
+        self.sync()
+        if k not in self._st["keys"]:
+            return []
+        fid, n = self._st["keys"][k]
+        skip = max(0, n - last) if last is not None else 0
+        with open(self.root / f"{fid}.post", "rb") as f:
+            f.seek(skip * _POST.size)
+            data = f.read((n - skip) * _POST.size)
+        return list(_POST.iter_unpack(data))
+
+    def top(self, k, n: int) -> list:
+        """(offset, entropy) of the n highest-entropy records for key k; ties oldest first."""
+        self.sync()
+        if n <= HEAP_SIZE:
+            best = sorted(self._heaps.get(k, []), key=lambda it: (-it[0], -it[1]))
+            return [(-o, e) for e, o in best[:n]]
+        return sorted(self.postings(k), key=lambda p: -p[1])[:n]
+
+    def fetch(self, src, offsets) -> list:
+        """Records at the given offsets of src, skipping ones no longer readable."""
+        if src == "pearls":
+            return [r for r in self.log.read_at(offsets) if r is not None]
+        out = []
+        try:
+            with open(self.audit_path, "rb") as f:
+                for off in offsets:
+                    f.seek(off)
+                    try:
+                        out.append(json.loads(f.readline()))
+                    except Exception:
+                        continue
+        except OSError:
+            pass
+        return out
+
+PEARL_INDEX = PearlIndex()
+
+if __name__ == "__main__":
+    print(json.dumps({"indexed": PEARL_INDEX.sync(), "keys": sorted(PEARL_INDEX._st["keys"])}, indent=2))
@@ -7,8 +7,9 @@ All records are appended into /var/lib/skg/memory/physics.audit.jsonl
 """
 import time, json
 from pathlib import Path
+from skg.tail import tail_jsonl
+from skg.telemetry_store import STATE_TELEMETRY
 
-TELEMETRY = Path("/var/lib/skg/state/telemetry.json")
 AUDIT = Path("/var/lib/skg/memory/physics.audit.jsonl")
 MOON_PHYS = Path("/var/lib/skg/memory/moon_physics.jsonl")
 AUDIT.parent.mkdir(parents=True, exist_ok=True)
@@ -16,7 +17,7 @@ MOON_PHYS.parent.mkdir(parents=True, exist_ok=True)
 
 def snapshot() -> dict:
     try:
-        d = json.loads(TELEMETRY.read_text())
+        d = STATE_TELEMETRY.read()
     except Exception:
         d = {}
     return {"ts": time.time(), "telemetry": d}
@@ -56,13 +57,8 @@ def record_moon_physics(moon:str, entropy:float, coherence:float, meta:dict=None
 def collect_moon_physics(window_s:int=600):
     now = time.time()
     res = []
-    try:
-        lines = MOON_PHYS.read_text().splitlines()
-    except Exception:
-        return res
-    for L in lines[-1000:]:
+    for j in tail_jsonl(MOON_PHYS, 1000):
         try:
-            j = json.loads(L)
             if now - j.get("ts",0) <= window_s:
                 res.append(j)
         except Exception:
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 import json, time
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 
-TEL = Path("/var/lib/skg/state/telemetry.json")
 AUD = Path("/var/lib/skg/memory/agent.audit.jsonl")
 
 def _read_json(p: Path, default=None):
@@ -10,7 +10,7 @@ def _read_json(p: Path, default=None):
     except: return default
 
 def telemetry():
-    return _read_json(TEL, {}) or {}
+    return STATE_TELEMETRY.read()
 
 def audit(entry: dict):
     AUD.parent.mkdir(parents=True, exist_ok=True)
@@ -1,15 +1,15 @@
-import os, json, time, math
+import time, math
 from skg.physics import gravity_score
 from skg.governance import append_event
+from skg.seglog import PEARL_LOG
 
-PEARLS="/var/lib/skg/memory/pearls.jsonl"
 PHASEF="/var/lib/skg/memory/phase.current"
 
 def _phase():
     try: return open(PHASEF).read().strip() or "Unified"
     except Exception: return "Unified"
 
-def _log(p): os.makedirs(os.path.dirname(PEARLS),exist_ok=True); open(PEARLS,"a").write(json.dumps(p)+"\n")
+def _log(p): PEARL_LOG.append(p)
 
 def anticipatory_prediction(tele, phase=None):
     phase = phase or _phase()
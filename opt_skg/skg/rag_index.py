@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Retrieval Index for rag_query
+Persistent BM25 index over the code and memory trees.  Files are read
+PART_BYTES at a time and each part is cut into line-aligned chunks of about
+CHUNK_BYTES; refresh() compares every file's mtime/size against the manifest
+and re-indexes only what changed (a file that merely grew, like a JSONL log,
+gets only its new tail indexed, folded together with a short last part).
+A part's postings are stored per term bucket, so a query decompresses only
+the buckets of its own terms.  Snippets are read back from chunk offsets.
+
+Layout under rag.idx/:
+  manifest.json        path -> (parts [id, start, end, chunks, tokens], mtime, size, tail crc); totals
+  parts/<id>.bin       one part: json header, zlib chunk table [(offset, length, tokens)],
+                       then per bucket zlib json term -> [(chunk, tf)]
+  terms/<xx>.json      term -> {part id: chunks containing it}, 256 buckets by crc32
+"""
+
+import os, re, json, math, zlib, fcntl, struct, shutil
+from pathlib import Path
+from skg.paths import SKG_MEMORY_DIR
+
+ROOTS       = [Path("/opt/skg"), Path("/var/lib/skg/memory")]
+INCLUDE_EXT = {".py",".md",".txt",".json",".jsonl",".yaml",".yml",".service"}
+INDEX_DIR   = Path(SKG_MEMORY_DIR) / "rag.idx"
+VERSION     = 2
+CHUNK_BYTES = 4096
+PART_BYTES  = 1024 * 1024  # source bytes per part: bounds indexing memory and per-bucket blobs
+TAIL_CHECK  = 4096        # bytes before the old end that must be unchanged to index only the growth
+SNIPPET     = 600
+BM25_K1     = 1.2
+BM25_B      = 0.75
+
+_WORD = re.compile(r"\w+")
+_HEAD = struct.Struct("<I")
+
+def tokens(text: str) -> list:
+    return [t.lower() for t in _WORD.findall(text)]
+
+def _bucket(term) -> str:
+    return "%02x" % (zlib.crc32(term.encode()) & 0xFF)
+
+def _crc_before(f, end) -> int:
+    f.seek(max(0, end - TAIL_CHECK))
+    return zlib.crc32(f.read(end - max(0, end - TAIL_CHECK)))
+
+class _Part:
+    """Read side of parts/<id>.bin; blobs are decoded on first use."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            (hlen,) = _HEAD.unpack(f.read(_HEAD.size))
+            self.head = json.loads(f.read(hlen))
+        self.path, self.base = path, _HEAD.size + hlen
+        self._chunks, self._buckets = None, {}
+
+    def _blob(self, span):
+        with open(self.path, "rb") as f:
+            f.seek(self.base + span[0])
+            return json.loads(zlib.decompress(f.read(span[1])))
+
+    def chunks(self) -> list:
+        if self._chunks is None:
+            self._chunks = self._blob(self.head["chunks"])
+        return self._chunks
+
+    def bucket(self, b) -> dict:
+        if b not in self._buckets:
+            span = self.head["buckets"].get(b)
+            self._buckets[b] = self._blob(span) if span else {}
+        return self._buckets[b]
+
+    def terms(self) -> dict:
+        out = {}
+        for b in self.head["buckets"]:
+            out.update(self.bucket(b))
+        return out
+
+    @staticmethod
+    def write(path, chunks, terms):
+        by_bucket = {}
+        for t, ps in terms.items():
+            by_bucket.setdefault(_bucket(t), {})[t] = ps
+        body, head = bytearray(), {"chunks": None, "buckets": {}}
+        def put(obj):
+            z = zlib.compress(json.dumps(obj, separators=(",", ":")).encode(), 1)
+            body.extend(z)
+            return [len(body) - len(z), len(z)]
+        head["chunks"] = put(chunks)
+        for b in sorted(by_bucket):
+            head["buckets"][b] = put(by_bucket[b])
+        h = json.dumps(head).encode()
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEAD.pack(len(h)) + h + bytes(body))
+        tmp.replace(path)
+
+class RagIndex:
+    def __init__(self, root=INDEX_DIR, roots=ROOTS, include_ext=INCLUDE_EXT):
+        self.root = Path(root)
+        self.roots = [Path(r) for r in roots]
+        self.include_ext = include_ext
+        self._man = None
+        self._parts = {}          # part id -> _Part (ids are never reused)
+
+    # --- persistence --------------------------------------------------------
+    def _load(self):
+        try:
+            self._man = json.loads((self.root / "manifest.json").read_text())
+        except Exception:
+            self._man = None
+        if not self._man or self._man.get("version") != VERSION:
+            # no index yet, or one in an older layout: start over
+            for d in ("post", "parts", "terms"):
+                shutil.rmtree(self.root / d, ignore_errors=True)
+            self._man = {"version": VERSION, "next_id": 0, "chunks": 0, "tokens": 0, "files": {}}
+        (self.root / "parts").mkdir(parents=True, exist_ok=True)
+        (self.root / "terms").mkdir(parents=True, exist_ok=True)
+
+    def _write(self, path, data: bytes):
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def _part(self, pid) -> _Part:
+        p = self._parts.get(pid)
+        if p is None:
+            p = self._parts[pid] = _Part(self.root / "parts" / f"{pid}.bin")
+        return p
+
+    def _terms(self, cache, b) -> dict:
+        if b not in cache:
+            try:
+                cache[b] = json.loads((self.root / "terms" / f"{b}.json").read_text())
+            except Exception:
+                cache[b] = {}
+        return cache[b]
+
+    # --- indexing -----------------------------------------------------------
+    def _files(self):
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                if Path(dirpath) == self.root.parent:
+                    dirnames[:] = [d for d in dirnames if Path(dirpath, d) != self.root]
+                for name in filenames:
+                    if os.path.splitext(name)[1].lower() in self.include_ext:
+                        yield os.path.join(dirpath, name)
+
+    @staticmethod
+    def _spans(f, start, end):
+        """Line-aligned (offset, bytes) pieces of [start, end), at most PART_BYTES each."""
+        pos = start
+        while pos < end:
+            f.seek(pos)
+            data = f.read(min(PART_BYTES, end - pos))
+            if not data:
+                return
+            if pos + len(data) < end:
+                cut = data.rfind(b"\n") + 1
+                if cut:
+                    data = data[:cut]
+            yield pos, data
+            pos += len(data)
+
+    @staticmethod
+    def _chunk(start, data):
+        """Chunk table and term -> [(chunk, tf)] postings of one part."""
+        chunks, terms, pos = [], {}, 0
+        while pos < len(data):
+            cut = data.rfind(b"\n", pos, pos + CHUNK_BYTES) + 1 if pos + CHUNK_BYTES < len(data) else len(data)
+            if cut <= pos:
+                cut = min(len(data), pos + CHUNK_BYTES)
+            toks = tokens(data[pos:cut].decode("utf-8", errors="ignore"))
+            ci = len(chunks)
+            chunks.append([start + pos, cut - pos, len(toks)])
+            tf = {}
+            for t in toks:
+                tf[t] = tf.get(t, 0) + 1
+            for t, n in tf.items():
+                terms.setdefault(t, []).append([ci, n])
+            pos = cut
+        return chunks, terms
+
+    def refresh(self) -> dict:
+        """Bring the index up to date with the file trees; returns counts of changes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "a") as lk:
+            fcntl.flock(lk, fcntl.LOCK_EX)
+            self._load()
+            files, buckets, dirty, garbage = self._man["files"], {}, set(), []
+            seen, stats = set(), {"indexed": 0, "appended": 0, "removed": 0}
+
+            def drop(entry, part):
+                pid, _, _, nchunks, ntok = part
+                for t in self._part(pid).terms():
+                    b = _bucket(t)
+                    self._terms(buckets, b).get(t, {}).pop(str(pid), None)
+                    dirty.add(b)
+                garbage.append(pid)
+                entry["parts"].remove(part)
+                self._man["chunks"] -= nchunks
+                self._man["tokens"] -= ntok
+
+            def retire(path):
+                entry = files.pop(path)
+                for part in list(entry["parts"]):
+                    drop(entry, part)
+
+            def add(entry, start, data):
+                chunks, terms = self._chunk(start, data)
+                pid = self._man["next_id"]
+                self._man["next_id"] += 1
+                _Part.write(self.root / "parts" / f"{pid}.bin", chunks, terms)
+                for t, ps in terms.items():
+                    b = _bucket(t)
+                    self._terms(buckets, b).setdefault(t, {})[str(pid)] = len(ps)
+                    dirty.add(b)
+                ntok = sum(c[2] for c in chunks)
+                entry["parts"].append([pid, start, start + len(data), len(chunks), ntok])
+                self._man["chunks"] += len(chunks)
+                self._man["tokens"] += ntok
+
+            for path in self._files():
+                seen.add(path)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                old = files.get(path)
+                if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+                    continue
+                try:
+                    with open(path, "rb") as f:
+                        grew = (old is not None and st.st_size > old["size"]
+                                and _crc_before(f, old["size"]) == old["crc"])
+                        if grew:
+                            entry, start = old, old["size"]
+                            last = entry["parts"][-1] if entry["parts"] else None
+                            if last and last[2] == start and last[2] - last[1] < PART_BYTES:
+                                # fold a short last part into the growth so parts stay near PART_BYTES
+                                start = last[1]
+                                drop(entry, last)
+                        else:
+                            if old is not None:
+                                retire(path)
+                            entry = files[path] = {"parts": []}
+                            start = 0
+                        for off, data in self._spans(f, start, st.st_size):
+                            add(entry, off, data)
+                        crc = _crc_before(f, st.st_size)
+                except OSError:
+                    if path in files:
+                        retire(path)      # half indexed: redo from scratch next time
+                    continue
+                entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size, crc=crc)
+                stats["appended" if grew else "indexed"] += 1
+            for path in [p for p in files if p not in seen]:
+                retire(path)
+                stats["removed"] += 1
+            for b in dirty:
+                terms = {t: ids for t, ids in buckets[b].items() if ids}
+                self._write(self.root / "terms" / f"{b}.json", json.dumps(terms).encode())
+            if dirty or garbage or stats["indexed"] or stats["appended"]:
+                self._write(self.root / "manifest.json", json.dumps(self._man).encode())
+            for pid in garbage:
+                (self.root / "parts" / f"{pid}.bin").unlink(missing_ok=True)
+                self._parts.pop(pid, None)
+        return stats
+
+    # --- search -------------------------------------------------------------
+    def search(self, query: str, k: int = 6) -> list:
+        """Best-matching files as {path, score, snippet}; score is the BM25 of the best chunk."""
+        self.refresh()
+        toks = tokens(query)
+        if not toks or not self._man["chunks"]:
+            return []
+        paths = {str(p[0]): path for path, m in self._man["files"].items() for p in m["parts"]}
+        n, avgdl = self._man["chunks"], self._man["tokens"] / self._man["chunks"]
+        buckets, scores = {}, {}
+        for t in toks:
+            b = _bucket(t)
+            ids = {pid: df for pid, df in self._terms(buckets, b).get(t, {}).items() if pid in paths}
+            if not ids:
+                continue
+            df = sum(ids.values())
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for pid in ids:
+                part = self._part(int(pid))
+                chunks = part.chunks()
+                for ci, tf in part.bucket(b).get(t, []):
+                    dl = chunks[ci][2]
+                    s = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl))
+                    scores[(pid, ci)] = scores.get((pid, ci), 0.0) + s
+        best = {}                 # path -> (score, part, chunk) of its best chunk
+        for (pid, ci), s in scores.items():
+            if s > best.get(paths[pid], (0.0,))[0]:
+                best[paths[pid]] = (s, pid, ci)
+        hits = []
+        for path, (score, pid, ci) in sorted(best.items(), key=lambda kv: -kv[1][0])[:k]:
+            off, ln, _ = self._part(int(pid)).chunks()[ci]
+            hits.append({"path": path, "score": round(score, 4), "snippet": self._snippet(path, off, ln, toks)})
+        return hits
+
+    def _snippet(self, path, off, ln, toks) -> str:
+        try:
+            with open(path, "rb") as f:
+                f.seek(off)
+                text = f.read(ln + SNIPPET).decode("utf-8", errors="ignore")
+        except OSError:
+            return ""
+        lower = text.lower()
+        found = [i for i in (lower.find(t) for t in toks) if 0 <= i < ln]
+        i = max(0, min(found) - 120) if found else 0
+        return text[i:i + SNIPPET].replace("\n", " ")[:SNIPPET]
+
+RAG_INDEX = RagIndex()
+
+if __name__ == "__main__":
+    print(json.dumps(RAG_INDEX.refresh()))
@@ -1,9 +1,33 @@
 import os, json, re
-PEARL="/var/lib/skg/memory/pearls.jsonl"
+from skg.seglog import PEARL_LOG
+from skg.pearl_index import PEARL_INDEX, key
+from skg.fulltext import FULLTEXT
 AUD="/var/lib/skg/memory/governance.audit.jsonl"
 def _read(p): return [json.loads(l) for l in open(p) if l.strip()] if os.path.exists(p) else []
-def recall(keyword=None,min_entropy=0.0,top=10):
-    items=_read(PEARL)+_read(AUD); out=[]
+def _indexed(keyword,min_entropy,top,filters):
+    # only records whose kind/type/actor match are read; ties keep scan order
+    field,value=next(iter(filters.items()),(None,None))
+    out=[]
+    for src in ("pearls","audit"):
+        k=key(src,field,value)
+        offs=None
+        if not keyword and len(filters)<=1:
+            offs=[o for o,e in PEARL_INDEX.top(k,top) if e>=min_entropy]
+            recs=PEARL_INDEX.fetch(src,offs)
+        if offs is None or len(recs)<len(offs):
+            recs=PEARL_INDEX.fetch(src,[o for o,e in PEARL_INDEX.postings(k) if e>=min_entropy])
+        out+=[r for r in recs if all(r.get(f)==v for f,v in filters.items())]
+    return out
+def _keyword(keyword):
+    # full-text candidates; a keyword without letters can't be looked up, so scan
+    hits=FULLTEXT.matches(keyword,("pearls","audit"))
+    if hits is None: return list(PEARL_LOG.scan())+_read(AUD)
+    return hits["pearls"]+hits["audit"]
+def recall(keyword=None,min_entropy=0.0,top=10,kind=None,type=None,actor=None):
+    filters={f:v for f,v in (("kind",kind),("type",type),("actor",actor)) if v is not None}
+    if filters or not keyword: items=_indexed(keyword,min_entropy,top,filters)
+    else: items=_keyword(keyword)
+    out=[]
     for r in items:
         if keyword and keyword.lower() not in json.dumps(r).lower(): continue
         if r.get("entropy",0)<min_entropy: continue
@@ -5,8 +5,8 @@ Balances entropy, ethics, and load to regulate SKG activity cadence.
 """
 import json, time, os, psutil
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 
-TEL = Path("/var/lib/skg/state/telemetry.json")
 LIFE = Path("/var/lib/skg/state/lifecycle.json")
 REM = Path("/var/lib/skg/state/rem.json")
 
@@ -19,7 +19,7 @@ def read(path):
     except: return {}
 
 def regulate():
-    tel = read(TEL)
+    tel = STATE_TELEMETRY.read()
     life = read(LIFE)
     phase = life.get("phase","reflection")
     ent = tel.get("entropy_avg_5m") or tel.get("entropy") or 0
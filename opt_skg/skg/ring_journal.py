@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Ring Journal
+Fixed-capacity on-disk journal: a small header (capacity, slot size, sequence)
+followed by fixed-size JSON slots.  Appending writes one slot and bumps the
+sequence (O(1)); last(n) reads only the n newest slots.  Replaces the
+read-modify-write journal.json list.
+"""
+
+import os, json, struct, fcntl
+from pathlib import Path
+
+MAGIC   = b"SKGRING1"
+_HEADER = struct.Struct("<8sIIQ")     # magic, capacity, slot_bytes, seq (records ever written)
+HEADER_BYTES = 64
+
+class RingJournal:
+    def __init__(self, path, capacity=1000, slot_bytes=1024, legacy=None):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.slot_bytes = slot_bytes
+        self.legacy = Path(legacy) if legacy else None
+
+    def _open(self, how):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, how)
+        if os.fstat(fd).st_size < HEADER_BYTES:
+            if how != fcntl.LOCK_EX:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size < HEADER_BYTES:
+                self._create(fd)
+        return fd
+
+    def _create(self, fd):
+        os.ftruncate(fd, HEADER_BYTES + self.capacity * self.slot_bytes)
+        os.pwrite(fd, _HEADER.pack(MAGIC, self.capacity, self.slot_bytes, 0), 0)
+        # carry the tail of an old journal.json list over once
+        if self.legacy and self.legacy.exists():
+            try:
+                old = json.loads(self.legacy.read_text())
+                for e in (old if isinstance(old, list) else [])[-self.capacity:]:
+                    self._write(fd, e)
+            except Exception:
+                pass
+
+    def _header(self, fd):
+        magic, cap, slot, seq = _HEADER.unpack(os.pread(fd, _HEADER.size, 0))
+        if magic != MAGIC:
+            raise ValueError(f"not a ring journal: {self.path}")
+        return cap, slot, seq
+
+    def _fit(self, entry: dict, slot: int) -> bytes:
+        raw = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        if len(raw) < slot:
+            return raw
+        e = dict(entry); e["truncated"] = True
+        msg = e["msg"] if isinstance(e.get("msg"), str) else json.dumps(e.get("msg"), ensure_ascii=False)
+        while True:
+            msg = msg[:len(msg) * 3 // 4]
+            e["msg"] = msg
+            raw = json.dumps(e, ensure_ascii=False).encode("utf-8")
+            if len(raw) < slot or not msg:
+                break
+        return raw if len(raw) < slot else b"{}"
+
+    def _write(self, fd, entry):
+        cap, slot, seq = self._header(fd)
+        raw = self._fit(entry, slot)
+        os.pwrite(fd, raw.ljust(slot - 1) + b"\n", HEADER_BYTES + (seq % cap) * slot)
+        os.pwrite(fd, _HEADER.pack(MAGIC, cap, slot, seq + 1), 0)
+
+    def append(self, entry: dict):
+        fd = self._open(fcntl.LOCK_EX)
+        try:
+            self._write(fd, entry)
+        finally:
+            os.close(fd)
+
+    def last(self, n: int) -> list:
+        """Newest n entries, oldest first."""
+        fd = self._open(fcntl.LOCK_SH)
+        try:
+            cap, slot, seq = self._header(fd)
+            out = []
+            for i in range(max(0, seq - min(n, cap)), seq):
+                raw = os.pread(fd, slot, HEADER_BYTES + (i % cap) * slot)
+                try:
+                    out.append(json.loads(raw))
+                except Exception:
+                    continue
+            return out
+        finally:
+            os.close(fd)
+
+    def __len__(self):
+        fd = self._open(fcntl.LOCK_SH)
+        try:
+            cap, _, seq = self._header(fd)
+            return min(cap, seq)
+        finally:
+            os.close(fd)
+
+if __name__ == "__main__":
+    from skg.state import JOURNAL
+    print(json.dumps(JOURNAL.last(int(sys.argv[1]) if len(sys.argv) > 1 else 20), indent=2, ensure_ascii=False))
@@ -7,10 +7,10 @@ RNTD: Resonant Network Topology daemon
 """
 import json, socket, threading, time, hmac, hashlib, os
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 
 CONF = "/etc/skg/rnt.conf"
 KEYF = "/etc/skg/rnt.key"
-TEL  = Path("/var/lib/skg/state/telemetry.json")
 REMJ = Path("/var/lib/skg/state/rem.json")
 PEERS_STATE = Path("/var/lib/skg/state/rnt_peers.json")
 CONSENSUS   = Path("/var/lib/skg/state/rnt_consensus.json")
@@ -41,7 +41,7 @@ class RNT:
         self._stop = False
 
     def pulse(self):
-        tel = load_json(TEL, {})
+        tel = STATE_TELEMETRY.read()
         rem = load_json(REMJ, {})
         msg = {
             "ts": now(),
@@ -78,7 +78,7 @@ class RNT:
 
     def _update_consensus(self):
         # toy consensus: median entropy and mean ethics across latest pulses (self + peers)
-        latest = [load_json(TEL, {})]
+        latest = [STATE_TELEMETRY.read()]
         latest.extend([v[-1] for v in self.peers.values() if v])
         ent = [x.get("entropy") for x in latest if x.get("entropy") is not None]
         eth = [x.get("ethics") for x in latest if x.get("ethics") is not None]
@@ -2,12 +2,14 @@
 import sys; sys.path.append('/opt/skg')
 """
 SKG Portable — Safe Gzip Rotation
-Rotates large append-only JSONL or log files into timestamped .gz archives.
+Rotates large append-only JSONL or log files into timestamped .gz archives,
+written block-compressed with a per-block ts index (skg.archive_blocks).
 Never deletes; always append-only.
 """
 
-import gzip, shutil, time
+import time
 from pathlib import Path
+from skg.archive_blocks import write_archive
 
 def rotate_file(path: Path, max_mb: int = 20):
     if not path.exists():
@@ -17,8 +19,8 @@ def rotate_file(path: Path, max_mb: int = 20):
         return None
     ts = time.strftime("%Y%m%d-%H%M%S")
     dest = path.with_suffix(path.suffix + f".{ts}.gz")
-    with open(path, "rb") as src, gzip.open(dest, "wb", compresslevel=9) as dst:
-        shutil.copyfileobj(src, dst)
+    with open(path, "rb") as src:
+        write_archive(dest, src, level=9)
     # truncate active file for continued appending
     open(path, "w").close()
     return f"Rotated {path.name} → {dest.name} ({size_mb:.1f} MB)"
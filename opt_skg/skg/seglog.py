@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Segmented Append Log
+Fixed-size JSONL segments, each with a sidecar (offset, ts) index, behind a
+single group-commit writer.
+
+Layout for a log named pearls.jsonl:
+  pearls.jsonl, pearls.jsonl.idx      active segment (plain readers keep working)
+  pearls.d/<base>.jsonl, <base>.idx   sealed segments, named by global base offset
+  pearls.d/head.json                  global base offset of the active segment
+Global offsets (segment base + local offset) never move, so consumers can
+persist them and resume with read_from().
+"""
+
+import os, json, time, mmap, struct, bisect, fcntl, atexit, threading
+from pathlib import Path
+from skg.paths import SKG_MEMORY_DIR
+from skg.jsonfields import Projector
+
+SEGMENT_BYTES = int(os.getenv("SKG_SEGMENT_MB", "8")) * 1024 * 1024
+BATCH_RECORDS = 64        # flush once this many records are buffered
+BATCH_SECONDS = 0.5       # ...or once the oldest buffered record is this old
+READ_CHUNK    = 1024      # records decoded per pread while streaming
+
+_ENTRY = struct.Struct("<Qd")   # local offset, ts (running max, so bisectable)
+
+def _ts_of(rec) -> float:
+    try:
+        return float(rec.get("ts") or rec.get("timestamp") or time.time())
+    except Exception:
+        return time.time()
+
+class _Segment:
+    """Open handles on one segment; idx entries beyond `n` are ignored.
+    Sealed segments never change, so they are opened once and `shared`:
+    close() leaves them open for the next reader."""
+    def __init__(self, base, data_path, idx_path, shared=False):
+        self.base = base
+        self.shared = shared
+        self.fd = os.open(data_path, os.O_RDONLY)
+        self.size = os.fstat(self.fd).st_size
+        self.map = None
+        try:
+            with open(idx_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size >= _ENTRY.size:
+                    self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            pass
+        self.n = len(self.map) // _ENTRY.size if self.map else 0
+        self.end = self._end()
+
+    def __len__(self): return self.n
+
+    def entry(self, i): return _ENTRY.unpack_from(self.map, i * _ENTRY.size)
+    def offset(self, i): return self.entry(i)[0] if i < self.n else self.end
+    def ts(self, i): return self.entry(i)[1]
+
+    def _end(self):
+        if not self.n:
+            return 0
+        off = self.entry(self.n - 1)[0]
+        tail = os.pread(self.fd, max(0, self.size - off), off)
+        nl = tail.find(b"\n")
+        return off + (nl + 1 if nl >= 0 else len(tail))
+
+    def rows(self, i, j, parse=json.loads):
+        """Yield (global_offset, record) for entries i..j-1."""
+        while i < j:
+            k = min(j, i + READ_CHUNK)
+            start = self.offset(i)
+            data = os.pread(self.fd, self.offset(k) - start, start)
+            for m in range(i, k):
+                a = self.offset(m) - start
+                b = self.offset(m + 1) - start
+                try:
+                    rec = parse(data[a:b])
+                except Exception:
+                    continue
+                if rec is not None:     # a Projector's answer for a malformed line
+                    yield self.base + a + start, rec
+            i = k
+
+    def close(self):
+        if not self.shared:
+            self._release()
+
+    def _release(self):
+        if self.fd < 0:
+            return
+        if self.map: self.map.close()
+        os.close(self.fd)
+        self.fd = -1
+
+    def __del__(self):
+        if hasattr(self, "map"):
+            self._release()
+
+class _TsView:
+    def __init__(self, seg): self.seg = seg
+    def __len__(self): return len(self.seg)
+    def __getitem__(self, i): return self.seg.ts(i)
+
+class _OffView(_TsView):
+    def __getitem__(self, i): return self.seg.offset(i)
+
+class SegmentedLog:
+    def __init__(self, path, segment_bytes=SEGMENT_BYTES,
+                 batch_records=BATCH_RECORDS, batch_seconds=BATCH_SECONDS):
+        self.path = Path(path)
+        self.idx_path = Path(str(self.path) + ".idx")
+        self.dir = self.path.with_suffix(".d")
+        self.segment_bytes = segment_bytes
+        self.batch_records = batch_records
+        self.batch_seconds = batch_seconds
+        self._buf = []
+        self._mu = threading.Lock()
+        self._timer = None
+        self._segs = {}           # sealed data path -> shared _Segment
+        self._segs_mu = threading.Lock()
+        atexit.register(self.flush)
+
+    # --- writer -------------------------------------------------------------
+    def append(self, rec: dict):
+        self.append_many([rec])
+
+    def append_many(self, recs):
+        lines = [((json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8"), _ts_of(r)) for r in recs]
+        with self._mu:
+            self._buf.extend(lines)
+            if len(self._buf) >= self.batch_records:
+                self._flush_locked()
+            elif self._timer is None and self._buf:
+                self._timer = threading.Timer(self.batch_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._mu:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buf:
+            return
+        batch, self._buf = self._buf, []
+        with self._locked(fcntl.LOCK_EX):
+            self._commit(batch)
+
+    def _commit(self, batch):
+        base, size, last_ts = self._reconcile()
+        if size and size + sum(len(b) for b, _ in batch) > self.segment_bytes:
+            self._seal(base, size)
+            base, size, last_ts = base + size, 0, 0.0
+        data, entries, off = bytearray(), bytearray(), size
+        for line, ts in batch:
+            last_ts = max(last_ts, ts)
+            entries += _ENTRY.pack(off, last_ts)
+            data += line
+            off += len(line)
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self.idx_path, "ab") as f:
+            f.write(entries)
+
+    # --- segment bookkeeping (caller holds the exclusive lock) --------------
+    def _locked(self, how):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        lk = open(self.dir / ".lock", "a")
+        fcntl.flock(lk, how)
+        return lk
+
+    def _sealed(self):
+        out = []
+        for p in self.dir.glob("*.jsonl"):
+            try:
+                out.append((int(p.stem), p, p.with_suffix(".idx")))
+            except ValueError:
+                continue
+        return sorted(out)
+
+    def _base(self):
+        base = 0
+        try:
+            base = int(json.loads((self.dir / "head.json").read_text()).get("base", 0))
+        except Exception:
+            pass
+        sealed = self._sealed()
+        if sealed:
+            b, p, _ = sealed[-1]
+            base = max(base, b + p.stat().st_size)
+        return base
+
+    def _write_base(self, base):
+        tmp = self.dir / "head.json.tmp"
+        tmp.write_text(json.dumps({"base": base}))
+        tmp.replace(self.dir / "head.json")
+
+    def _reconcile(self):
+        """Bring the active idx in line with its data file; returns (base, size, last_ts)."""
+        base = self._base()
+        if not self.path.exists():
+            self.path.touch()
+        if not self.idx_path.exists():
+            self.idx_path.touch()
+        seg = _Segment(base, self.path, self.idx_path)
+        try:
+            size, end, n = seg.size, seg.end, seg.n
+            last_ts = seg.ts(n - 1) if n else 0.0
+            tail = os.pread(seg.fd, size - end, end) if size > end else b""
+        finally:
+            seg.close()
+        if size < end:
+            # rewritten or truncated behind our back: the old bytes are gone
+            base += end
+            self._write_base(base)
+            open(self.idx_path, "wb").close()
+            end, last_ts = 0, 0.0
+            tail = self.path.read_bytes()
+        entries = bytearray()
+        for line in tail.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                last_ts = max(last_ts, _ts_of(json.loads(line)))
+            except Exception:
+                pass
+            entries += _ENTRY.pack(end, last_ts)
+            end += len(line)
+        if entries:
+            with open(self.idx_path, "ab") as f:
+                f.write(entries)
+        if end < size:
+            # a foreign writer left a partial line; start ours on a fresh one
+            with open(self.path, "ab") as f:
+                f.write(b"\n")
+            size += 1
+            entries = _ENTRY.pack(end, last_ts)
+            with open(self.idx_path, "ab") as f:
+                f.write(entries)
+        return base, size, last_ts
+
+    def _seal(self, base, size):
+        self.path.replace(self.dir / f"{base:020d}.jsonl")
+        self.idx_path.replace(self.dir / f"{base:020d}.idx")
+        self._write_base(base + size)
+
+    def _snapshot(self):
+        # readers share the lock; only when the active idx lags its data (a
+        # legacy file, or lines from a foreign writer) is it reconciled, which
+        # needs the exclusive lock
+        self.flush()
+        for how in (fcntl.LOCK_SH, fcntl.LOCK_EX):
+            with self._locked(how):
+                if how == fcntl.LOCK_EX:
+                    self._reconcile()
+                with self._segs_mu:
+                    self._segs = {p: self._segs.get(p) or _Segment(b, p, i, shared=True)
+                                  for b, p, i in self._sealed()}
+                    segs = list(self._segs.values())
+                if not self.path.exists():
+                    return segs
+                active = _Segment(self._base(), self.path, self.idx_path)
+                if active.size > active.end and how == fcntl.LOCK_SH:
+                    active.close()
+                    continue
+                return segs + [active]
+
+    # --- readers ------------------------------------------------------------
+    def tail(self, n: int, offsets: bool = False, fields=None) -> list:
+        """Last n records, oldest first; (global_offset, record) pairs if offsets.
+        With fields, each record holds only those top-level keys."""
+        parse = Projector(fields) if fields is not None else json.loads
+        out, segs = [], self._snapshot()
+        try:
+            for seg in reversed(segs):
+                need = n - len(out)
+                if need <= 0:
+                    break
+                out[:0] = list(seg.rows(max(0, len(seg) - need), len(seg), parse))
+        finally:
+            for s in segs: s.close()
+        return out if offsets else [r for _, r in out]
+
+    def since(self, ts: float):
+        """Yield records appended at or after ts."""
+        segs = self._snapshot()
+        try:
+            live = [s for s in segs if len(s)]
+            first = bisect.bisect_left([s.ts(len(s) - 1) for s in live], ts)
+            for k, seg in enumerate(live[first:]):
+                i = bisect.bisect_left(_TsView(seg), ts) if k == 0 else 0
+                for _, r in seg.rows(i, len(seg)):
+                    yield r
+        finally:
+            for s in segs: s.close()
+
+    def read_from(self, offset: int = 0):
+        """Yield (global_offset, record) for every record at or after offset.
+        To resume after a record, persist its offset + 1."""
+        segs = self._snapshot()
+        try:
+            for seg in segs:
+                if seg.base + seg.end <= offset:
+                    continue
+                i = bisect.bisect_left(_OffView(seg), offset - seg.base) if offset > seg.base else 0
+                yield from seg.rows(i, len(seg))
+        finally:
+            for s in segs: s.close()
+
+    def read_at(self, offsets) -> list:
+        """Records at the given global offsets; None where retention dropped them."""
+        segs = self._snapshot()
+        try:
+            bases = [s.base for s in segs]
+            out = []
+            for off in offsets:
+                rec, k = None, bisect.bisect_right(bases, off) - 1
+                if k >= 0:
+                    seg, local = segs[k], off - segs[k].base
+                    i = bisect.bisect_left(_OffView(seg), local)
+                    if i < len(seg) and seg.offset(i) == local:
+                        rec = next((r for _, r in seg.rows(i, i + 1)), None)
+                out.append(rec)
+            return out
+        finally:
+            for s in segs: s.close()
+
+    def scan(self):
+        for _, r in self.read_from(0):
+            yield r
+
+    def files(self) -> list:
+        """Data files holding the log, oldest first: sealed segments, then the active one."""
+        self.flush()
+        with self._locked(fcntl.LOCK_SH):
+            return [p for _, p, _ in self._sealed()] + ([self.path] if self.path.exists() else [])
+
+    def end_offset(self) -> int:
+        segs = self._snapshot()
+        try:
+            return segs[-1].base + segs[-1].end if segs else self._base()
+        finally:
+            for s in segs: s.close()
+
+    def count(self) -> int:
+        segs = self._snapshot()
+        try:
+            return sum(len(s) for s in segs)
+        finally:
+            for s in segs: s.close()
+
+    # --- retention ----------------------------------------------------------
+    def retain(self, min_records: int) -> int:
+        """Drop oldest sealed segments not needed to keep min_records; returns segments dropped."""
+        self.flush()
+        dropped = 0
+        with self._locked(fcntl.LOCK_EX):
+            self._reconcile()
+            with open(self.idx_path, "rb") as f:
+                kept = os.fstat(f.fileno()).st_size // _ENTRY.size
+            sealed = self._sealed()
+            keep_from = len(sealed)
+            while keep_from and kept < min_records:
+                keep_from -= 1
+                kept += sealed[keep_from][2].stat().st_size // _ENTRY.size
+            self._write_base(self._base())
+            for _, p, i in sealed[:keep_from]:
+                p.unlink(missing_ok=True)
+                i.unlink(missing_ok=True)
+                dropped += 1
+        return dropped
+
+PEARL_LOG = SegmentedLog(Path(SKG_MEMORY_DIR) / "pearls.jsonl")
+
+if __name__ == "__main__":
+    print(json.dumps({"records": PEARL_LOG.count(), "end_offset": PEARL_LOG.end_offset()}, indent=2))
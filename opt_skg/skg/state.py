@@ -2,17 +2,22 @@
 import sys; sys.path.append('/opt/skg')
 """
 SKG Portable — State Management
-Handles journal.json, sandbox.json, and pearl memory logging.
+Handles the ring journal, sandbox.json, and pearl memory logging.
 """
 
 import json, time
 from pathlib import Path
 from skg.paths import SKG_STATE_DIR, SKG_MEMORY_DIR, SKG_LOG_DIR
+from skg.seglog import PEARL_LOG
+from skg.ring_journal import RingJournal
 
-JOURNAL_PATH = Path(SKG_STATE_DIR) / "journal.json"
+JOURNAL_PATH = Path(SKG_STATE_DIR) / "journal.ring"
+LEGACY_JOURNAL_PATH = Path(SKG_STATE_DIR) / "journal.json"
 SANDBOX_PATH = Path(SKG_STATE_DIR) / "sandbox.json"
 PEARLS_PATH  = Path(SKG_MEMORY_DIR) / "pearls.jsonl"
 
+JOURNAL = RingJournal(JOURNAL_PATH, capacity=1000, legacy=LEGACY_JOURNAL_PATH)
+
 def load_json(path: Path, default):
     if not path.exists():
         return default
@@ -28,20 +33,16 @@ def save_json(path: Path, data):
         json.dump(data, f, indent=2)
 
 def append_pearl(entry: dict):
-    PEARLS_PATH.parent.mkdir(parents=True, exist_ok=True)
     entry["timestamp"] = time.time()
-    with PEARLS_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    PEARL_LOG.append(entry)
 
 def log_journal(message: str, kind="heartbeat"):
-    journal = load_json(JOURNAL_PATH, [])
     entry = {
         "ts": time.time(),
         "kind": kind,
         "msg": message
     }
-    journal.append(entry)
-    save_json(JOURNAL_PATH, journal[-1000:])  # keep last 1000
+    JOURNAL.append(entry)  # O(1) slot write; the ring keeps the last 1000
     append_pearl(entry)
 
 def update_sandbox(key, value):
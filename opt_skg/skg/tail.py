@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Shared reverse tail reader for append-only JSONL files.
+tail_jsonl(path, n) reads backwards from EOF in blocks and keeps a per-file
+cache of (inode, consumed range, offset -> parsed record), so repeated tails
+only read bytes appended since the last call.  Rotation/truncation (inode
+change or shrink) resets the cache.  Returned dicts are shared: treat as read-only.
+With `fields`, records hold only those top-level keys (skg.jsonfields) and
+are cached apart from the full records of the same file.
+"""
+import os, json, threading
+from collections import deque
+from skg.jsonfields import Projector
+
+BLOCK       = 64 * 1024
+MAX_FORWARD = 1024 * 1024   # beyond this much new data, re-tail from EOF instead
+
+_MU = threading.Lock()
+_CACHE = {}
+
+class _Tail:
+    def __init__(self, ino, end, proj=None):
+        self.ino = ino
+        self.proj = proj
+        self.start = self.end = end   # [start, end) is consumed, both on line boundaries
+        self.keep = 0
+        self.rows = deque()           # (offset, record)
+
+def _parse(lines, off, proj=None):
+    out = []
+    for ln in lines:
+        if ln.strip():
+            try:
+                obj = proj(ln) if proj else json.loads(ln)
+                if isinstance(obj, dict):
+                    out.append((off, obj))
+            except Exception:
+                pass
+        off += len(ln) + 1
+    return out
+
+def _complete_end(fd, size):
+    """Offset just past the last newline at or before size."""
+    pos = size
+    while pos > 0:
+        k = max(0, pos - BLOCK)
+        i = os.pread(fd, pos - k, k).rfind(b"\n")
+        if i >= 0:
+            return k + i + 1
+        pos = k
+    return 0
+
+def _forward(t, fd, size):
+    buf = os.pread(fd, size - t.end, t.end)
+    cut = buf.rfind(b"\n") + 1
+    if cut:
+        t.rows.extend(_parse(buf[:cut - 1].split(b"\n"), t.end, t.proj))
+        t.end += cut
+
+def _backfill(t, fd, n):
+    carry, pos = b"", t.start
+    while len(t.rows) < n and t.start > 0:
+        k = max(0, pos - BLOCK)
+        buf = os.pread(fd, pos - k, k) + carry          # covers [k, t.start)
+        parts = buf[:-1].split(b"\n")
+        head = parts[0] if k else None
+        body = parts[1:] if k else parts
+        first = k + len(head) + 1 if k else 0
+        t.rows.extendleft(reversed(_parse(body, first, t.proj)))
+        t.start, carry, pos = first, (head + b"\n" if k else b""), k
+
+def tail_jsonl(path, n: int, fields=None) -> list:
+    """Last n JSON objects of path, oldest first."""
+    return tail_jsonl_cursor(path, n, fields)[0]
+
+def tail_jsonl_cursor(path, n: int, fields=None):
+    """(last n JSON objects, (inode, end offset)); reading forward from the
+    end offset picks up exactly the records appended after them."""
+    key = (str(path), tuple(fields) if fields is not None else None)
+    with _MU:
+        try:
+            fd = os.open(key[0], os.O_RDONLY)
+        except OSError:
+            _CACHE.pop(key, None)
+            return [], (0, 0)
+        try:
+            st = os.fstat(fd)
+            t = _CACHE.get(key)
+            if t is None or t.ino != st.st_ino or st.st_size < t.end or st.st_size - t.end > MAX_FORWARD:
+                proj = Projector(key[1]) if key[1] is not None else None
+                t = _CACHE[key] = _Tail(st.st_ino, _complete_end(fd, st.st_size), proj)
+            elif st.st_size > t.end:
+                _forward(t, fd, st.st_size)
+            t.keep = max(t.keep, n)
+            _backfill(t, fd, n)
+            while len(t.rows) > t.keep:
+                t.rows.popleft()
+                t.start = t.rows[0][0]
+            rows = list(t.rows)[-n:] if n > 0 else []
+            cursor = (t.ino, t.end)
+        finally:
+            os.close(fd)
+    return [r for _, r in rows], cursor
@@ -2,14 +2,14 @@
 """
 SKG Telemetry Daemon
 Collects runtime vitals: CPU, memory, entropy drift, ethics coherence.
-Writes /var/lib/skg/state/telemetry.json for self_state and dashboards.
+Publishes into the shared state telemetry store for self_state and dashboards.
 """
-import json, os, psutil, time
+import os, psutil, time
 from pathlib import Path
 from statistics import fmean
+from skg.telemetry_store import STATE_TELEMETRY
 
 STATE_DIR = Path("/var/lib/skg/state")
-TELEMETRY_FILE = STATE_DIR / "telemetry.json"
 
 def read_entropy():
     try:
@@ -54,7 +54,7 @@ def loop(interval=30):
         hist.append(d)
         if len(hist) > 10: hist.pop(0)
         d["entropy_avg"] = round(fmean([h["entropy"] for h in hist if h["entropy"]]),4) if any(h["entropy"] for h in hist) else None
-        with open(TELEMETRY_FILE, "w") as f: json.dump(d, f, indent=2)
+        STATE_TELEMETRY.update(d)
         time.sleep(interval)
 
 if __name__ == "__main__":
@@ -75,7 +75,7 @@ def loop(interval=30):
             "entropy_avg_5m": round(sum(HIST_5M)/len(HIST_5M),4) if HIST_5M else None,
             "entropy_avg_1h": round(sum(HIST_1H)/len(HIST_1H),4) if HIST_1H else None,
         })
-        with open(TELEMETRY_FILE,"w") as f: json.dump(d,f,indent=2)
+        STATE_TELEMETRY.update(d)
         time.sleep(interval)
 
 # --- SKG Phase 10 addition: rolling averages ---
@@ -93,5 +93,5 @@ def loop(interval=30):
             "entropy_avg_5m": round(sum(HIST_5M)/len(HIST_5M),4) if HIST_5M else None,
             "entropy_avg_1h": round(sum(HIST_1H)/len(HIST_1H),4) if HIST_1H else None,
         })
-        with open(TELEMETRY_FILE,"w") as f: json.dump(d,f,indent=2)
+        STATE_TELEMETRY.update(d)
         time.sleep(interval)
@@ -1,14 +1,16 @@
-import os, json, time
-PATH="/var/lib/skg/memory/telemetry.json"
+import time
+from skg.telemetry_store import BUS_TELEMETRY, COALESCE_SECONDS
+PATH=str(BUS_TELEMETRY.path)
 def read():
-    if os.path.exists(PATH):
-        try: return json.load(open(PATH))
-        except: return {}
-    return {}
+    try: return BUS_TELEMETRY.read()
+    except Exception: return {}
 def write(d):
-    os.makedirs(os.path.dirname(PATH),exist_ok=True)
     d.setdefault("_meta",{})["updated"]=time.time()
-    json.dump(d,open(PATH,"w"),indent=2)
+    BUS_TELEMETRY.update(d)
 def upsert(ns,payload):
-    t=read(); t.setdefault(ns,{})
-    t[ns].update(payload); write(t); return t[ns]
+    r=BUS_TELEMETRY.upsert(ns,payload)
+    BUS_TELEMETRY.upsert("_meta",{"updated":time.time()})
+    return r
+def subscribe(namespaces=None,coalesce=COALESCE_SECONDS):
+    """Blocking feed of changed namespaces: for d in subscribe(): ... or .get(timeout)."""
+    return BUS_TELEMETRY.subscribe(namespaces,coalesce)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Shared Telemetry Store
+Memory-mapped replacement for the telemetry.json documents.  Every top-level
+key lives in its own fixed-size slot, so a writer updates only its own keys
+instead of re-serialising (and clobbering) the whole document.
+
+  header   magic, slots, slot size, seq, slots in use
+  slot     version, name, JSON value
+
+Writers serialise on flock and bracket each multi-key update with a seqlock
+(seq odd while writing).  Readers take no lock: they copy the slots between
+two even, equal reads of seq and retry otherwise, and only re-decode slots
+whose version moved since their last read.  subscribe() pushes changed keys
+to other processes over Unix datagram sockets instead of having them poll.
+"""
+
+import os, json, mmap, time, struct, fcntl, socket, select, atexit, threading
+from contextlib import contextmanager
+from pathlib import Path
+from skg.paths import SKG_STATE_DIR, SKG_MEMORY_DIR
+
+MAGIC      = b"SKGTEL01"
+_HEADER    = struct.Struct("<8sIIQI")    # magic, slots, slot_bytes, seq, used
+_SLOT      = struct.Struct("<QHI")       # version, name length, value length
+HEADER_BYTES = 64
+NAME_BYTES   = 64
+STALE_SPINS  = 10000      # odd seq this long with no writer holding the lock = crashed writer
+COALESCE_SECONDS = 0.02   # updates this close together reach subscribers as one change set
+POLL_SECONDS     = 0.25   # subscriber fallback where Unix sockets are unavailable
+
+class TelemetryStore:
+    def __init__(self, path, slots=128, slot_bytes=8192, legacy=None):
+        self.path = Path(path)
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.legacy = Path(legacy) if legacy else None
+        self.sub_dir = Path(str(self.path) + ".sub")      # one socket per subscriber
+        self._map = None
+        self._fd = None
+        self._mu = threading.Lock()
+        self._cache = {}          # slot -> (version, name, value)
+        os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        # a forked child shares our flock; it must open its own descriptor
+        self._map = self._fd = None
+        self._mu = threading.Lock()
+
+    # --- mapping ------------------------------------------------------------
+    def _open(self):
+        if self._map is not None:
+            return self._map
+        with self._mu:
+            if self._map is None:
+                self._map_file()
+        return self._map
+
+    def _map_file(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = HEADER_BYTES + self.slots * self.slot_bytes
+        if os.fstat(fd).st_size < size:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size < HEADER_BYTES:
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, _HEADER.pack(MAGIC, self.slots, self.slot_bytes, 0, 0), 0)
+                    fresh = True
+                else:
+                    fresh = False
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            fresh = False
+        magic, slots, slot_bytes, _, _ = _HEADER.unpack(os.pread(fd, _HEADER.size, 0))
+        if magic != MAGIC:
+            os.close(fd)
+            raise ValueError(f"not a telemetry store: {self.path}")
+        self.slots, self.slot_bytes = slots, slot_bytes
+        m = mmap.mmap(fd, HEADER_BYTES + slots * slot_bytes)
+        if fresh and self.legacy and self.legacy.exists():
+            # carry the old telemetry.json document over once
+            try:
+                doc = json.loads(self.legacy.read_text())
+                if isinstance(doc, dict):
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    try:
+                        self._write(m, doc)
+                    finally:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+            except Exception:
+                pass
+        self._fd, self._map = fd, m
+
+    def _seq(self, m):
+        return struct.unpack_from("<Q", m, 16)[0]
+
+    def _set_seq(self, m, seq):
+        struct.pack_into("<Q", m, 16, seq)
+
+    def _used(self, m):
+        return struct.unpack_from("<I", m, 24)[0]
+
+    def _at(self, i):
+        return HEADER_BYTES + i * self.slot_bytes
+
+    # --- writers ------------------------------------------------------------
+    def _locked(self):
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self._map
+
+    def _unlock(self):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _index(self, m):
+        """name -> slot for every live slot (caller holds the writer lock)."""
+        out = {}
+        for i in range(self._used(m)):
+            _, nlen, _ = _SLOT.unpack_from(m, self._at(i))
+            if nlen:
+                out[bytes(m[self._at(i) + _SLOT.size:self._at(i) + _SLOT.size + nlen]).decode()] = i
+        return out
+
+    def _value(self, m, i):
+        ver, nlen, vlen = _SLOT.unpack_from(m, self._at(i))
+        start = self._at(i) + _SLOT.size + NAME_BYTES
+        return json.loads(bytes(m[start:start + vlen]))
+
+    def _encode(self, key, value):
+        name = str(key).encode()
+        raw = json.dumps(value, separators=(",", ":")).encode()
+        if len(name) > NAME_BYTES:
+            raise ValueError(f"telemetry key too long: {key!r}")
+        if len(raw) > self.slot_bytes - _SLOT.size - NAME_BYTES:
+            raise ValueError(f"telemetry value too large for {key!r}: {len(raw)} bytes")
+        return name, raw
+
+    def _write(self, m, changes: dict, drop=()):
+        encoded = {k: self._encode(k, v) for k, v in changes.items()}
+        index = self._index(m)
+        dropped = [index.pop(str(k)) for k in drop if str(k) in index]
+        used = self._used(m)
+        free = [i for i in range(used) if i not in index.values() and i not in dropped] + dropped
+        slots = {}
+        for k in encoded:
+            i = index.get(str(k))
+            if i is None:
+                if free:
+                    i = free.pop(0)
+                elif used < self.slots:
+                    i, used = used, used + 1
+                else:
+                    raise ValueError(f"telemetry store full ({self.slots} keys)")
+                index[str(k)] = i
+            slots[k] = i
+        seq = self._seq(m)
+        if seq & 1:
+            seq += 1          # a writer died mid-update; we hold the lock now
+        self._set_seq(m, seq + 1)
+        ver = seq + 2
+        for i in dropped:
+            _SLOT.pack_into(m, self._at(i), ver, 0, 0)
+        struct.pack_into("<I", m, 24, used)
+        for k, (name, raw) in encoded.items():
+            at = self._at(slots[k])
+            m[at + _SLOT.size:at + _SLOT.size + len(name)] = name
+            m[at + _SLOT.size + NAME_BYTES:at + _SLOT.size + NAME_BYTES + len(raw)] = raw
+            _SLOT.pack_into(m, at, ver, len(name), len(raw))
+        self._set_seq(m, ver)
+
+    @contextmanager
+    def _writing(self):
+        self._open()
+        with self._mu:
+            m = self._locked()
+            try:
+                yield m
+            finally:
+                self._unlock()
+        self._notify()
+
+    def update(self, changes: dict):
+        """Set the given top-level keys in one atomic step; other keys are untouched."""
+        with self._writing() as m:
+            self._write(m, changes)
+
+    def delete(self, *keys):
+        with self._writing() as m:
+            self._write(m, {}, drop=keys)
+
+    def upsert(self, ns, payload: dict) -> dict:
+        """Merge payload into the dict stored under ns; returns the merged dict."""
+        with self._writing() as m:
+            i = self._index(m).get(str(ns))
+            cur = self._value(m, i) if i is not None else {}
+            if not isinstance(cur, dict):
+                cur = {}
+            cur.update(payload)
+            self._write(m, {ns: cur})
+        return cur
+
+    def incr(self, key, by=1, **also) -> int:
+        """Atomically add `by` to a numeric key (and set any `also` keys)."""
+        with self._writing() as m:
+            i = self._index(m).get(str(key))
+            n = int((self._value(m, i) if i is not None else 0) or 0) + by
+            self._write(m, {key: n, **also})
+        return n
+
+    # --- change notification ------------------------------------------------
+    def _notify(self):
+        """Wake every subscriber; they diff slot versions to see what moved."""
+        try:
+            names = os.listdir(self.sub_dir)
+        except OSError:
+            return
+        if not names:
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as s:
+            s.setblocking(False)
+            for n in names:
+                try:
+                    s.sendto(b"!", str(self.sub_dir / n))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    (self.sub_dir / n).unlink(missing_ok=True)   # subscriber went away
+                except OSError:
+                    pass    # its queue is full, so a wakeup is already pending
+
+    def subscribe(self, keys=None, coalesce=COALESCE_SECONDS) -> "Subscription":
+        return Subscription(self, keys, coalesce)
+
+    # --- readers ------------------------------------------------------------
+    def _repair(self, m):
+        # flock is per open file, so a writer thread of this process sharing
+        # self._fd would not block LOCK_NB (and LOCK_UN would drop its lock):
+        # this process's writers are excluded by self._mu, others by the flock
+        if not self._mu.acquire(blocking=False):
+            return            # a writer of ours is mid-update; keep waiting
+        try:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return        # a live writer holds it; keep waiting
+            try:
+                seq = self._seq(m)
+                if seq & 1:
+                    self._set_seq(m, seq + 1)
+            finally:
+                self._unlock()
+        finally:
+            self._mu.release()
+
+    def version(self) -> int:
+        """Bumps on every update; equal versions mean an unchanged document."""
+        return self._seq(self._open()) & ~1
+
+    def _snapshot(self) -> dict:
+        """name -> (version, value) for every live key, consistently."""
+        m = self._open()
+        spins = 0
+        while True:
+            s1 = self._seq(m)
+            if s1 & 1:
+                spins += 1
+                if spins % STALE_SPINS == 0:
+                    self._repair(m)
+                time.sleep(0)
+                continue
+            fresh, live = {}, []
+            for i in range(self._used(m)):
+                at = self._at(i)
+                ver, nlen, vlen = _SLOT.unpack_from(m, at)
+                if not nlen:
+                    continue
+                live.append(i)
+                hit = self._cache.get(i)
+                if hit is None or hit[0] != ver:
+                    name = bytes(m[at + _SLOT.size:at + _SLOT.size + nlen])
+                    raw = bytes(m[at + _SLOT.size + NAME_BYTES:at + _SLOT.size + NAME_BYTES + vlen])
+                    fresh[i] = (ver, name, raw)
+            if self._seq(m) != s1:
+                continue
+            for i, (ver, name, raw) in fresh.items():
+                try:
+                    self._cache[i] = (ver, name.decode(), json.loads(raw))
+                except Exception:
+                    self._cache[i] = (ver, name.decode(errors="replace"), None)
+            return {self._cache[i][1]: (self._cache[i][0], self._cache[i][2]) for i in live}
+
+    def read(self) -> dict:
+        """Consistent snapshot of the whole document.  Values are shared
+        between calls: treat them as read-only."""
+        return {k: v for k, (_, v) in self._snapshot().items()}
+
+    def get(self, key, default=None):
+        return self.read().get(key, default)
+
+class Subscription:
+    """Changed keys of a store, pushed over a Unix datagram socket.
+
+    get() returns {key: value} for keys (optionally limited to `keys`) whose
+    value changed since the previous get(), None for deleted keys; bursts of
+    updates within `coalesce` seconds arrive as one change set.  Nothing is
+    lost if wakeups are dropped: changes are found by diffing slot versions.
+    """
+    def __init__(self, store, keys=None, coalesce=COALESCE_SECONDS):
+        self.store = store
+        self.keys = set(keys) if keys else None
+        self.coalesce = coalesce
+        self._sock = None
+        if hasattr(socket, "AF_UNIX"):
+            store.sub_dir.mkdir(parents=True, exist_ok=True)
+            self.addr = store.sub_dir / f"{os.getpid()}.{id(self):x}.sock"
+            self.addr.unlink(missing_ok=True)
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sock.bind(str(self.addr))
+            atexit.register(self.close)
+        # bound before the first snapshot, so no update can slip between them
+        self._seen = {k: ver for k, (ver, _) in store._snapshot().items()}
+
+    def _changes(self) -> dict:
+        snap = self.store._snapshot()
+        out = {k: v for k, (ver, v) in snap.items() if self._seen.get(k) != ver}
+        out.update({k: None for k in self._seen if k not in snap})
+        self._seen = {k: ver for k, (ver, _) in snap.items()}
+        if self.keys is not None:
+            out = {k: v for k, v in out.items() if k in self.keys}
+        return out
+
+    def _drain(self):
+        try:
+            while self._sock.recv(64):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _wait(self, timeout) -> bool:
+        if self._sock is None:
+            time.sleep(POLL_SECONDS if timeout is None else min(timeout, POLL_SECONDS))
+            return True
+        ready, _, _ = select.select([self._sock], [], [], timeout)
+        if not ready:
+            return False
+        self._sock.setblocking(False)
+        self._drain()
+        if self.coalesce:
+            time.sleep(self.coalesce)
+            self._drain()
+        self._sock.setblocking(True)
+        return True
+
+    def get(self, timeout=None):
+        """Next change set, or None if nothing changed within timeout seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changes = self._changes()
+            if changes:
+                return changes
+            left = None if deadline is None else deadline - time.monotonic()
+            if left is not None and left <= 0:
+                return None
+            if not self._wait(left):
+                return None
+
+    def __iter__(self):
+        while True:
+            yield self.get()
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            self.addr.unlink(missing_ok=True)
+
+STATE_TELEMETRY = TelemetryStore(Path(SKG_STATE_DIR) / "telemetry.shm",
+                                 legacy=Path(SKG_STATE_DIR) / "telemetry.json")
+BUS_TELEMETRY   = TelemetryStore(Path(SKG_MEMORY_DIR) / "telemetry.shm",
+                                 legacy=Path(SKG_MEMORY_DIR) / "telemetry.json")
+
+if __name__ == "__main__":
+    which = BUS_TELEMETRY if sys.argv[1:] == ["bus"] else STATE_TELEMETRY
+    print(json.dumps(which.read(), indent=2))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Theme Counter — running theme totals over the continuity index.
+One Aho–Corasick automaton matches every theme keyword in a single pass per
+text; ThemeWindow tails continuity_index.jsonl from its last read offset and
+keeps per-theme totals over the newest `size` rows, so dominant-theme
+queries cost O(themes).  Keywords come from `themes:` in config.yml (re-read
+when the file changes) and default to THEME_KEYWORDS.
+"""
+import os, json, threading
+from collections import deque
+from pathlib import Path
+from skg.paths import SKG_CONFIG_DIR
+from skg.tail import tail_jsonl_cursor
+
+THEME_KEYWORDS = ["energy","gravity","phase","sphere","audit","growth","council","reflection","anonym","federat","consensus"]
+INDEX_PATH = "/var/lib/skg/continuity_index.jsonl"
+CONFIG_PATH = Path(SKG_CONFIG_DIR) / "config.yml"
+
+class ThemeAutomaton:
+    """Aho–Corasick over a fixed keyword list."""
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        self._goto = [{}]
+        self._out = [[]]          # state -> [(keyword id, length)]
+        for i, k in enumerate(self.keywords):
+            s = 0
+            for ch in k:
+                if ch not in self._goto[s]:
+                    self._goto.append({}); self._out.append([])
+                    self._goto[s][ch] = len(self._goto) - 1
+                s = self._goto[s][ch]
+            self._out[s].append((i, len(k)))
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, t in self._goto[s].items():
+                queue.append(t)
+                f = fail[s]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                fail[t] = self._goto[f].get(ch, 0) if self._goto[f].get(ch, 0) != t else 0
+                self._out[t] = self._out[t] + self._out[fail[t]]
+        self._fail = fail
+
+    def count(self, text: str) -> list:
+        """Occurrences of each keyword, counted like str.count (non-overlapping)."""
+        n = [0] * len(self.keywords)
+        free = [0] * len(self.keywords)    # earliest start a new match may have
+        goto, fail, out = self._goto, self._fail, self._out
+        s = 0
+        for pos, ch in enumerate(text):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            for i, ln in out[s]:
+                start = pos - ln + 1
+                if start >= free[i]:
+                    n[i] += 1
+                    free[i] = pos + 1
+        return n
+
+_MU = threading.Lock()
+_LOADED = [None, None]      # (config mtime, automaton)
+
+def automaton() -> ThemeAutomaton:
+    """Automaton for the configured keywords, rebuilt when config.yml changes."""
+    try:
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _MU:
+        if _LOADED[1] is None or _LOADED[0] != mtime:
+            kws = None
+            if mtime is not None:
+                try:
+                    import yaml
+                    kws = (yaml.safe_load(CONFIG_PATH.read_text()) or {}).get("themes")
+                except Exception:
+                    kws = None
+            if not isinstance(kws, list) or not kws:
+                kws = THEME_KEYWORDS
+            kws = [str(k).lower() for k in kws]
+            if _LOADED[1] is None or _LOADED[1].keywords != kws:
+                _LOADED[1] = ThemeAutomaton(kws)
+            _LOADED[0] = mtime
+        return _LOADED[1]
+
+class ThemeWindow:
+    def __init__(self, path=INDEX_PATH, size=800):
+        self.path = str(path)
+        self.size = size
+        self._mu = threading.Lock()
+        self._ac = None
+        self._reset(None)
+
+    def _reset(self, cursor):
+        self._cursor = cursor       # (inode, end offset) of the last complete line read
+        self._rows = deque()        # (hits, lines) per index row
+        n = len(self._ac.keywords) if self._ac else 0
+        self._hits, self._lines = [0] * n, [0] * n
+
+    def _push(self, j):
+        t = j.get("text", "")
+        hits = self._ac.count(t.lower() if isinstance(t, str) else "")
+        lines = [1 if h else 0 for h in hits]
+        self._rows.append((hits, lines))
+        for i in range(len(hits)):
+            self._hits[i] += hits[i]; self._lines[i] += lines[i]
+        if len(self._rows) > self.size:
+            oh, ol = self._rows.popleft()
+            for i in range(len(oh)):
+                self._hits[i] -= oh[i]; self._lines[i] -= ol[i]
+
+    def refresh(self):
+        with self._mu:
+            ac = automaton()
+            try:
+                fd = os.open(self.path, os.O_RDONLY)
+            except OSError:
+                self._ac = ac
+                self._reset(None)
+                return self
+            try:
+                st = os.fstat(fd)
+                if (ac is not self._ac or self._cursor is None or self._cursor[0] != st.st_ino
+                        or st.st_size < self._cursor[1]):
+                    # new keywords, or the index was compacted/rebuilt: recount the tail
+                    self._ac = ac
+                    recs, cursor = tail_jsonl_cursor(self.path, self.size)
+                    self._reset(cursor)
+                    for j in recs:
+                        self._push(j)
+                    return self
+                ino, end = self._cursor
+                buf = os.pread(fd, st.st_size - end, end) if st.st_size > end else b""
+            finally:
+                os.close(fd)
+            for line in buf.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                try:
+                    j = json.loads(line)
+                except Exception:
+                    continue
+                if isinstance(j, dict):
+                    self._push(j)
+            self._cursor = (ino, end)
+        return self
+
+    def __len__(self):
+        return len(self._rows)
+
+    def counts(self, lines=False) -> dict:
+        """Theme -> occurrences in the window, or rows mentioning it if lines=True."""
+        return dict(zip(self._ac.keywords, self._lines if lines else self._hits))
+
+    def dominant(self, lines=False):
+        c = self.counts(lines)
+        return max(c, key=c.get) if c else None
+
+_WINDOWS = {}
+
+def window(size: int, path=INDEX_PATH) -> ThemeWindow:
+    """Shared, refreshed window over the newest `size` index rows."""
+    key = (str(path), size)
+    w = _WINDOWS.get(key)
+    if w is None:
+        w = _WINDOWS.setdefault(key, ThemeWindow(path, size))
+    return w.refresh()
+
+if __name__ == "__main__":
+    w = window(800)
+    print(json.dumps({"rows": len(w), "dominant": w.dominant(), "counts": w.counts()}, indent=2))
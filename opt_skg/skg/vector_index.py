@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+import sys; sys.path.append('/opt/skg')
+"""
+SKG Portable — Vector Index
+Similarity search over the `vec` of continuity_index.jsonl and
+topology_index.jsonl rows.  Each source is tailed from a saved byte offset into
+a memory-mapped float32 matrix (rows L2-normalised, so dot product = cosine)
+plus the byte offset of every row in its source file.  Small sources are
+searched exactly; once a source reaches IVF_MIN rows a k-means coarse
+quantiser (IVF) is trained and only the NPROBE nearest lists are scanned.
+New rows join their nearest list as they are synced; the quantiser is
+retrained whenever the source has doubled since the last training.
+
+Layout under vectors.idx/:
+  state.json              per source: generation, inode, byte end, rows, trained rows
+  <src>.<gen>.f32 / .ref  vectors (rows x DIM) / source byte offsets (u8)
+  <src>.<gen>.cent / .ivf IVF centroids (lists x DIM) / list id per row (i4)
+
+Files only ever grow past the committed rows; when a source is rotated or
+compacted its index starts over under a new generation and the old files are
+unlinked, so another process still mapping them keeps a valid view.
+"""
+
+import os, json, fcntl
+from pathlib import Path
+from skg.paths import SKG_MEMORY_DIR
+from skg.encoder import encode_text, TOPO_INDEX
+from skg.continuity_index import INDEX_PATH as CONTINUITY_INDEX
+
+try:
+    import numpy as np
+except ImportError:   # optional: without NumPy there is no VECTOR_INDEX
+    np = None
+
+INDEX_DIR   = Path(SKG_MEMORY_DIR) / "vectors.idx"
+SOURCES     = {"continuity": CONTINUITY_INDEX, "topology": TOPO_INDEX}
+DIM         = 8            # encode_text / topology vectors: top-8 token frequencies
+READ_CHUNK  = 8 * 1024 * 1024
+IVF_MIN     = 50000        # below this many rows a source is searched exactly
+IVF_LISTS   = 1024         # upper bound on sqrt(rows) lists
+IVF_ITERS   = 10
+NPROBE      = 8
+
+def _rows_of(vecs):
+    m = np.zeros((len(vecs), DIM), dtype="<f4")
+    for i, v in enumerate(vecs):
+        v = v[:DIM]
+        m[i, :len(v)] = v
+    norm = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norm > 0, norm, 1)
+
+def _kmeans(x, n, seed=0):
+    rng = np.random.default_rng(seed)
+    sample = x[rng.choice(len(x), size=min(len(x), 64 * n), replace=False)]
+    cent = sample[rng.choice(len(sample), size=n, replace=False)].copy()
+    for _ in range(IVF_ITERS):
+        assign = np.argmax(sample @ cent.T, axis=1)
+        for c in range(n):
+            members = sample[assign == c]
+            if len(members):
+                cent[c] = members.sum(axis=0)
+        norm = np.linalg.norm(cent, axis=1, keepdims=True)
+        cent /= np.where(norm > 0, norm, 1)
+    return cent
+
+class VectorIndex:
+    def __init__(self, root=INDEX_DIR, sources=SOURCES):
+        self.root = Path(root)
+        self.sources = {k: Path(v) for k, v in sources.items()}
+        self._st = {}
+        self._cache = {}          # src -> ((inode, rows, trained), mapped arrays)
+
+    def _file(self, src, ext): return self.root / f"{src}.{self._st[src]['gen']}.{ext}"
+
+    # --- persistence --------------------------------------------------------
+    def _load(self):
+        try:
+            self._st = json.loads((self.root / "state.json").read_text())
+        except Exception:
+            self._st = {}
+
+    def _save(self):
+        tmp = self.root / "state.json.tmp"
+        tmp.write_text(json.dumps(self._st))
+        tmp.replace(self.root / "state.json")
+
+    def _stale(self) -> bool:
+        for src, path in self.sources.items():
+            cur = self._st.get(src, {})
+            if cur and "gen" not in cur:
+                return True      # written before generations: start over
+            try:
+                st = os.stat(path)
+            except OSError:
+                if cur.get("rows"):
+                    return True
+                continue
+            if st.st_ino != cur.get("ino") or st.st_size != cur.get("end"):
+                return True
+        return False
+
+    # --- indexing -----------------------------------------------------------
+    def sync(self) -> int:
+        """Index rows appended to the sources since the last sync; returns rows added."""
+        if self._st and not self._stale():
+            return 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        added = 0
+        with open(self.root / ".lock", "a") as lk:
+            fcntl.flock(lk, fcntl.LOCK_EX)
+            self._load()
+            for src, path in self.sources.items():
+                added += self._sync_source(src, path)
+            self._save()
+        return added
+
+    def _sync_source(self, src, path) -> int:
+        cur = self._st.setdefault(src, {"ino": 0, "end": 0, "rows": 0, "trained": 0})
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            fd = None
+        try:
+            st = os.fstat(fd) if fd is not None else None
+            if "gen" not in cur or st is None or st.st_ino != cur["ino"] or st.st_size < cur["end"]:
+                # rotated, compacted or truncated: offsets are meaningless, start
+                # over in new files; readers may still map the old ones
+                gen = cur.get("gen", -1) + 1
+                for old in self.root.glob(f"{src}.*"):
+                    if not old.name.startswith(f"{src}.{gen}."):
+                        old.unlink(missing_ok=True)
+                cur.update(gen=gen, ino=st.st_ino if st else 0, end=0, rows=0, trained=0)
+            for ext, size in (("f32", 4 * DIM), ("ref", 8), ("ivf", 4)):
+                # drop anything a crashed sync wrote past the committed rows
+                # (never mapped: readers map only committed rows)
+                if ext != "ivf" or cur["trained"]:
+                    with open(self._file(src, ext), "ab") as f:
+                        f.truncate(cur["rows"] * size)
+            if st is None:
+                return 0
+            added = 0
+            while cur["end"] < st.st_size:
+                buf = os.pread(fd, min(READ_CHUNK, st.st_size - cur["end"]), cur["end"])
+                cut = buf.rfind(b"\n") + 1
+                if not cut:
+                    if len(buf) < READ_CHUNK:
+                        break     # a partial last line; pick it up next time
+                    cut = len(buf)
+                vecs, refs, off = [], [], cur["end"]
+                for line in buf[:cut].splitlines(keepends=True):
+                    try:
+                        v = json.loads(line).get("vec")
+                    except Exception:
+                        v = None
+                    if isinstance(v, list) and v and all(isinstance(x, (int, float)) for x in v):
+                        vecs.append(v); refs.append(off)
+                    off += len(line)
+                added += self._append(src, cur, vecs, refs)
+                cur["end"] += cut
+        finally:
+            if fd is not None:
+                os.close(fd)
+        if cur["rows"] >= IVF_MIN and cur["rows"] >= 2 * cur["trained"]:
+            self._train(src, cur)
+        return added
+
+    def _append(self, src, cur, vecs, refs) -> int:
+        if not vecs:
+            return 0
+        m = _rows_of(vecs)
+        with open(self._file(src, "f32"), "ab") as f:
+            m.tofile(f)
+        with open(self._file(src, "ref"), "ab") as f:
+            np.asarray(refs, dtype="<u8").tofile(f)
+        if cur["trained"]:
+            cent = np.load(self._file(src, "cent"))
+            with open(self._file(src, "ivf"), "ab") as f:
+                np.argmax(m @ cent.T, axis=1).astype("<i4").tofile(f)
+        cur["rows"] += len(vecs)
+        return len(vecs)
+
+    def _train(self, src, cur):
+        x = np.fromfile(self._file(src, "f32"), dtype="<f4", count=cur["rows"] * DIM).reshape(-1, DIM)
+        cent = _kmeans(x, min(IVF_LISTS, int(len(x) ** 0.5)))
+        tmp = self._file(src, "cent.tmp.npy")
+        np.save(tmp, cent)
+        tmp.replace(self._file(src, "cent"))
+        assign = np.concatenate([np.argmax(x[i:i + 65536] @ cent.T, axis=1)
+                                 for i in range(0, len(x), 65536)]).astype("<i4")
+        assign.tofile(self._file(src, "ivf"))
+        cur["trained"] = cur["rows"]
+
+    # --- lookups ------------------------------------------------------------
+    def _view(self, src):
+        cur = self._st.get(src, {})
+        rows, trained = cur.get("rows", 0), cur.get("trained", 0)
+        stamp = (cur.get("gen"), rows, trained)
+        hit = self._cache.get(src)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        if not rows:
+            view = (0, 0, None, None, None, None)
+        else:
+            vecs = np.memmap(self._file(src, "f32"), dtype="<f4", mode="r", shape=(rows, DIM))
+            refs = np.memmap(self._file(src, "ref"), dtype="<u8", mode="r", shape=(rows,))
+            cent = lists = None
+            if trained:
+                cent = np.load(self._file(src, "cent"))
+                assign = np.fromfile(self._file(src, "ivf"), dtype="<i4", count=rows)
+                order = np.argsort(assign, kind="stable")
+                bounds = np.searchsorted(assign[order], np.arange(len(cent) + 1))
+                lists = (order, bounds)
+            view = (rows, trained, vecs, refs, cent, lists)
+        self._cache[src] = (stamp, view)
+        return view
+
+    def _candidates(self, src, q, k, nprobe):
+        rows, _, vecs, refs, cent, lists = self._view(src)
+        if not rows:
+            return []
+        if lists is None:
+            cand = None
+            scores = vecs @ q
+        else:
+            order, bounds = lists
+            probe = np.argsort(-(cent @ q))[:nprobe]
+            cand = np.sort(np.concatenate([order[bounds[c]:bounds[c + 1]] for c in probe]))
+            scores = vecs[cand] @ q
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        rows_ = top if cand is None else cand[top]
+        return [(float(scores[t]), src, int(refs[r])) for t, r in zip(top, rows_)]
+
+    def search(self, vec_or_text, k: int = 5, source=None, nprobe: int = NPROBE) -> list:
+        """k most similar entries as {source, score, entry}, best first."""
+        q = encode_text(vec_or_text) if isinstance(vec_or_text, str) else list(vec_or_text)
+        q = _rows_of([q])[0]
+        if not q.any():
+            return []
+        for attempt in range(2):
+            self.sync()
+            try:
+                hits = []
+                for src in ([source] if source else self.sources):
+                    hits += self._candidates(src, q, k, nprobe)
+                break
+            except FileNotFoundError:
+                # another process started a source over between our sync and our map
+                if attempt:
+                    raise
+                self._st = {}
+        hits.sort(key=lambda h: -h[0])
+        out = []
+        for score, src, ref in hits[:k]:
+            try:
+                with open(self.sources[src], "rb") as f:
+                    f.seek(ref)
+                    entry = json.loads(f.readline())
+            except Exception:
+                continue
+            out.append({"source": src, "score": round(score, 6), "entry": entry})
+        return out
+
+VECTOR_INDEX = VectorIndex() if np is not None else None
+
+def search(vec_or_text, k: int = 5, source=None) -> list:
+    if VECTOR_INDEX is None:
+        raise RuntimeError("vector search needs numpy")
+    return VECTOR_INDEX.search(vec_or_text, k, source)
+
+if __name__ == "__main__":
+    if VECTOR_INDEX is None:
+        print(json.dumps({"ok": False, "error": "numpy not installed"}))
+    else:
+        q = " ".join(sys.argv[1:])
+        print(json.dumps({"ok": True, "synced": VECTOR_INDEX.sync(), "state": VECTOR_INDEX._st,
+                          "hits": search(q) if q else []}, indent=2))
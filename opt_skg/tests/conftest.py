@@ -0,0 +1,9 @@
+import os, sys, tempfile
+from pathlib import Path
+
+# keep skg.paths (and module-level stores) out of the real /etc and /var trees
+_root = Path(tempfile.mkdtemp(prefix="skg-tests-"))
+for name, sub in (("SKG_CONFIG_DIR", "etc"), ("SKG_STATE_DIR", "state"),
+                  ("SKG_LOG_DIR", "log"), ("SKG_MEMORY_DIR", "state/memory")):
+    os.environ.setdefault(name, str(_root / sub))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,39 @@
+import gzip, json, random
+import pytest
+from skg import archive_blocks, archive_query
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_blocks, "BLOCK_BYTES", 2048)
+    monkeypatch.setattr(archive_query, "LIVE_CHUNK", 1024)
+    rng = random.Random(7)
+    ts = rng.sample(range(1, 100000), 3000)          # distinct, so ts order is total
+    recs = [{"ts": t, "actor": f"a{rng.randrange(5)}", "n": i} for i, t in enumerate(ts)]
+    recs += [{"actor": "a1", "n": -1}, {"ts": "late", "actor": "a2"}]
+    rng.shuffle(recs)
+    lines = [json.dumps(r).encode() for r in recs]
+    live = [tmp_path / "live1.jsonl", tmp_path / "live2.jsonl"]
+    live[0].write_bytes(b"\n".join(lines[:800]) + b"\nnot json\n")
+    live[1].write_bytes(b"\n".join(lines[800:1200]) + b"\n")
+    block = tmp_path / "block.jsonl.gz"
+    archive_blocks.write_archive(block, sorted(lines[1200:2400], key=lambda l: json.loads(l).get("n")))
+    plain = tmp_path / "plain.jsonl.gz"
+    plain.write_bytes(gzip.compress(b"\n".join(lines[2400:]) + b"\n"))
+    archives = [{"path": str(block)}, {"path": str(plain)}]
+    return [str(p) for p in live], archives, recs
+
+def _brute(recs, actor, t_min, t_max):
+    out = [r for r in recs if isinstance(r.get("ts"), int)
+           and (not actor or r.get("actor") == actor)
+           and (not t_min or r["ts"] >= t_min) and (not t_max or r["ts"] <= t_max)]
+    return sorted(out, key=lambda r: r["ts"])
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("actor,t_min,t_max,limit", [
+    ("a3", None, None, 10000), ("a0", 20000, 60000, 50), (None, 5000, 9000, 10000),
+    (None, None, 40000, 7), ("nobody", None, None, 10), ("a1", 99000, None, 1),
+])
+def test_query_matches_brute_force(sources, workers, actor, t_min, t_max, limit):
+    live, archives, recs = sources
+    got = list(archive_query.query(live, archives, actor, t_min, t_max, limit, workers))
+    assert got == _brute(recs, actor, t_min, t_max)[:limit]
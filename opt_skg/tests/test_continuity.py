@@ -0,0 +1,26 @@
+from skg import continuity
+from skg.seglog import SegmentedLog
+
+def test_abandoned_ingest_never_splits_a_file(tmp_path, monkeypatch):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name in ("a", "b"):
+        (docs / f"chat_full_restore_{name}.txt").write_text(
+            "".join(f"{name} line {i}\n" for i in range(400)))
+    log = SegmentedLog(tmp_path / "pearls.jsonl")
+    monkeypatch.setattr(continuity, "CONTINUITY_DIR", docs)
+    monkeypatch.setattr(continuity, "PEARL_LOG", log)
+    monkeypatch.setattr(continuity, "CHUNK_BYTES", 512)     # many chunks per file
+    calls = []
+    def check():
+        calls.append(1)
+        if len(calls) > 1:
+            raise TimeoutError
+    try:
+        continuity.ingest_new_exports(workers=1, check=check)
+    except TimeoutError:
+        pass
+    assert len(calls) == 2                          # once per file, not per chunk
+    assert continuity.ingest_new_exports(workers=1) == ["chat_full_restore_b.txt"]
+    texts = [r["text"] for _, r in log.read_from(0)]
+    assert sorted(texts) == sorted(f"{n} line {i}" for n in "ab" for i in range(400))
@@ -0,0 +1,50 @@
+import json
+import pytest
+from skg import continuity_index
+from skg.seglog import SegmentedLog
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    path = tmp_path / "continuity_index.jsonl"
+    monkeypatch.setattr(continuity_index, "INDEX_PATH", path)
+    monkeypatch.setattr(continuity_index, "STATE_PATH", path.with_suffix(".state.json"))
+    monkeypatch.setattr(continuity_index, "LOCK_PATH", path.with_suffix(".lock"))
+    log = SegmentedLog(tmp_path / "pearls.jsonl")
+    monkeypatch.setattr(continuity_index, "PEARL_LOG", log)
+    path.write_bytes(b"")
+    continuity_index._save_state({"offset": 0, "rows": 0, "bytes": 0})
+    return path, log
+
+def _log(log, n, start=0):
+    log.append_many({"kind": "continuity", "timestamp": start + i, "text": f"t{start + i}", "vec": [i]}
+                    for i in range(n))
+    log.flush()
+
+def test_sync_after_interrupted_sync(index):
+    path, log = index
+    _log(log, 3)
+    continuity_index.sync()
+    # a sync that appended rows but died before saving its state
+    with path.open("ab") as f:
+        f.write(b'{"ts": 99, "text": "partial", "vec": [9]}\n')
+    _log(log, 2, start=3)
+    continuity_index.sync()
+    _log(log, 2, start=5)
+    st = continuity_index.sync()
+    data = path.read_bytes()
+    assert st["bytes"] == len(data)
+    rows = [json.loads(line) for line in data.splitlines()]
+    assert [r["ts"] for r in rows] == list(range(7))
+    assert st["rows"] == 7
+
+def test_abandoned_sync_appends_nothing(index):
+    path, log = index
+    _log(log, 3)
+    before = continuity_index.sync()
+    _log(log, 2, start=3)
+    def expired():
+        raise TimeoutError
+    with pytest.raises(TimeoutError):
+        continuity_index.sync(check=expired)
+    assert continuity_index._load_state() == before
+    assert continuity_index.sync()["rows"] == 5
@@ -0,0 +1,28 @@
+import json
+from skg import encoder
+from skg.seglog import SegmentedLog
+
+def test_encode_resumes_after_interrupted_run(tmp_path, monkeypatch):
+    topo = tmp_path / "topology_index.jsonl"
+    monkeypatch.setattr(encoder, "TOPO_INDEX", topo)
+    monkeypatch.setattr(encoder, "STATE_VECTOR", tmp_path / "state_vector.json")
+    monkeypatch.setattr(encoder, "POINTER_PATH", tmp_path / "encoder_pointer.json")
+    log = SegmentedLog(tmp_path / "pearls.jsonl")
+    monkeypatch.setattr(encoder, "PEARL_LOG", log)
+    def add(start, n):
+        log.append_many({"timestamp": start + i, "kind": "k", "text": f"w{i}"} for i in range(n))
+        log.flush()
+    add(1, 3)
+    encoder.encode_new()
+    # rows an encode appended before dying without a checkpoint
+    with topo.open("ab") as f:
+        f.write(b'{"ts": 99}\n{"ts": 98}\n')
+    encoder.encode_new()            # nothing new: the checkpoint must still see the cut
+    assert encoder.load_pointer()["topo_bytes"] == topo.stat().st_size
+    add(4, 2)
+    encoder.encode_new()
+    add(6, 2)
+    encoder.encode_new()
+    data = topo.read_bytes()
+    assert encoder.load_pointer()["topo_bytes"] == len(data)
+    assert [json.loads(l)["ts"] for l in data.splitlines()] == list(range(1, 8))
@@ -0,0 +1,49 @@
+import math, threading
+from skg.fulltext import FullTextIndex, FANOUT
+from skg.seglog import SegmentedLog
+
+def _index(tmp_path):
+    log = SegmentedLog(tmp_path / "pearls.jsonl")
+    idx = FullTextIndex(tmp_path / "fulltext", log, tmp_path / "audit.jsonl", tmp_path / "vault.jsonl")
+    idx._merge_async = lambda: None      # merge explicitly below
+    return log, idx
+
+def test_tiered_merges_bound_segment_count(tmp_path):
+    log, idx = _index(tmp_path)
+    for i in range(80):
+        log.append_many({"text": f"alpha w{i} " + "beta " * (i % 5)} for _ in range(1 + i % 7))
+        log.flush()
+        idx.sync()
+        idx.merge()
+    segs = idx._state()["segments"]
+    tiers = {}
+    for _, n in segs:
+        t = int(math.log(max(n, 1), FANOUT))
+        tiers[t] = tiers.get(t, 0) + 1
+    assert all(c < FANOUT for c in tiers.values())
+    assert len(segs) < 2 * FANOUT
+    hits = idx.matches("w17")["pearls"]
+    assert len(hits) == 1 + 17 % 7 and all("w17 " in h["text"] for h in hits)
+    assert len(idx.search("alpha", k=10000)) == sum(1 + i % 7 for i in range(80))
+
+def test_merge_does_not_race_sync(tmp_path):
+    log, idx = _index(tmp_path)
+    errors, stop = [], threading.Event()
+    def merger():
+        while not stop.is_set():
+            try:
+                idx.merge()
+            except Exception as e:
+                errors.append(e)
+    t = threading.Thread(target=merger)
+    t.start()
+    try:
+        for i in range(60):
+            log.append_many([{"text": f"gamma n{i}"}])
+            log.flush()
+            idx.search("gamma", k=5)
+    finally:
+        stop.set()
+        t.join()
+    assert not errors
+    assert len(idx.search("gamma", k=1000)) == 60
@@ -0,0 +1,59 @@
+import json, random
+import pytest
+from skg import jsonfields
+from skg.jsonfields import Projector, iter_fields
+from skg.seglog import SegmentedLog
+
+FIELDS = ("ts", "actor", "kind")
+
+def _expected(line):
+    try:
+        o = json.loads(line)
+    except ValueError:
+        return None
+    return {f: o[f] for f in FIELDS if f in o} if isinstance(o, dict) else None
+
+CASES = [
+    b'{"ts": 1.5, "actor": "a", "kind": "k"}',
+    b'{"note": "say \\"actor\\": \\"x\\"", "actor": "real"}',         # escaped quotes
+    b'{"actor": "he said \\"hi\\"\\n", "ts": -2e3}',
+    b'{"data": {"actor": "inner"}, "actor": "outer"}',                  # nested object first
+    b'{"list": [{"kind": "inner"}], "kind": "outer", "ts": null}',
+    b'{"data": {"actor": "inner"}}',                                    # only nested
+    b'{"actor": "first", "actor": "second"}',                           # duplicate key
+    b'{"actor": {"id": 3}, "ts": true}',                                # non-scalar value
+    b'{"a":1,"actor":"x","kind":"k","ts":3}',
+    b'{"s": "\\u00e9t\\u00e9", "actor": "\\u00e9"}',
+    b'{"x": "{\\"actor\\": 1}"}',
+    b'[1, 2, 3]', b'"actor"', b'not json', b'{"actor": "cut', b'',
+]
+
+@pytest.mark.parametrize("fast_bytes", [0, jsonfields.FAST_BYTES])
+@pytest.mark.parametrize("line", CASES)
+def test_projection_equals_json_loads(monkeypatch, fast_bytes, line):
+    monkeypatch.setattr(jsonfields, "FAST_BYTES", fast_bytes)
+    pad = b', "pad": "' + b"p" * 3000 + b'"}' if line.endswith(b"}") else b""
+    for ln in (line, line[:-1] + pad if pad else line):
+        assert Projector(FIELDS)(ln) == _expected(ln)
+
+def test_random_records(monkeypatch):
+    monkeypatch.setattr(jsonfields, "FAST_BYTES", 0)
+    rng = random.Random(2)
+    vals = ["a", 'q"uote', "back\\slash", "", 0, -1.25, 1e-7, True, None, [1], {"actor": "n"}, "é"]
+    proj = Projector(FIELDS)
+    for _ in range(2000):
+        keys = rng.sample(["ts", "actor", "kind", "x", "y", "data"], rng.randint(0, 6))
+        line = json.dumps({k: rng.choice(vals) for k in keys},
+                          separators=rng.choice([(",", ":"), (", ", ": ")])).encode()
+        assert proj(line) == _expected(line)
+
+def test_iter_fields_and_tail_skip_bad_lines(tmp_path):
+    path = tmp_path / "x.jsonl"
+    path.write_bytes(b'{"ts": 1}\nbroken\n[1]\n{"ts": 2, "actor": "a"}\n{"ts": 3')
+    assert list(iter_fields(path, FIELDS)) == [(0, {"ts": 1}), (21, {"ts": 2, "actor": "a"})]
+    log = SegmentedLog(tmp_path / "pearls.jsonl")
+    log.append({"ts": 1, "actor": "a"})
+    with (tmp_path / "pearls.jsonl").open("a") as f:      # a foreign writer's junk
+        f.write("broken\n")
+    log.append({"ts": 2, "actor": "b"})
+    assert log.tail(5, fields=("actor",)) == [{"actor": "a"}, {"actor": "b"}]
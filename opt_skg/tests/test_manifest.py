@@ -0,0 +1,59 @@
+import collections, json, random
+from skg import manifest
+from skg.seglog import SegmentedLog
+
+def _reference(log, audit, vault):
+    def tail(path):
+        try:
+            lines = path.read_bytes().split(b"\n")[:-1]
+        except OSError:
+            return []
+        return [json.loads(l) for l in lines if l.strip()][-800:]
+    pearls, a, v = log.tail(800), tail(audit), tail(vault)
+    cnt = collections.Counter()
+    for o in pearls + a + v:
+        for t in manifest._TOKEN.findall(json.dumps(o, sort_keys=True).lower()):
+            if t not in manifest._STOP:
+                cnt[t] += 1
+    return {"schema": "skg.manifest/v1",
+            "counts": {"pearls": len(pearls), "audit": len(a), "vault": len(v)},
+            "themes": [w for w, _ in cnt.most_common(48)]}
+
+def _process(monkeypatch, log, audit, vault):
+    """Module state as a freshly started process would have it."""
+    total = collections.Counter()
+    monkeypatch.setattr(manifest, "_TOTAL", total)
+    monkeypatch.setattr(manifest, "_SOURCES", {"pearls": manifest._LogWindow(total, log),
+                                               "audit": manifest._FileWindow(total, str(audit)),
+                                               "vault": manifest._FileWindow(total, str(vault))})
+    monkeypatch.setattr(manifest, "_HEAD", {"gen": None, "counts": {}, "themes": []})
+
+def test_manifest_state_is_shared_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifest, "STATE_DIR", tmp_path / "terms")
+    log = SegmentedLog(tmp_path / "pearls.jsonl")
+    audit, vault = tmp_path / "audit.jsonl", tmp_path / "vault.jsonl"
+    rng = random.Random(5)
+    words = [f"word{i}" for i in range(30)]
+    def rec():
+        return {"actor": rng.choice(words), "note": " ".join(rng.choices(words, k=4))}
+    def grow():
+        sizes = [rng.randint(0, 300) for _ in range(3)]
+        log.append_many(rec() for _ in range(sizes[0]))
+        log.flush()
+        for path, n in zip((audit, vault), sizes[1:]):
+            with path.open("a") as f:
+                f.write("".join(json.dumps(rec()) + "\n" for _ in range(n)))
+        return sum(sizes)
+
+    calls = []
+    real = manifest._record_terms
+    monkeypatch.setattr(manifest, "_record_terms", lambda o: calls.append(1) or real(o))
+    for step in range(8):
+        added = grow() if step % 3 != 2 else 0
+        _process(monkeypatch, log, audit, vault)
+        calls.clear()
+        assert manifest.build_manifest() == _reference(log, audit, vault)
+        if step:
+            # a new process tokenises only what was appended since the saved state
+            assert len(calls) == added
+        assert manifest.build_manifest() == _reference(log, audit, vault)
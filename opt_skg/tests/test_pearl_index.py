@@ -0,0 +1,28 @@
+from skg.pearl_index import PearlIndex, key
+from skg.seglog import SegmentedLog
+
+def test_sync_writes_state_only_when_sources_grow(tmp_path):
+    log = SegmentedLog(tmp_path / "pearls.jsonl")
+    audit = tmp_path / "audit.jsonl"
+    a = PearlIndex(tmp_path / "sidx", log, audit)
+    b = PearlIndex(tmp_path / "sidx", log, audit)
+    log.append_many({"kind": "k", "entropy": i} for i in range(5))
+    log.flush()
+    assert a.sync() == 5
+    state = tmp_path / "sidx" / "state.json"
+    stamp = state.stat()
+    assert len(a.postings(key("pearls", "kind", "k"))) == 5
+    assert a.top(key("pearls"), 1)[0][1] == 4
+    assert b.sync() == 0
+    assert (state.stat().st_ino, state.stat().st_mtime_ns) == (stamp.st_ino, stamp.st_mtime_ns)
+
+    audit.write_text('{"actor": "x"}\n{"actor": "y"')      # second line still being written
+    log.append_many([{"kind": "k", "entropy": 9}])
+    log.flush()
+    assert b.sync() == 2
+    stamp = state.stat()
+    assert b.sync() == 0 and a.sync() == 0
+    assert state.stat().st_mtime_ns == stamp.st_mtime_ns
+    # a picks up the state b wrote
+    assert a.top(key("pearls", "kind", "k"), 1)[0][1] == 9
+    assert len(a.postings(key("audit"))) == 1
@@ -0,0 +1,57 @@
+import math, random
+from skg import rag_index
+from skg.rag_index import RagIndex, tokens
+
+def _reference(idx, query, k):
+    """Brute-force BM25 over the index's own chunk table."""
+    chunks = []
+    for path, m in idx._man["files"].items():
+        for pid, *_ in m["parts"]:
+            for off, ln, _ in idx._part(pid).chunks():
+                with open(path, "rb") as f:
+                    f.seek(off)
+                    chunks.append((path, tokens(f.read(ln).decode("utf-8", errors="ignore"))))
+    n = len(chunks)
+    avgdl = sum(len(t) for _, t in chunks) / n
+    best = {}
+    for path, toks in chunks:
+        s = 0.0
+        for q in tokens(query):
+            df = sum(1 for _, t in chunks if q in t)
+            tf = toks.count(q)
+            if tf:
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                s += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * len(toks) / avgdl))
+        if s > best.get(path, 0.0):
+            best[path] = s
+    return sorted(((p, round(s, 4)) for p, s in best.items()), key=lambda h: -h[1])[:k]
+
+def test_incremental_index_matches_brute_force(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_index, "CHUNK_BYTES", 256)
+    monkeypatch.setattr(rag_index, "PART_BYTES", 2048)
+    rng = random.Random(0)
+    words = [f"w{i}" for i in range(60)] + ["energy", "council"]
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    def write(name, n, mode="a"):
+        with open(tree / name, mode) as f:
+            for _ in range(n):
+                f.write(" ".join(rng.choice(words) for _ in range(8)) + "\n")
+    idx = RagIndex(tmp_path / "rag.idx", [tree])
+    write("log.jsonl", 300)
+    write("a.md", 20)
+    write("b.txt", 5)
+    for step in range(6):
+        write("log.jsonl", rng.randint(1, 80))                  # growth: only the tail is indexed
+        if step == 2:
+            write("a.md", 30, mode="w")                          # rewrite: re-indexed whole
+        if step == 4:
+            (tree / "b.txt").unlink()
+        idx.refresh()
+        fresh = RagIndex(tmp_path / "rag.idx", [tree])           # a cold process
+        for q in ("council energy", "w7", "w3 w41 council"):
+            got = [(h["path"], h["score"]) for h in fresh.search(q, 5)]
+            assert got == _reference(fresh, q, 5)
+    parts = idx._man["files"][str(tree / "log.jsonl")]["parts"]
+    assert all(end - start <= 2048 for _, start, end, _, _ in parts)
+    assert [p[1] for p in parts] == [0] + [p[2] for p in parts[:-1]]
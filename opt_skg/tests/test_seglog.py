@@ -0,0 +1,71 @@
+import json, threading
+from skg.seglog import SegmentedLog
+
+def _log(tmp_path, **kw):
+    return SegmentedLog(tmp_path / "pearls.jsonl", segment_bytes=2048, **kw)
+
+def _fill(log, start, n, step=25):
+    for i in range(start, start + n, step):
+        log.append_many({"ts": float(t), "n": t} for t in range(i, min(i + step, start + n)))
+        log.flush()
+
+def test_reads_across_segments(tmp_path):
+    log = _log(tmp_path)
+    _fill(log, 1, 500)
+    assert len(log.files()) > 3
+    assert log.count() == 500
+    assert [r["n"] for r in log.tail(7)] == list(range(494, 501))
+    assert [r["n"] for r in log.since(250.0)] == list(range(250, 501))
+    rows = list(log.read_from(0))
+    assert [r["n"] for _, r in rows] == list(range(1, 501))
+    offs = [o for o, _ in rows]
+    assert offs == sorted(offs)
+    assert [r["n"] for r in log.read_at(offs[::97])] == list(range(1, 501))[::97]
+    assert [r["n"] for _, r in log.read_from(offs[300])] == list(range(301, 501))
+    assert log.tail(3, offsets=True) == rows[-3:]
+
+    # retention drops whole sealed segments; surviving offsets do not move
+    end = log.end_offset()
+    assert log.retain(100) > 0
+    kept = list(log.read_from(0))
+    assert 100 <= len(kept) < 500 and kept == rows[-len(kept):]
+    assert log.read_at([offs[0], offs[-1]]) == [None, rows[-1][1]]
+    assert log.end_offset() == end
+    _fill(log, 501, 10)
+    assert [r["n"] for _, r in log.read_from(end)] == list(range(501, 511))
+
+def test_legacy_file_without_index(tmp_path):
+    (tmp_path / "pearls.jsonl").write_text("".join(json.dumps({"ts": i, "n": i}) + "\n" for i in range(5)))
+    log = _log(tmp_path)
+    assert [r["n"] for r in log.tail(10)] == list(range(5))
+    with (tmp_path / "pearls.jsonl").open("a") as f:    # a foreign plain writer
+        f.write(json.dumps({"ts": 5, "n": 5}) + "\n")
+    assert log.count() == 6
+    log.append({"ts": 6, "n": 6})
+    assert [r["n"] for _, r in log.read_from(0)] == list(range(7))
+
+def test_readers_alongside_a_writer(tmp_path):
+    writer = _log(tmp_path, batch_records=8)
+    reader = _log(tmp_path)
+    errors, done = [], threading.Event()
+    def read():
+        last = 0
+        try:
+            while not done.is_set():
+                ns = [r["n"] for r in reader.tail(5)]
+                if ns:
+                    assert ns == list(range(ns[0], ns[0] + len(ns))) and ns[-1] >= last
+                    last = ns[-1]
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=read) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for i in range(1, 801):
+        writer.append({"ts": float(i), "n": i})
+    writer.flush()
+    done.set()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert reader.count() == 800
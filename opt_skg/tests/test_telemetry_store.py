@@ -0,0 +1,36 @@
+import os, fcntl, threading
+import pytest
+from skg.telemetry_store import TelemetryStore
+
+def test_repair_leaves_a_live_writer_thread_alone(tmp_path):
+    store = TelemetryStore(tmp_path / "t.shm", slots=8, slot_bytes=512)
+    store.update({"a": 1})
+    inside, release = threading.Event(), threading.Event()
+    def writer():
+        with store._writing() as m:
+            store._set_seq(m, store._seq(m) + 1)     # mid-update
+            inside.set()
+            release.wait(5)
+            store._set_seq(m, store._seq(m) + 1)
+    t = threading.Thread(target=writer)
+    t.start()
+    inside.wait(5)
+    m = store._open()
+    store._repair(m)
+    assert store._seq(m) & 1                          # not "repaired" under the writer
+    other = os.open(tmp_path / "t.shm", os.O_RDWR)
+    try:
+        with pytest.raises(OSError):                  # and its flock is still held
+            fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    finally:
+        os.close(other)
+        release.set()
+        t.join()
+    assert store.read() == {"a": 1}
+
+def test_repair_finishes_a_crashed_update(tmp_path):
+    store = TelemetryStore(tmp_path / "t.shm", slots=8, slot_bytes=512)
+    store.update({"a": 1})
+    m = store._open()
+    store._set_seq(m, store._seq(m) + 1)              # a writer died mid-update
+    assert store.read() == {"a": 1}
@@ -0,0 +1,51 @@
+import json, random
+import numpy as np
+from skg import vector_index
+from skg.vector_index import VectorIndex
+
+def _write(path, vecs):
+    path.write_text("".join(json.dumps({"i": i, "vec": v}) + "\n" for i, v in enumerate(vecs)))
+
+def _brute(vecs, q, k):
+    m = np.array(vecs, dtype="f8")
+    m /= np.linalg.norm(m, axis=1, keepdims=True)
+    s = m @ (np.array(q) / np.linalg.norm(q))
+    return sorted(range(len(vecs)), key=lambda i: -s[i])[:k]
+
+def test_exact_search_and_reset(tmp_path):
+    rng = random.Random(3)
+    vecs = [[rng.random() + 0.01 for _ in range(8)] for _ in range(500)]
+    src = tmp_path / "continuity_index.jsonl"
+    _write(src, vecs)
+    a = VectorIndex(tmp_path / "idx", {"continuity": src})
+    b = VectorIndex(tmp_path / "idx", {"continuity": src})
+    q = [rng.random() for _ in range(8)]
+    assert [h["entry"]["i"] for h in a.search(q, 10)] == _brute(vecs, q, 10)
+    assert [h["entry"]["i"] for h in b.search(q, 10)] == _brute(vecs, q, 10)
+    mapped = b._cache["continuity"][1][2]
+
+    # compaction rewrites the source under a new inode with fewer rows
+    kept = vecs[-50:]
+    tmp = tmp_path / "compacted.jsonl"
+    _write(tmp, kept)
+    tmp.replace(src)
+    assert a.sync() == 50
+    assert float(mapped.sum()) > 0                 # b's old mapping is still readable
+    assert [h["entry"]["i"] for h in b.search(q, 5)] == _brute(kept, q, 5)
+    assert sorted(p.name for p in (tmp_path / "idx").glob("continuity.*")) == \
+        ["continuity.1.f32", "continuity.1.ref"]
+
+def test_ivf_with_every_list_probed_is_exact(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN", 200)
+    rng = random.Random(4)
+    vecs = [[rng.random() + 0.01 for _ in range(8)] for _ in range(400)]
+    src = tmp_path / "topology_index.jsonl"
+    _write(src, vecs[:300])
+    idx = VectorIndex(tmp_path / "idx", {"topology": src})
+    idx.sync()
+    with src.open("a") as f:                       # appended rows join their nearest list
+        f.write("".join(json.dumps({"i": 300 + i, "vec": v}) + "\n" for i, v in enumerate(vecs[300:])))
+    q = [rng.random() for _ in range(8)]
+    hits = idx.search(q, 10, nprobe=vector_index.IVF_LISTS)
+    assert idx._st["topology"]["trained"] == 300
+    assert [h["entry"]["i"] for h in hits] == _brute(vecs, q, 10)
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-import os, json, gzip, time
+import sys; sys.path.append('/opt/skg')
+import os, json, time
+from skg import archive_blocks, archive_query
+from skg.jsonfields import iter_fields
+from skg.seglog import PEARL_LOG
 
 BASE   = "/var/lib/skg/memory"
 ARCH   = os.path.join(BASE, "compact")
@@ -8,88 +12,58 @@ INDEX  = os.path.join(BASE, "archive_index.json")
 def _ls_archives():
     return sorted([os.path.join(ARCH,f) for f in os.listdir(ARCH) if f.endswith(".gz")])
 
-def _first_last_ts(path):
-    # read first & last JSON lines' ts without expanding entire file
-    first = last = None
-    with gzip.open(path, "rt", errors="ignore") as f:
-        for line in f:
-            if line.strip():
-                try:
-                    first = json.loads(line).get("ts", None)
-                    break
-                except: break
-    # for tail, read blocks
-    try:
-        with gzip.open(path, "rb") as f:
-            data = f.read()[-65536:]  # last 64KB window
-        for line in data.decode("utf-8","ignore").splitlines()[::-1]:
-            if line.strip():
-                try:
-                    last = json.loads(line).get("ts", None); break
-                except: pass
-    except: pass
-    return first, last
+def _summarize(path, blocks=None):
+    """min/max ts and a Bloom filter of the pruning fields.  Block archives
+    carry both in their sidecar; older archives take one pass over the data."""
+    if blocks is not None and "bloom" in blocks:
+        return archive_blocks.ts_range(blocks), blocks["bloom"]
+    values, lo, hi = set(), None, None
+    for _, e in iter_fields(path, archive_blocks.BLOOM_FIELDS + ("ts",)):
+        ts = e.get("ts")
+        if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+            lo = ts if lo is None else min(lo, ts)
+            hi = ts if hi is None else max(hi, ts)
+        for field in archive_blocks.BLOOM_FIELDS:
+            if field in e:
+                values.add(archive_blocks.bloom_key(field, e[field]))
+    return [lo, hi], archive_blocks.summary_bloom(values)
 
 def build_index():
+    old = {}
+    if os.path.exists(INDEX):
+        try: old = {e.get("path"): e for e in json.load(open(INDEX)).get("archives", [])}
+        except: pass
     items=[]
     for gz in _ls_archives():
         try:
-            first, last = _first_last_ts(gz)
-            items.append({"file": os.path.basename(gz), "path": gz, "ts_range": [first, last]})
+            st = os.stat(gz)
+            prev = old.get(gz)
+            if prev and "bloom" in prev and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns:
+                items.append(prev)      # unchanged since the last build
+                continue
+            ent = {"file": os.path.basename(gz), "path": gz, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            blocks = archive_blocks.read_index(gz)
+            ent["ts_range"], ent["bloom"] = _summarize(gz, blocks)
+            if blocks is not None:
+                ent["blocks"] = len(blocks["blocks"])
+            items.append(ent)
         except Exception as e:
             items.append({"file": os.path.basename(gz), "path": gz, "error": str(e)})
     snap={"ts": time.time(), "archives": items}
     json.dump(snap, open(INDEX,"w"), indent=2)
     return snap
 
-def query(actor=None, t_min=None, t_max=None, limit=500):
-    # scan live rolling logs first
-    scanned = 0
-    def _scan_file(path):
-        nonlocal scanned
-        out=[]
-        if not os.path.exists(path): return out
-        with open(path) as f:
-            for line in f:
-                if not line.strip(): continue
-                try:
-                    e=json.loads(line)
-                    ts=e.get("ts",None)
-                    if t_min and (ts is None or ts < t_min): continue
-                    if t_max and (ts is None or ts > t_max): continue
-                    if actor and e.get("actor")!=actor: continue
-                    out.append(e); scanned+=1
-                    if len(out)>=limit: break
-                except: pass
-        return out
-
-    results = []
-    # rolling files
-    for name in ("governance.audit.jsonl","pearls.jsonl","learn_vault.jsonl"):
-        results.extend(_scan_file(os.path.join(BASE, name)))
-        if len(results)>=limit: return results[:limit]
+LIVE = ("governance.audit.jsonl","learn_vault.jsonl")   # plus every segment of PEARL_LOG
 
-    # archived files by index
+def iter_query(actor=None, t_min=None, t_max=None, limit=500, workers=archive_query.WORKERS):
+    """Matching records from the rolling logs and indexed archives, streamed in ts order."""
     idx = json.load(open(INDEX)) if os.path.exists(INDEX) else {"archives":[]}
-    for ent in idx.get("archives",[]):
-        a0,a1 = ent.get("ts_range",[None,None])
-        if t_min and a1 and a1 < t_min: continue
-        if t_max and a0 and a0 > t_max: continue
-        try:
-            with gzip.open(ent["path"], "rt", errors="ignore") as f:
-                for line in f:
-                    if not line.strip(): continue
-                    try:
-                        e=json.loads(line)
-                        ts=e.get("ts",None)
-                        if t_min and (ts is None or ts < t_min): continue
-                        if t_max and (ts is None or ts > t_max): continue
-                        if actor and e.get("actor")!=actor: continue
-                        results.append(e)
-                        if len(results)>=limit: return results[:limit]
-                    except: pass
-        except: pass
-    return results[:limit]
+    live = [str(p) for p in PEARL_LOG.files()] + [os.path.join(BASE, name) for name in LIVE]
+    archives = [ent for ent in idx.get("archives",[]) if "path" in ent]
+    return archive_query.query(live, archives, actor, t_min, t_max, limit, workers)
+
+def query(actor=None, t_min=None, t_max=None, limit=500):
+    return list(iter_query(actor, t_min, t_max, limit))
 
 if __name__=="__main__":
     import sys, json
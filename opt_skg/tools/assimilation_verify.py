@@ -4,10 +4,10 @@ SKG Assimilation Verifier — confirms all skills are alive and auditable.
 """
 import json, os, time, hashlib, importlib.util
 from pathlib import Path
+from skg.audit_log import append_event
 
 SKILLS_DIR = Path("/home/skg/dev/skills")
 STATE_FILE = Path("/var/lib/skg/state/assimilation_state.json")
-AUDIT_LOG = Path("/var/lib/skg/memory/governance.audit.jsonl")
 
 def hash_file(p: Path) -> str:
     try:
@@ -36,7 +36,6 @@ def verify_skill(p: Path):
         return {"ok": False, "error": str(e)}
 
 def audit(event, skill, details):
-    AUDIT_LOG.parent.mkdir(parents=True, exist_ok=True)
     rec = {
         "ts": time.time(),
         "actor": "assimilation_verify",
@@ -44,8 +43,7 @@ def audit(event, skill, details):
         "skill": skill,
         "details": details,
     }
-    with AUDIT_LOG.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(rec) + "\n")
+    append_event(rec)
 
 def main():
     results = {}
@@ -4,13 +4,13 @@ SKG Auto-Assimilator
 Scans overlay skills, validates and promotes verified ones.
 """
 
-import shutil, time, json
+import shutil, time
 from pathlib import Path
+from skg.audit_log import append_event
 
 OVERLAY = Path("/home/skg/.skg_overlay/patches")
 TARGET  = Path("/home/skg/dev/skills")
 STATE   = Path("/var/lib/skg/state")
-AUDIT   = Path("/var/lib/skg/memory/governance.audit.jsonl")
 
 def validate_skill(path: Path):
     """Basic static check."""
@@ -34,9 +34,7 @@ def record(event, target, ok, detail):
         "ok": ok,
         "detail": detail,
     }
-    AUDIT.parent.mkdir(parents=True, exist_ok=True)
-    with AUDIT.open("a", encoding="utf-8") as fp:
-        fp.write(json.dumps(evt) + "\n")
+    append_event(evt)
 
 def main():
     OVERLAY.mkdir(parents=True, exist_ok=True)
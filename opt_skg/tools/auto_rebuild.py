@@ -6,8 +6,8 @@ Monitors assimilation health and triggers SkillMaker rebuilds when degradation o
 
 import json, time, subprocess
 from pathlib import Path
+from skg.telemetry_store import STATE_TELEMETRY
 
-TELEMETRY = Path("/var/lib/skg/state/telemetry.json")
 ASSIM_STATE = Path("/var/lib/skg/state/assimilation_state.json")
 LOG = Path("/var/log/skg/auto_rebuild.log")
 
@@ -17,8 +17,8 @@ COOLDOWN = 1800        # seconds between rebuilds
 def read_assimilation_health():
     """Return (health, failed, total)"""
     try:
-        if TELEMETRY.exists():
-            t = json.loads(TELEMETRY.read_text())
+        t = STATE_TELEMETRY.read()
+        if "assimilation_health" in t:
             return t.get("assimilation_health", 1.0), t.get("assimilation_failed", 0), t.get("assimilation_total", 0)
         if ASSIM_STATE.exists():
             s = json.loads(ASSIM_STATE.read_text())
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import json, time
 from pathlib import Path
+from skg.tail import tail_jsonl
+from skg.telemetry_store import STATE_TELEMETRY
 
 W=Path("/opt/skg/www/dashboard.html")
-TEL=Path("/var/lib/skg/state/telemetry.json")
 CONS=Path("/var/lib/skg/state/rnt_consensus.json")
 PEERS=Path("/var/lib/skg/state/rnt_peers.json")
 CAPS=Path("/var/lib/skg/state/capabilities.jsonl")
@@ -13,11 +14,9 @@ def readj(p, d=None):
     except: return d if d is not None else {}
 
 def tail_caps(n=10):
-    if not CAPS.exists(): return []
-    lines=CAPS.read_text().strip().splitlines()[-n:]
-    return [json.loads(x) for x in lines if x.strip()]
+    return tail_jsonl(CAPS, n)
 
-t=readj(TEL, {})
+t=STATE_TELEMETRY.read()
 c=readj(CONS, {})
 p=readj(PEERS, {"peers":{}}).get("peers",{})
 caps=tail_caps()
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
-import json, time
+import time
 from pathlib import Path
-TEL=Path("/var/lib/skg/state/telemetry.json")
+from skg.telemetry_store import STATE_TELEMETRY
 CSV=Path("/var/lib/skg/state/ethics_entropy.csv")
 
 t=time.time()
 try:
-    d=json.loads(TEL.read_text())
+    d=STATE_TELEMETRY.read()
     ent=d.get("entropy") or d.get("entropy_avg")
     eth=d.get("ethics_coherence")
 except Exception:
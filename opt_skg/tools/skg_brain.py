@@ -7,19 +7,14 @@ SKG Brain — periodic cognition and evolution trigger.
 Integrates assimilation health and telemetry awareness.
 """
 
-import json, time, requests
-from pathlib import Path
-
-TELEMETRY = Path("/var/lib/skg/state/telemetry.json")
+import time, requests
+from skg.telemetry_store import STATE_TELEMETRY
 
 def get_assimilation_health():
-    if TELEMETRY.exists():
-        try:
-            data = json.loads(TELEMETRY.read_text())
-            return data.get("assimilation_health", 1.0)
-        except Exception:
-            return 1.0
-    return 1.0
+    try:
+        return STATE_TELEMETRY.read().get("assimilation_health", 1.0)
+    except Exception:
+        return 1.0
 
 def call_skill(name, params):
     try:
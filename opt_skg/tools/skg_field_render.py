@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
-import json, math, time, random
+import math, time, random
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
+from skg.telemetry_store import BUS_TELEMETRY
 
-SRC = Path("/var/lib/skg/memory/telemetry.json")
 OUTDIR = Path("/opt/skg/telemetry"); OUTDIR.mkdir(parents=True, exist_ok=True)
 DEST = OUTDIR / "field.png"
 
@@ -76,18 +76,16 @@ def render(tele):
     img.save(DEST, "PNG")
 
 def main():
-    last = ""
-    while True:
+    sub = BUS_TELEMETRY.subscribe(coalesce=0.5)
+    try:
+        render(BUS_TELEMETRY.read())
+    except Exception:
+        pass
+    for _ in sub:
         try:
-            if SRC.exists():
-                txt = SRC.read_text(encoding="utf-8")
-                if txt and txt != last:
-                    last = txt
-                    tele = json.loads(txt)
-                    render(tele)
+            render(BUS_TELEMETRY.read())
         except Exception:
             pass
-        time.sleep(1.5)
 
 if __name__ == "__main__":
     main()
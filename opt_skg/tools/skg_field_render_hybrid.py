@@ -12,12 +12,11 @@ Config (env):
   SKG_FRAME_DIR=/opt/skg/telemetry/frames
 """
 
-import json, math, time, random, os, psutil, subprocess
+import math, time, random, os, psutil, subprocess
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
+from skg.seglog import PEARL_LOG
 
-TELEM   = Path("/var/lib/skg/memory/telemetry.json")
-PEARLS  = Path("/var/lib/skg/memory/pearls.jsonl")
 OUTDIR  = Path("/opt/skg/telemetry"); OUTDIR.mkdir(parents=True, exist_ok=True)
 W, H    = 1280, 720
 FONT    = ImageFont.load_default()
@@ -38,13 +37,7 @@ def get_services():
     return states
 
 def load_pearls(limit=240):
-    if not PEARLS.exists(): return []
-    pearls=[]
-    with PEARLS.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            try: pearls.append(json.loads(line))
-            except: pass
-    return pearls[-limit:]
+    return PEARL_LOG.tail(limit)
 
 def draw_frame():
     img = Image.new("RGB",(W,H),(4,6,12))
@@ -4,11 +4,11 @@ SKG Integrator - Core Equilibrium Monitor
 Ensures the SKG substrate maintains stability and self-healing cycles.
 """
 
-import os, time, json, psutil, subprocess, gzip
+import os, time, psutil, subprocess, gzip
 from pathlib import Path
+from skg.telemetry_bus import read as telemetry_read
 
 LOG_PATH = Path("/var/log/skg/integrator.log")
-TELEMETRY_PATH = Path("/var/lib/skg/memory/telemetry.json")
 SERVICES = ["skg-core-v4", "skg-api", "skg-field"]
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5MB rotation
 
@@ -41,12 +41,12 @@ def check_services():
             restart_service(svc)
 
 def check_telemetry():
-    if not TELEMETRY_PATH.exists():
-        log("[warn] missing telemetry file")
+    data = telemetry_read()
+    if not data:
+        log("[warn] missing telemetry")
         restart_service("skg-field")
         return
     try:
-        data = json.loads(TELEMETRY_PATH.read_text())
         ts = data.get("ts", 0)
         if time.time() - ts > 180:
             log("[warn] telemetry stale; refreshing field")
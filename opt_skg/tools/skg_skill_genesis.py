@@ -1,15 +1,13 @@
 #!/usr/bin/env python3
 import os, json, time, re
 from pathlib import Path
+from skg.seglog import PEARL_LOG
 
-PEARLS = Path("/var/lib/skg/memory/pearls.jsonl")
 SKILLS_DIR = Path("/opt/skg/skills")
 QUEUE = Path("/var/lib/skg/memory/skill_queue.jsonl")
 
 def tail_events(limit=1000):
-    if not PEARLS.exists(): return []
-    with PEARLS.open() as f: lines = f.readlines()[-limit:]
-    return [json.loads(x) for x in lines if x.strip()]
+    return PEARL_LOG.tail(limit)
 
 def detect_need(events):
     need_counts = {}
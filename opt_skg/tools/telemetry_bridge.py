@@ -3,34 +3,30 @@
 SKG Telemetry Bridge
 - Reads substrate state (/var/lib/skg/memory/state.json) and recent pearls (/var/log/skg/journal.jsonl)
 - Derives a compact telemetry snapshot (phase, energies per subsystem)
-- Writes /var/lib/skg/memory/telemetry.json (append-free; always overwrite latest)
+- Publishes its keys on the telemetry bus (other namespaces are left alone)
 Audit-friendly, offline, no network.
 """
 
 import json, time, os
 from pathlib import Path
 from collections import Counter
+from skg.tail import tail_jsonl
+from skg.telemetry_bus import write as bus_write
 
 STATE = Path("/var/lib/skg/memory/state.json")
 JOURNAL = Path("/var/log/skg/journal.jsonl")
-OUT = Path("/var/lib/skg/memory/telemetry.json")
-OUT.parent.mkdir(parents=True, exist_ok=True)
 
 # Subsystems we visualize as "planets"
 SUBSYSTEMS = ["cognition","governance","continuity","reach","reflect","maintain","express"]
 
-def tail_lines(p: Path, n: int = 200) -> list[str]:
-    if not p.exists(): return []
-    data = p.read_text(encoding="utf-8", errors="ignore").splitlines()
-    return data[-n:]
+def tail_lines(p: Path, n: int = 200, fields=None) -> list[dict]:
+    return tail_jsonl(p, n, fields)
 
-def recent_theme(lines: list[str]) -> str:
+def recent_theme(lines: list[dict]) -> str:
     # naive theme: most common kind among last events (excluding heartbeat)
     counts = Counter()
-    import json as _j
-    for ln in lines:
+    for j in lines:
         try:
-            j = _j.loads(ln)
             k = str(j.get("kind","")).lower()
             if k and "heartbeat" not in k:
                 counts[k] += 1
@@ -40,13 +36,11 @@ def recent_theme(lines: list[str]) -> str:
         return "calm"
     return counts.most_common(1)[0][0][:24]
 
-def energies(lines: list[str]) -> dict:
+def energies(lines: list[dict]) -> dict:
     # map counts to 0..1 energies per subsystem
     counts = Counter()
-    import json as _j
-    for ln in lines:
+    for j in lines:
         try:
-            j = _j.loads(ln)
             k = str(j.get("kind","")).lower()
             if k in SUBSYSTEMS or k in ("reflect","maintenance","skill","cognition"):
                 # normalize names
@@ -82,7 +76,7 @@ def main():
             if STATE.exists():
                 state = json.loads(STATE.read_text(encoding="utf-8", errors="ignore") or "{}")
             sense = state.get("sense", {})
-            lines = tail_lines(JOURNAL, 200)
+            lines = tail_lines(JOURNAL, 200, fields=("kind",))   # theme/energies only look at kind
             theme = recent_theme(lines)
             e = energies(lines)
             spheres = { k: {"energy": float(v), "color": color_for(k)} for k,v in e.items() }
@@ -104,7 +98,7 @@ def main():
             }
             j = json.dumps(out, ensure_ascii=False, separators=(",",":"))
             if j != last_emit:
-                OUT.write_text(j, encoding="utf-8")
+                bus_write(out)
                 last_emit = j
         except Exception:
             # silent; this is a view layer, never crash the substrate